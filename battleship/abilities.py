@@ -0,0 +1,255 @@
+# Battle Ship // Ship Abilities
+# Developed using Python3
+
+__author__ = "Hkaar"
+
+__copyright__ = "Copyright (c) 2021 Hkaar"
+__license__ = "GNU General Public License (GPL) V3"
+
+"""This file is part of Battle Ship.
+
+Battle Ship is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+any later version.
+
+Battle Ship is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Battle Ship.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+__version__ = 0.1
+
+import json
+
+from battleship.events import Event_Attack, Event_Scout
+
+# Attack and scout points every player gets at the start of its turn when
+# abilities are enabled.
+POINT_INCOME = 3
+
+CROSS_OFFSETS = ((0, -1), (0, 1), (-1, 0), (1, 0))
+BLOCK_OFFSETS = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 0), (0, 1))
+
+# Every ability is one of these kinds, offsets are (row, column) steps from
+# the selected cell:
+#   pick   - draws from the offsets with replacement and keeps every cell once,
+#            the selected cell itself is added first or never used with center
+#   fixed  - every offset
+#   select - the player selects count cells one by one before it fires
+#   event  - launches an event that moves move_count cells every turn
+stored_ship_data = {
+    'Patrol_Boat': {
+        'name': 'Patrol Boat', 'size': 2, 'attack_cost': 4, 'scout_cost': 4,
+        'attack': {'kind': 'pick', 'offsets': CROSS_OFFSETS, 'draws': 4},
+        'scout': {'kind': 'select', 'count': 4}
+        },
+    'Destroyer': {
+        'name': 'Destroyer', 'size': 3, 'attack_cost': 3, 'scout_cost': 3,
+        'attack': {'kind': 'pick', 'offsets': CROSS_OFFSETS, 'draws': 4, 'center': 'include'},
+        'scout': {'kind': 'pick', 'offsets': CROSS_OFFSETS, 'draws': 5, 'center': 'include'}
+        },
+    'Submarine': {
+        'name': 'Submarine', 'size': 3, 'attack_cost': 2, 'scout_cost': 4,
+        'attack': {'kind': 'event', 'move_count': 1},
+        'scout': {'kind': 'pick', 'offsets': BLOCK_OFFSETS, 'draws': 6, 'center': 'exclude'}
+        },
+    'Battle_Ship': {
+        'name': 'Battle Ship', 'size': 4, 'attack_cost': 5, 'scout_cost': 5,
+        'attack': {'kind': 'fixed', 'offsets': BLOCK_OFFSETS},
+        'scout': {'kind': 'fixed', 'offsets': BLOCK_OFFSETS}
+        },
+    'Aircraft_Carrier': {
+        'name': 'Aircraft Carrier', 'size': 5, 'attack_cost': 8, 'scout_cost': 5,
+        'attack': {'kind': 'select', 'count': 8},
+        'scout': {'kind': 'event', 'move_count': 3}
+        }
+    }
+
+stored_fleets = {'default': ('Patrol_Boat', 'Destroyer', 'Submarine', 'Battle_Ship', 'Aircraft_Carrier')}
+stored_abilities = {}
+
+def get_ship_data(ship_key):
+    if ship_key not in stored_ship_data:
+        raise ValueError(f'Unknown ship: {ship_key}!')
+    return stored_ship_data[ship_key]
+
+def get_move_cost(ship_key, mode):
+    # A ship key of None is the default attack or scout.
+    if ship_key == None:
+        return 1
+    return get_ship_data(ship_key)['attack_cost' if mode == 'A' else 'scout_cost']
+
+def get_ability(ship_key, mode):
+    if (ship_key, mode) not in stored_abilities:
+        ability_data = get_ship_data(ship_key)['attack' if mode == 'A' else 'scout']
+        ability_classes = {'pick': Pick_Ability, 'fixed': Fixed_Ability, 'select': Select_Ability, 'event': Event_Ability}
+
+        if ability_data.get('kind') not in ability_classes:
+            raise ValueError(f"Unknown ability kind for {ship_key}: {ability_data.get('kind')}!")
+
+        stored_abilities[(ship_key, mode)] = ability_classes[ability_data['kind']](ship_key, mode, ability_data)
+    return stored_abilities[(ship_key, mode)]
+
+def load_ship_data(file_path):
+    with open(file_path, 'r') as data_file:
+        ship_data = json.load(data_file)
+
+    for ship_key in ship_data.get('ships', {}):
+        new_ship_data = ship_data['ships'][ship_key]
+
+        for key in ('name', 'size', 'attack_cost', 'scout_cost', 'attack', 'scout'):
+            if key not in new_ship_data:
+                raise ValueError(f'Ship {ship_key} is missing {key}!')
+
+        for mode_key in ('attack', 'scout'):
+            if 'offsets' in new_ship_data[mode_key]:
+                new_ship_data[mode_key]['offsets'] = tuple([tuple(offset) for offset in new_ship_data[mode_key]['offsets']])
+
+        stored_ship_data[ship_key] = new_ship_data
+
+    for fleet_name in ship_data.get('fleets', {}):
+        for ship_key in ship_data['fleets'][fleet_name]:
+            get_ship_data(ship_key)
+
+        stored_fleets[fleet_name] = tuple(ship_data['fleets'][fleet_name])
+
+    stored_abilities.clear()
+    return ship_data
+
+class Ship_Ability:
+    def __init__(self, ship_key, mode, ability_data):
+        self.ship_key = ship_key
+        self.mode = mode
+        self.kind = ability_data['kind']
+
+        self.offsets = tuple(ability_data.get('offsets', ()))
+        self.reach = max([max(abs(offset[0]), abs(offset[1])) for offset in self.offsets]+[0])
+
+        # Clipped offsets for every board size, one entry for every way a cell
+        # can be closer than the reach to the board edges.
+        self.stored_stencils = {}
+
+    def reset_positions(self, player_object):
+        if player_object.__class__.__name__ != 'AI_Player':
+            player_object.reset_positions()
+
+    def compile_stencil(self, edge_distances):
+        top, bottom, left, right = edge_distances
+        stencil = []
+
+        for offset in self.offsets:
+            if -top <= offset[0] <= bottom and -left <= offset[1] <= right:
+                stencil.append(offset)
+            else:
+                stencil.append(None)
+        return tuple(stencil)
+
+    def get_stencil(self, position, board_size):
+        if board_size == None:
+            return self.offsets
+
+        if board_size not in self.stored_stencils:
+            self.stored_stencils[board_size] = {}
+
+        reach = self.reach
+        edge_distances = (min(position[0], reach), min(board_size[0]-1-position[0], reach),
+            min(position[1], reach), min(board_size[1]-1-position[1], reach))
+
+        board_stencils = self.stored_stencils[board_size]
+        if edge_distances not in board_stencils:
+            board_stencils[edge_distances] = self.compile_stencil(edge_distances)
+        return board_stencils[edge_distances]
+
+    def get_footprint(self, position, board_size, rng):
+        return ()
+
+    def get_positions(self, position, player_object):
+        return None
+
+class Pick_Ability(Ship_Ability):
+    def __init__(self, ship_key, mode, ability_data):
+        super(Pick_Ability, self).__init__(ship_key, mode, ability_data)
+        self.draws = ability_data['draws']
+        self.center = ability_data.get('center')
+
+        # A draw picks an index the same way choosing from the offsets would,
+        # so seeded games and replays keep every footprint.
+        self.offset_indices = tuple(range(0, len(self.offsets)))
+
+    def compile_stencil(self, edge_distances):
+        stencil = super(Pick_Ability, self).compile_stencil(edge_distances)
+
+        if self.center == 'exclude':
+            return tuple([offset if offset != (0, 0) else None for offset in stencil])
+        return stencil
+
+    def get_footprint(self, position, board_size, rng):
+        stencil = self.get_stencil(position, board_size)
+        generated_positions = [position] if self.center == 'include' else []
+        picked_indices = 0
+
+        for _ in range(0, self.draws):
+            offset_index = rng.choice(self.offset_indices)
+
+            if not picked_indices >> offset_index & 1:
+                picked_indices |= 1 << offset_index
+
+                if stencil[offset_index] != None:
+                    generated_positions.append((position[0]+stencil[offset_index][0], position[1]+stencil[offset_index][1]))
+
+        return tuple(generated_positions)
+
+    def get_positions(self, position, player_object):
+        self.reset_positions(player_object)
+        return self.get_footprint(position, player_object.board_size, player_object.rng)
+
+class Fixed_Ability(Ship_Ability):
+    def compile_stencil(self, edge_distances):
+        return tuple([offset for offset in super(Fixed_Ability, self).compile_stencil(edge_distances) if offset != None])
+
+    def get_footprint(self, position, board_size, rng=None):
+        stencil = self.get_stencil(position, board_size)
+        return tuple([(position[0]+offset[0], position[1]+offset[1]) for offset in stencil])
+
+    def get_positions(self, position, player_object):
+        self.reset_positions(player_object)
+        return self.get_footprint(position, player_object.board_size)
+
+class Select_Ability(Ship_Ability):
+    def __init__(self, ship_key, mode, ability_data):
+        super(Select_Ability, self).__init__(ship_key, mode, ability_data)
+        self.count = ability_data['count']
+        self.special_ship = ship_key.lower()
+
+    def get_positions(self, position, player_object):
+        if player_object.available_positions > 0 and player_object.current_special_ship == self.special_ship:
+            if position not in player_object.stored_positions:
+                player_object.stored_positions.add(position)
+                player_object.available_positions -= 1
+
+            if player_object.available_positions <= 0:
+                return True
+        else:
+            self.reset_positions(player_object)
+
+            player_object.current_special_ship = self.special_ship
+            player_object.stored_positions.add(position)
+            player_object.available_positions = self.count
+        return None
+
+class Event_Ability(Ship_Ability):
+    def __init__(self, ship_key, mode, ability_data):
+        super(Event_Ability, self).__init__(ship_key, mode, ability_data)
+        self.move_count = ability_data['move_count']
+        self.event_class = Event_Attack if mode == 'A' else Event_Scout
+
+    def get_positions(self, position, player_object):
+        self.reset_positions(player_object)
+
+        player_object.add_event(self.event_class(position, self.move_count, player_object.orientation))
+        return None
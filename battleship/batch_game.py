@@ -0,0 +1,446 @@
+# Battle Ship // Batched Game Engine
+# Developed using Python3 & NumPy
+
+__author__ = "Hkaar"
+
+__copyright__ = "Copyright (c) 2021 Hkaar"
+__license__ = "GNU General Public License (GPL) V3"
+
+"""This file is part of Battle Ship.
+
+Battle Ship is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+any later version.
+
+Battle Ship is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Battle Ship.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+__version__ = 0.1
+
+import numpy as np
+
+from battleship.abilities import get_ship_data, get_ability, stored_fleets, POINT_INCOME
+
+# Cell state bits, FRESH marks cells hit during the current event pass.
+HIT = 1
+SPOTTED = 2
+MISS = 4
+FRESH = 8
+
+CLEAR_SPOTTED = np.uint8(0xFF ^ SPOTTED)
+CLEAR_FRESH = np.uint8(0xFF ^ FRESH)
+
+ATTACK_MODE = 0
+SCOUT_MODE = 1
+
+EVENT_ATTACK = 1
+EVENT_SCOUT = 2
+
+# Event movement per orientation N, W, S, E as (row step, column step).
+ORIENTATION_DELTAS = np.array(((1, 0), (0, 1), (-1, 0), (0, -1)), dtype=np.int32)
+DEPLOY_DELTAS = np.array(((-1, 0), (0, -1), (1, 0), (0, 1)), dtype=np.int32)
+
+class Batch_Game:
+    def __init__(self, game_amount, player_amount=2, board_size=(7, 7), enable_abilities=False, seed=None):
+        self.enable_abilities = enable_abilities
+        self.player_amount = player_amount
+        self.game_amount = game_amount
+        self.board_size = board_size
+
+        self.check_requirements()
+
+        self.rng = np.random.default_rng(seed)
+        self.cell_amount = board_size[0]*board_size[1]
+
+        # Ship ids follow the deployment order of the default fleet, sizes
+        # and abilities come from the ship registry like in the engine.
+        self.ship_keys = stored_fleets['default']
+        self.ship_sizes = tuple([get_ship_data(ship_key)['size'] for ship_key in self.ship_keys])
+
+        self.ship_abilities = []
+        self.footprint_size = 1
+
+        for ship_id in range(1, len(self.ship_keys)+1):
+            for mode in (ATTACK_MODE, SCOUT_MODE):
+                ability = get_ability(self.ship_keys[ship_id-1], 'A' if mode == ATTACK_MODE else 'S')
+                offsets = np.array(ability.offsets, dtype=np.int32).reshape(-1, 2)
+                self.ship_abilities.append((ship_id, mode, ability, offsets))
+
+                if ability.kind == 'pick':
+                    self.footprint_size = max(self.footprint_size, ability.draws+(1 if ability.center == 'include' else 0))
+                elif ability.kind == 'fixed':
+                    self.footprint_size = max(self.footprint_size, len(offsets))
+                elif ability.kind == 'select':
+                    self.footprint_size = max(self.footprint_size, ability.count+1)
+
+        shape = (game_amount, player_amount, board_size[0], board_size[1])
+        self.ship_boards = np.zeros(shape, dtype=np.uint8)
+        self.state_boards = np.zeros(shape, dtype=np.uint8)
+
+        self.ship_remaining = np.zeros((game_amount, player_amount, len(self.ship_sizes)), dtype=np.int32)
+        self.alive = np.ones((game_amount, player_amount), dtype=bool)
+
+        self.attack_points = np.ones((game_amount, player_amount), dtype=np.int32)
+        self.scout_points = np.ones((game_amount, player_amount), dtype=np.int32)
+
+        self.player_targets = np.tile((np.arange(player_amount, dtype=np.int32)+1) % player_amount, (game_amount, 1))
+        self.current_player = np.zeros(game_amount, dtype=np.int32)
+
+        self.turns = np.zeros(game_amount, dtype=np.int32)
+        self.winners = np.zeros(game_amount, dtype=np.int32)
+        self.finished = np.zeros(game_amount, dtype=bool)
+
+        self.event_kind = np.zeros((game_amount, player_amount, 4), dtype=np.int8)
+        self.event_orientation = np.zeros((game_amount, player_amount, 4), dtype=np.int8)
+        self.event_moves = np.zeros((game_amount, player_amount, 4), dtype=np.int8)
+        self.event_started = np.zeros((game_amount, player_amount, 4), dtype=bool)
+        self.event_y = np.zeros((game_amount, player_amount, 4), dtype=np.int32)
+        self.event_x = np.zeros((game_amount, player_amount, 4), dtype=np.int32)
+
+        self.gen_ship_positions()
+
+    def gen_ship_positions(self):
+        rows, columns = self.board_size
+        boards = self.ship_boards.reshape(-1, rows, columns)
+        pending_boards = np.arange(boards.shape[0])
+
+        while len(pending_boards) > 0:
+            boards[pending_boards] = 0
+            pending_boards = self.place_fleets(boards, pending_boards)
+
+        for ship_id in range(1, len(self.ship_sizes)+1):
+            self.ship_remaining[:, :, ship_id-1] = self.ship_sizes[ship_id-1]
+
+    def place_fleets(self, boards, pending_boards, max_attempts=64):
+        rows, columns = self.board_size
+        failed_boards = []
+
+        for ship_id in range(1, len(self.ship_sizes)+1):
+            steps = np.arange(self.ship_sizes[ship_id-1])
+            pending = pending_boards
+            attempts = 0
+
+            while len(pending) > 0 and attempts < max_attempts:
+                y = self.rng.integers(0, rows, len(pending))
+                x = self.rng.integers(0, columns, len(pending))
+                orientation = self.rng.integers(0, 4, len(pending))
+
+                cell_y = y[:, None]+DEPLOY_DELTAS[orientation, 0][:, None]*steps
+                cell_x = x[:, None]+DEPLOY_DELTAS[orientation, 1][:, None]*steps
+
+                valid = ((cell_y >= 0) & (cell_y < rows) & (cell_x >= 0) & (cell_x < columns)).all(axis=1)
+                clipped_y = np.clip(cell_y, 0, rows-1)
+                clipped_x = np.clip(cell_x, 0, columns-1)
+                valid &= (boards[pending[:, None], clipped_y, clipped_x] == 0).all(axis=1)
+
+                placed = pending[valid]
+                boards[placed[:, None], cell_y[valid], cell_x[valid]] = ship_id
+                pending = pending[~valid]
+                attempts += 1
+
+            if len(pending) > 0:
+                failed_boards.append(pending)
+                pending_boards = np.setdiff1d(pending_boards, pending)
+
+        if len(failed_boards) > 0:
+            return np.concatenate(failed_boards)
+        return np.zeros(0, dtype=np.int64)
+
+    def apply_cells(self, games, targets, cells, mode, fresh=False):
+        ship_flat = self.ship_boards.reshape(-1)
+        state_flat = self.state_boards.reshape(-1)
+
+        keys, first_index = np.unique((games.astype(np.int64)*self.player_amount+targets)*self.cell_amount+cells, return_index=True)
+        games = games[first_index]
+        targets = targets[first_index]
+        mode = mode[first_index]
+
+        ship = ship_flat[keys]
+        state = state_flat[keys]
+        is_ship = ship > 0
+        not_hit = (state & HIT) == 0
+
+        state_flat[keys[~is_ship]] |= MISS
+
+        new_hit = (mode == ATTACK_MODE) & is_ship & not_hit
+        hit_keys = keys[new_hit]
+        state_flat[hit_keys] = (state_flat[hit_keys] | HIT | (FRESH if fresh else 0)) & CLEAR_SPOTTED
+        np.subtract.at(self.ship_remaining, (games[new_hit], targets[new_hit], ship[new_hit].astype(np.int64)-1), 1)
+
+        spotted = (mode == SCOUT_MODE) & is_ship & not_hit
+        state_flat[keys[spotted]] |= SPOTTED
+        return hit_keys
+
+    def exec_events(self, games):
+        players = self.current_player[games]
+        event_index = np.nonzero(self.event_kind[games, players] != 0)
+
+        if len(event_index[0]) == 0:
+            return None
+
+        games = games[event_index[0]]
+        players = players[event_index[0]]
+        slots = event_index[1]
+        targets = self.player_targets[games, players]
+
+        rows, columns = self.board_size
+        state_flat = self.state_boards.reshape(-1)
+        ship_flat = self.ship_boards.reshape(-1)
+        fresh_keys = []
+
+        for step in range(0, int(self.event_moves[games, players, slots].max())):
+            moving = (self.event_kind[games, players, slots] != 0) & (self.event_moves[games, players, slots] > step)
+            if not moving.any():
+                break
+
+            g, p, s, t = games[moving], players[moving], slots[moving], targets[moving]
+            orientation = self.event_orientation[g, p, s]
+            started = self.event_started[g, p, s]
+
+            start_y = np.where(orientation == 2, rows-1, self.event_y[g, p, s])
+            start_y = np.where(orientation == 0, 0, start_y)
+            start_x = np.where(orientation == 3, columns-1, self.event_x[g, p, s])
+            start_x = np.where(orientation == 1, 0, start_x)
+
+            y = np.where(started, self.event_y[g, p, s]+ORIENTATION_DELTAS[orientation, 0], start_y)
+            x = np.where(started, self.event_x[g, p, s]+ORIENTATION_DELTAS[orientation, 1], start_x)
+
+            on_board = (y >= 0) & (y < rows) & (x >= 0) & (x < columns)
+            self.event_kind[g[~on_board], p[~on_board], s[~on_board]] = 0
+
+            g, p, s, t, y, x = g[on_board], p[on_board], s[on_board], t[on_board], y[on_board], x[on_board]
+            cells = y*columns+x
+            kind = self.event_kind[g, p, s]
+
+            keys = (g.astype(np.int64)*self.player_amount+t)*self.cell_amount+cells
+            stopped = (kind == EVENT_ATTACK) & (ship_flat[keys] > 0) & (((state_flat[keys] & HIT) == 0) | ((state_flat[keys] & FRESH) != 0))
+
+            mode = np.where(kind == EVENT_ATTACK, ATTACK_MODE, SCOUT_MODE)
+            fresh_keys.append(self.apply_cells(g, t, cells, mode, True))
+
+            self.event_y[g, p, s] = y
+            self.event_x[g, p, s] = x
+            self.event_started[g, p, s] = True
+            self.event_kind[g[stopped], p[stopped], s[stopped]] = 0
+
+        for keys in fresh_keys:
+            state_flat[keys] &= CLEAR_FRESH
+
+    def add_events(self, games, kind, y, x, orientation, move_count):
+        if len(games) == 0:
+            return None
+
+        players = self.current_player[games]
+        free_slots = self.event_kind[games, players] == 0
+
+        if not free_slots.any(axis=1).all():
+            self.grow_events()
+            free_slots = self.event_kind[games, players] == 0
+
+        slots = np.argmax(free_slots, axis=1)
+
+        self.event_kind[games, players, slots] = kind
+        self.event_orientation[games, players, slots] = orientation
+        self.event_moves[games, players, slots] = move_count
+        self.event_started[games, players, slots] = False
+        self.event_y[games, players, slots] = y
+        self.event_x[games, players, slots] = x
+
+    def grow_events(self):
+        for name in ('event_kind', 'event_orientation', 'event_moves', 'event_started', 'event_y', 'event_x'):
+            events = getattr(self, name)
+            setattr(self, name, np.concatenate((events, np.zeros_like(events)), axis=2))
+
+    def gen_distinct_cells(self, amount, cell_count):
+        cells = self.rng.integers(0, self.cell_amount, (amount, cell_count))
+
+        while True:
+            sorted_cells = np.sort(cells, axis=1)
+            repeated = (sorted_cells[:, 1:] == sorted_cells[:, :-1]).any(axis=1)
+
+            if not repeated.any():
+                return cells
+            cells[repeated] = self.rng.integers(0, self.cell_amount, (int(repeated.sum()), cell_count))
+
+    def gen_footprints(self, games, ships, modes, y, x):
+        rows, columns = self.board_size
+        amount = len(games)
+
+        cell_y = np.zeros((amount, self.footprint_size), dtype=np.int32)
+        cell_x = np.zeros((amount, self.footprint_size), dtype=np.int32)
+        valid = np.zeros((amount, self.footprint_size), dtype=bool)
+
+        def set_offsets(selected, offsets, start=0):
+            cell_y[selected, start:start+offsets.shape[1]] = y[selected, None]+offsets[:, :, 0]
+            cell_x[selected, start:start+offsets.shape[1]] = x[selected, None]+offsets[:, :, 1]
+            valid[selected, start:start+offsets.shape[1]] = True
+
+        def set_random_cells(selected, cell_count):
+            cells = self.gen_distinct_cells(len(selected), cell_count)
+            cell_y[selected, :cell_count] = cells // columns
+            cell_x[selected, :cell_count] = cells % columns
+            valid[selected, :cell_count] = True
+
+        def select(ship_id, mode):
+            return np.nonzero((ships == ship_id) & (modes == mode))[0]
+
+        if not self.enable_abilities:
+            cell_y[:, 0] = y
+            cell_x[:, 0] = x
+            valid[:, 0] = True
+        else:
+            for ship_id, mode, ability, offsets in self.ship_abilities:
+                selected = select(ship_id, mode)
+
+                if len(selected) == 0:
+                    continue
+
+                if ability.kind == 'pick':
+                    start = 0
+
+                    if ability.center == 'include':
+                        set_offsets(selected, np.zeros((len(selected), 1, 2), dtype=np.int32))
+                        start = 1
+
+                    # Draws on the center are dropped when the ability
+                    # excludes it, the same as in the engine.
+                    picked_offsets = offsets[self.rng.integers(0, len(offsets), (len(selected), ability.draws))]
+                    set_offsets(selected, picked_offsets, start)
+
+                    if ability.center == 'exclude':
+                        valid[selected, start:start+ability.draws] &= (picked_offsets != 0).any(axis=2)
+
+                elif ability.kind == 'fixed':
+                    set_offsets(selected, np.broadcast_to(offsets, (len(selected),)+offsets.shape))
+
+                elif ability.kind == 'select':
+                    set_random_cells(selected, ability.count+1)
+
+        valid &= (cell_y >= 0) & (cell_y < rows) & (cell_x >= 0) & (cell_x < columns)
+        return cell_y*columns+cell_x, valid
+
+    def exec_footprints(self, games, cells, valid, modes):
+        # Footprints go out one cell at a time, once a target is eliminated
+        # the rest of its footprint lands on the next target like in
+        # Attack_Manager.exec_many.
+        for column in range(0, cells.shape[1]):
+            selected = np.nonzero(valid[:, column] & ~self.finished[games])[0]
+
+            if len(selected) == 0:
+                continue
+
+            selected_games = games[selected]
+            targets = self.player_targets[selected_games, self.current_player[selected_games]]
+            hit_keys = self.apply_cells(selected_games, targets, cells[selected, column], modes[selected])
+
+            if len(hit_keys) > 0:
+                self.eliminate_players(selected_games)
+
+    def eliminate_players(self, games):
+        remaining = self.ship_remaining[games].sum(axis=2) > 0
+        eliminated = self.alive[games] & ~remaining
+
+        if not eliminated.any():
+            return None
+
+        for game_index, player in zip(*np.nonzero(eliminated)):
+            game = games[game_index]
+            self.alive[game, player] = False
+
+            for attacker in np.nonzero(self.player_targets[game] == player)[0]:
+                if attacker != player:
+                    self.player_targets[game, attacker] = self.player_targets[game, player]
+                    self.event_kind[game, attacker] = 0
+
+            if self.alive[game].sum() <= 1:
+                self.finished[game] = True
+                self.winners[game] = np.argmax(self.alive[game])+1
+
+    def next_players(self, games):
+        next_player = self.current_player[games].copy()
+        found = np.zeros(len(games), dtype=bool)
+
+        for offset in range(1, self.player_amount+1):
+            candidate = (self.current_player[games]+offset) % self.player_amount
+            is_alive = self.alive[games, candidate] & ~found
+
+            next_player[is_alive] = candidate[is_alive]
+            found |= is_alive
+
+        self.current_player[games] = next_player
+
+    def next_turn(self, games):
+        amount = len(games)
+        rows, columns = self.board_size
+        players = self.current_player[games]
+
+        y = self.rng.integers(0, rows, amount)
+        x = self.rng.integers(0, columns, amount)
+
+        if self.enable_abilities:
+            orientation = self.rng.integers(0, 4, amount)
+            modes = self.rng.integers(0, 2, amount)
+
+            afloat = self.ship_remaining[games, players] > 0
+            picks = self.rng.integers(0, np.maximum(afloat.sum(axis=1), 1))
+            ships = np.argmax(np.cumsum(afloat, axis=1) > picks[:, None], axis=1)+1
+
+            for ship_id, mode, ability, offsets in self.ship_abilities:
+                if ability.kind == 'event':
+                    launched = np.nonzero((ships == ship_id) & (modes == mode))[0]
+                    self.add_events(games[launched], EVENT_ATTACK if mode == ATTACK_MODE else EVENT_SCOUT,
+                        y[launched], x[launched], orientation[launched], ability.move_count)
+
+            self.exec_events(games)
+            self.eliminate_players(games)
+        else:
+            ships = np.zeros(amount, dtype=np.int32)
+            modes = np.zeros(amount, dtype=np.int32)
+
+        cells, valid = self.gen_footprints(games, ships, modes, y, x)
+        valid &= ~self.finished[games][:, None]
+
+        self.exec_footprints(games, cells, valid, modes)
+        self.eliminate_players(games)
+
+        self.turns[games] += 1
+
+        playing = games[~self.finished[games]]
+        self.next_players(playing)
+
+        if self.enable_abilities:
+            self.attack_points[playing, self.current_player[playing]] += POINT_INCOME
+            self.scout_points[playing, self.current_player[playing]] += POINT_INCOME
+
+    def run(self, max_turns=100000):
+        games = np.nonzero(~self.finished)[0]
+
+        while len(games) > 0:
+            self.next_turn(games)
+
+            games = np.nonzero(~self.finished & (self.turns < max_turns))[0]
+        return self.get_results()
+
+    def get_results(self):
+        return {
+            'winners': self.winners.copy(),
+            'turns': self.turns.copy(),
+            'finished': self.finished.copy(),
+            'remaining': self.ship_remaining.sum(axis=2),
+            'attack_points': self.attack_points.copy(),
+            'scout_points': self.scout_points.copy()
+            }
+
+    def check_requirements(self):
+        if self.player_amount < 2:
+            raise ValueError('Batch game needs at least 2 players!')
+
+        if self.board_size < (7, 7):
+            raise ValueError('Entered board size must be 7 x 7 or bigger!')
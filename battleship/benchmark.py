@@ -0,0 +1,371 @@
+# Battle Ship // Engine Benchmarks
+# Developed using Python3
+
+__author__ = "Hkaar"
+
+__copyright__ = "Copyright (c) 2021 Hkaar"
+__license__ = "GNU General Public License (GPL) V3"
+
+"""This file is part of Battle Ship.
+
+Battle Ship is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+any later version.
+
+Battle Ship is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Battle Ship.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+__version__ = 0.1
+
+import platform
+import argparse
+import random
+import json
+import time
+import sys
+import gc
+
+from battleship.main_game import Attack_Manager, Player, AI_Player
+from battleship.ships import Event_Attack, Event_Scout, Patrol_Boat, Destroyer, Submarine, Battle_Ship, Aircraft_Carrier
+from battleship.simulate import parse_board_size
+from battleship.game_state import get_game_state, apply
+from battleship.endgame import Endgame_Solver, get_knowledge
+from battleship.bitboard import count_bits
+from battleship.abilities import POINT_INCOME
+
+BOARD_SIZES = ((7, 7), (20, 20), (100, 100), (500, 500))
+
+# Stands in for the attack button of a human player, so next_turn can stop
+# at a human seat without a running Qt application.
+class Bench_Piece:
+    def __init__(self):
+        self.piece_text = ' '
+        self.enabled = True
+
+    def text(self):
+        return self.piece_text
+
+    def setText(self, piece_text):
+        self.piece_text = piece_text
+
+    def setEnabled(self, enabled):
+        self.enabled = enabled
+
+def gen_game(board_size, enable_abilities=False, human_player=False):
+    player_objects = [AI_Player(1, 1, board_size), AI_Player(1, 1, board_size)]
+
+    if human_player:
+        human = Player(1, 1, {**player_objects[0].ship_positions})
+        human.board_size = board_size
+        human.attack_piece_positions = {pos: Bench_Piece() for pos in player_objects[0].attack_piece_positions}
+        player_objects[0] = human
+
+    attack_manager = Attack_Manager(2, player_objects, enable_abilities=enable_abilities)
+    attack_manager.load_boards()
+    return attack_manager
+
+def gen_attack_positions(attack_manager, selected_player, position_amount):
+    # One ship cell is always left out so the target can never be sunk
+    # halfway through a timed batch.
+    target = attack_manager.player_objects[attack_manager.player_targets[selected_player]]
+    spared_pos = next(iter(target.ship_positions))
+
+    positions = [pos for pos in target.attack_piece_positions if pos != spared_pos]
+    return [random.choice(positions) for _ in range(0, position_amount)]
+
+def bench_exec_attack(board_size, call_amount):
+    attack_manager = gen_game(board_size)
+    positions = gen_attack_positions(attack_manager, 1, call_amount)
+
+    def run():
+        for pos in positions:
+            attack_manager.exec_attack(pos, 1)
+    return run
+
+def bench_exec_scout(board_size, call_amount):
+    attack_manager = gen_game(board_size, True)
+    positions = gen_attack_positions(attack_manager, 1, call_amount)
+
+    def run():
+        for pos in positions:
+            attack_manager.exec_scout(pos, 1)
+    return run
+
+def bench_exec_attack_many(board_size, call_amount):
+    attack_manager = gen_game(board_size, True, True)
+    positions = gen_attack_positions(attack_manager, 1, call_amount*8)
+    footprints = [positions[index:index+8] for index in range(0, len(positions), 8)]
+
+    def run():
+        for footprint in footprints:
+            attack_manager.exec_attack_many(footprint, 1)
+    return run
+
+def bench_exec_events(board_size, call_amount):
+    games = [gen_game(board_size, True)]
+
+    def add_events(player):
+        for orientation in ('N', 'W', 'S', 'E'):
+            for event_class in (Event_Attack, Event_Scout):
+                pos = (random.randrange(board_size[0]), random.randrange(board_size[1]))
+                player.add_event(event_class(pos, 1 if event_class == Event_Attack else 3, orientation))
+
+    # Events leave the board and sink the target after a few calls, a new
+    # game or new events are set up outside of the timed part.
+    def run():
+        seconds = 0.0
+
+        for _ in range(0, call_amount):
+            if len(games[0].player_objects) <= 1:
+                games[0] = gen_game(board_size, True)
+
+            if len(games[0].player_objects[1].stored_events) == 0:
+                add_events(games[0].player_objects[1])
+
+            start_time = time.perf_counter()
+            games[0].exec_events(1)
+            seconds += time.perf_counter()-start_time
+        return seconds
+    return run
+
+def bench_next_turn(board_size, call_amount):
+    games = [gen_game(board_size, True, True)]
+
+    # The human player never shoots back, once the AI wins a new game is set
+    # up outside of the timed part.
+    def run():
+        seconds = 0.0
+
+        for _ in range(0, call_amount):
+            if len(games[0].player_objects) <= 1:
+                games[0] = gen_game(board_size, True, True)
+
+            start_time = time.perf_counter()
+            games[0].next_turn(1)
+            seconds += time.perf_counter()-start_time
+        return seconds
+    return run
+
+def bench_gen_ship_positions(board_size, call_amount):
+    player = AI_Player(1, 1, board_size)
+
+    def run():
+        for _ in range(0, call_amount):
+            player.gen_ship_positions()
+    return run
+
+def bench_exec_player(board_size, call_amount, enable_abilities=False):
+    attack_manager = gen_game(board_size, enable_abilities)
+    player = attack_manager.player_objects[1]
+    target_piece_positions = attack_manager.player_objects[2].attack_piece_positions
+
+    def run():
+        for _ in range(0, call_amount):
+            if len(attack_manager.player_objects) > 1:
+                if enable_abilities:
+                    player.attack_points += POINT_INCOME
+                    player.scout_points += POINT_INCOME
+                player.exec_player(target_piece_positions, attack_manager)
+    return run
+
+def bench_exec_player_abilities(board_size, call_amount):
+    return bench_exec_player(board_size, call_amount, True)
+
+def bench_game_state_apply(board_size, call_amount):
+    attack_manager = gen_game(board_size, True)
+    attack_manager.player_objects[1].attack_points += call_amount
+    attack_manager.player_objects[1].scout_points += call_amount
+
+    game_state = get_game_state(attack_manager)
+    moves = [(None, random.choice(('A', 'S')), ((random.randrange(board_size[0]), random.randrange(board_size[1])),))
+        for _ in range(0, call_amount)]
+
+    def run():
+        for move in moves:
+            apply(game_state, move)
+    return run
+
+def bench_endgame_solve(board_size, call_amount):
+    # Sinks all but the two smallest ships and hits one of them, every call
+    # solves with an empty cache.
+    attack_manager = gen_game(board_size)
+    bit_board = attack_manager.player_objects[2].bit_board
+    ship_objects = sorted(bit_board.ship_masks, key=lambda ship_object: count_bits(bit_board.ship_masks[ship_object]))
+    ship_masks = [bit_board.ship_masks[ship_object] for ship_object in ship_objects]
+
+    for ship_object, ship_mask in zip(ship_objects[2:], ship_masks[2:]):
+        bit_board.hits |= ship_mask
+        bit_board.add_sunk_ship(ship_object, ship_mask & -ship_mask)
+    bit_board.hits |= ship_masks[0] & -ship_masks[0]
+
+    for _ in range(0, board_size[0]*board_size[1]//4):
+        cell = random.randrange(board_size[0]*board_size[1])
+
+        if not (ship_masks[0] | ship_masks[1]) >> cell & 1:
+            bit_board.misses |= 1 << cell
+
+    knowledge = get_knowledge(bit_board)
+
+    def run():
+        for _ in range(0, call_amount):
+            Endgame_Solver(board_size).solve(knowledge)
+    return run
+
+def bench_ability_planner(board_size, call_amount):
+    # Every call plans with an empty cache, like the first plan of a turn.
+    attack_manager = gen_game(board_size, True)
+    player = attack_manager.player_objects[1]
+    target = attack_manager.player_objects[2]
+
+    for pos in gen_attack_positions(attack_manager, 1, board_size[0]*board_size[1]//4):
+        attack_manager.exec_attack(pos, 1)
+
+    player.attack_points = 9
+    player.scout_points = 7
+
+    def run():
+        for call_num in range(0, call_amount):
+            player.ability_planner.knowledge = None
+            player.ability_planner.get_move(player, target, ('N', 'W', 'S', 'E')[call_num % 4])
+    return run
+
+def bench_footprint(ship_class, mode):
+    def bench_ship(board_size, call_amount):
+        player = AI_Player(1, 1, board_size)
+        ship_object = ship_class()
+        positions = [(random.randrange(board_size[0]), random.randrange(board_size[1])) for _ in range(0, call_amount)]
+
+        def run():
+            for pos in positions:
+                player.stored_positions = set([])
+                player.available_positions = 0
+
+                if mode == 'A':
+                    ship_object.get_attack(pos, player)
+                else:
+                    ship_object.get_scout(pos, player)
+            player.stored_events.clear()
+        return run
+    return bench_ship
+
+stored_benchmarks = {
+    'exec_attack': bench_exec_attack,
+    'exec_scout': bench_exec_scout,
+    'exec_attack_many': bench_exec_attack_many,
+    'exec_events': bench_exec_events,
+    'next_turn': bench_next_turn,
+    'gen_ship_positions': bench_gen_ship_positions,
+    'exec_player': bench_exec_player,
+    'exec_player_abilities': bench_exec_player_abilities,
+    'game_state_apply': bench_game_state_apply,
+    'endgame_solve': bench_endgame_solve,
+    'ability_planner': bench_ability_planner
+    }
+
+for ship_class in (Patrol_Boat, Destroyer, Submarine, Battle_Ship, Aircraft_Carrier):
+    stored_benchmarks[f'{ship_class.__name__}.get_attack'] = bench_footprint(ship_class, 'A')
+    stored_benchmarks[f'{ship_class.__name__}.get_scout'] = bench_footprint(ship_class, 'S')
+
+def time_benchmark(benchmark_method, board_size, call_amount=50, repeat=5, seed=0):
+    timings = []
+
+    for repeat_num in range(0, repeat):
+        random.seed(seed+repeat_num)
+        run = benchmark_method(board_size, call_amount)
+
+        gc_enabled = gc.isenabled()
+        gc.disable()
+
+        # A run that sets up part of its calls itself returns the seconds of
+        # the timed part.
+        try:
+            start_time = time.perf_counter()
+            seconds = run()
+            timings.append((seconds if seconds != None else time.perf_counter()-start_time)/call_amount)
+        finally:
+            if gc_enabled:
+                gc.enable()
+    return min(timings)
+
+def run_benchmarks(board_sizes=BOARD_SIZES, benchmark_names=None, call_amount=50, repeat=5, report_method=None):
+    results = {}
+
+    for benchmark_name in benchmark_names if benchmark_names != None else stored_benchmarks:
+        for board_size in board_sizes:
+            result_name = f'{benchmark_name}@{board_size[0]}x{board_size[1]}'
+            results[result_name] = time_benchmark(stored_benchmarks[benchmark_name], board_size, call_amount, repeat)
+
+            if report_method != None:
+                report_method(result_name, results[result_name])
+    return results
+
+def compare_results(results, baseline_results, threshold=0.25):
+    regressions = {}
+
+    for result_name in results:
+        if result_name in baseline_results and baseline_results[result_name] > 0:
+            ratio = results[result_name]/baseline_results[result_name]
+
+            if ratio > 1+threshold:
+                regressions[result_name] = ratio
+    return regressions
+
+def load_results(file_name):
+    with open(file_name, 'r') as results_file:
+        return json.load(results_file)['results']
+
+def save_results(file_name, results, call_amount, repeat):
+    with open(file_name, 'w') as results_file:
+        json.dump({
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'calls': call_amount,
+            'repeat': repeat,
+            'results': results
+            }, results_file, indent=4, sort_keys=True)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m battleship.benchmark', description='Time the engine hot paths.')
+    parser.add_argument('--sizes', type=lambda sizes: [parse_board_size(board_size) for board_size in sizes.split(',')],
+        default=list(BOARD_SIZES), help='comma separated board sizes, e.g. 7x7,20x20')
+    parser.add_argument('--only', type=lambda names: names.split(','), default=None,
+        help=f"comma separated benchmarks, any of: {', '.join(stored_benchmarks)}")
+    parser.add_argument('--calls', type=int, default=50, help='calls timed in every repeat')
+    parser.add_argument('--repeat', type=int, default=5, help='repeats, the fastest one is kept')
+    parser.add_argument('--output', default=None, help='write the results to this JSON file')
+    parser.add_argument('--baseline', default=None, help='compare against the results in this JSON file')
+    parser.add_argument('--threshold', type=float, default=0.25, help='allowed slowdown against the baseline, 0.25 is 25%%')
+    args = parser.parse_args(argv)
+
+    for benchmark_name in args.only or []:
+        if benchmark_name not in stored_benchmarks:
+            parser.error(f'Unknown benchmark: {benchmark_name}!')
+
+    def report_method(result_name, seconds):
+        print(f'{result_name}: {seconds*1e6:.2f} us/call')
+
+    results = run_benchmarks(args.sizes, args.only, args.calls, args.repeat, report_method)
+
+    if args.output != None:
+        save_results(args.output, results, args.calls, args.repeat)
+
+    if args.baseline != None:
+        regressions = compare_results(results, load_results(args.baseline), args.threshold)
+
+        for result_name in regressions:
+            print(f'Regression: {result_name} is {regressions[result_name]:.2f}x the baseline')
+
+        if len(regressions) > 0:
+            return 1
+        print('No regressions against the baseline')
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,253 @@
+# Battle Ship // Bit Board Classes
+# Developed using Python3
+
+__author__ = "Hkaar"
+
+__copyright__ = "Copyright (c) 2021 Hkaar"
+__license__ = "GNU General Public License (GPL) V3"
+
+"""This file is part of Battle Ship.
+
+Battle Ship is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+any later version.
+
+Battle Ship is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Battle Ship.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+__version__ = 0.1
+
+import bisect
+import copy
+
+# Every layer is a single int, the cell (y, x) is stored in bit y*columns+x.
+MISS = 0
+HIT = 1
+SPOTTED = 2
+
+def count_bits(mask):
+    return bin(mask).count('1')
+
+def iter_bits(mask):
+    while mask:
+        low_bit = mask & -mask
+        yield low_bit.bit_length()-1
+        mask ^= low_bit
+
+class Bit_Board:
+    def __init__(self, board_size=(7, 7)):
+        self.board_size = board_size
+        self.board_mask = (1 << (board_size[0]*board_size[1]))-1
+
+        self.ships = 0
+        self.hits = 0
+        self.misses = 0
+        self.spotted = 0
+
+        self.ship_masks = {}
+
+        # The ship and its size for the cell of every hit that sank a ship,
+        # all an attacker is told about a sunk ship.
+        self.sunk_hits = {}
+
+        # Sorted columns of not yet hit ship cells in every row and sorted
+        # rows in every column, built on first use and trimmed on every hit.
+        self.row_cells = None
+        self.column_cells = None
+
+        # Not yet hit cells of every ship and the ship of every ship cell,
+        # built on first use and counted down on every hit.
+        self.ship_hulls = None
+        self.cell_ships = None
+
+    def copy(self):
+        # Ship objects never change, the indexes are built again on first use
+        # instead of sharing the ones the original trims on every hit.
+        bit_board = copy.copy(self)
+        bit_board.ship_masks = {**self.ship_masks}
+        bit_board.sunk_hits = {**self.sunk_hits}
+
+        bit_board.row_cells = None
+        bit_board.column_cells = None
+        bit_board.ship_hulls = None
+        bit_board.cell_ships = None
+        return bit_board
+
+    def get_bit(self, pos):
+        if 0 <= pos[0] < self.board_size[0] and 0 <= pos[1] < self.board_size[1]:
+            return 1 << (pos[0]*self.board_size[1]+pos[1])
+        return 0
+
+    def get_mask(self, positions):
+        mask = 0
+
+        for pos in positions:
+            mask |= self.get_bit(pos)
+        return mask
+
+    def get_position(self, index):
+        return divmod(index, self.board_size[1])
+
+    def get_positions(self, mask):
+        return tuple([self.get_position(index) for index in iter_bits(mask)])
+
+    def add_ship(self, ship_object, positions):
+        ship_mask = self.get_mask(positions)
+
+        if ship_mask & self.ships:
+            return False
+
+        self.ship_masks[ship_object] = self.ship_masks.get(ship_object, 0) | ship_mask
+        self.ships |= ship_mask
+        self.row_cells = None
+        self.ship_hulls = None
+        return True
+
+    def load_ship_positions(self, ship_positions):
+        self.clear()
+
+        for pos in ship_positions:
+            bit = self.get_bit(pos)
+
+            self.ship_masks[ship_positions[pos]] = self.ship_masks.get(ship_positions[pos], 0) | bit
+            self.ships |= bit
+        self.ship_hulls = None
+
+    def clear(self):
+        self.ships = 0
+        self.hits = 0
+        self.misses = 0
+        self.spotted = 0
+
+        self.ship_masks.clear()
+        self.sunk_hits.clear()
+        self.row_cells = None
+        self.ship_hulls = None
+
+    def attack(self, bit):
+        if bit & self.ships:
+            if bit & self.hits:
+                return MISS
+
+            self.hits |= bit
+            self.spotted &= ~bit
+
+            if self.row_cells != None:
+                self.remove_ray_cell(bit.bit_length()-1)
+
+            if self.ship_hulls != None:
+                self.ship_hulls[self.cell_ships[bit.bit_length()-1]] -= 1
+            return HIT
+
+        self.misses |= bit
+        return MISS
+
+    def scout(self, bit):
+        if bit & self.ships & ~self.hits:
+            self.spotted |= bit
+            return SPOTTED
+
+        if not bit & self.ships:
+            self.misses |= bit
+        return MISS
+
+    def gen_ray_index(self):
+        self.row_cells = {}
+        self.column_cells = {}
+
+        for index in iter_bits(self.ships & ~self.hits):
+            y, x = self.get_position(index)
+
+            self.row_cells.setdefault(y, []).append(x)
+            self.column_cells.setdefault(x, []).append(y)
+
+    def remove_ray_cell(self, index):
+        y, x = self.get_position(index)
+
+        for line_cells, cell in ((self.row_cells.get(y), x), (self.column_cells.get(x), y)):
+            if line_cells != None:
+                cell_index = bisect.bisect_left(line_cells, cell)
+
+                if cell_index < len(line_cells) and line_cells[cell_index] == cell:
+                    line_cells.pop(cell_index)
+
+    def get_ray_distance(self, y, x, step_y, step_x):
+        if self.row_cells == None:
+            self.gen_ray_index()
+
+        if step_y == 0:
+            line_cells, cell = self.row_cells.get(y, ()), x
+        else:
+            line_cells, cell = self.column_cells.get(x, ()), y
+
+        if step_x+step_y > 0:
+            cell_index = bisect.bisect_right(line_cells, cell)
+            return line_cells[cell_index]-cell if cell_index < len(line_cells) else None
+
+        cell_index = bisect.bisect_left(line_cells, cell)-1
+        return cell-line_cells[cell_index] if cell_index >= 0 else None
+
+    def get_remaining(self):
+        return self.ships & ~self.hits
+
+    def get_remaining_count(self):
+        return count_bits(self.ships & ~self.hits)
+
+    def is_alive(self):
+        return (self.ships & ~self.hits) != 0
+
+    def gen_hull_index(self):
+        self.ship_hulls = {}
+        self.cell_ships = {}
+
+        for ship_object in self.ship_masks:
+            self.ship_hulls[ship_object] = count_bits(self.ship_masks[ship_object] & ~self.hits)
+
+            for index in iter_bits(self.ship_masks[ship_object]):
+                self.cell_ships[index] = ship_object
+
+    def get_hull(self, ship_object):
+        if self.ship_hulls == None:
+            self.gen_hull_index()
+        return self.ship_hulls.get(ship_object, 0)
+
+    def is_ship_sunk(self, ship_object):
+        return self.get_hull(ship_object) == 0
+
+    def get_ship_at(self, bit):
+        if self.ship_hulls == None:
+            self.gen_hull_index()
+        return self.cell_ships.get(bit.bit_length()-1)
+
+    def get_fleet(self):
+        # Which ships a board has is no secret, only where they lie.
+        return tuple([(ship_object, count_bits(self.ship_masks[ship_object])) for ship_object in self.ship_masks])
+
+    def add_sunk_ship(self, ship_object, bit):
+        self.sunk_hits[bit.bit_length()-1] = (ship_object, count_bits(self.ship_masks[ship_object]))
+
+    def get_available_ships(self):
+        if self.ship_hulls == None:
+            self.gen_hull_index()
+        return tuple([ship_object for ship_object in self.ship_masks if self.ship_hulls[ship_object] > 0])
+
+    def get_hit_masks(self):
+        return self.misses, self.hits, self.spotted
+
+    def get_hit_positions(self):
+        hit_positions = {}
+
+        for index in iter_bits(self.misses):
+            hit_positions[self.get_position(index)] = MISS
+        for index in iter_bits(self.spotted):
+            hit_positions[self.get_position(index)] = SPOTTED
+        for index in iter_bits(self.hits):
+            hit_positions[self.get_position(index)] = HIT
+        return hit_positions
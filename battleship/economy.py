@@ -0,0 +1,345 @@
+# Battle Ship // Ability Economy
+# Developed using Python3
+
+__author__ = "Hkaar"
+
+__copyright__ = "Copyright (c) 2021 Hkaar"
+__license__ = "GNU General Public License (GPL) V3"
+
+"""This file is part of Battle Ship.
+
+Battle Ship is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+any later version.
+
+Battle Ship is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Battle Ship.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+__version__ = 0.1
+
+import math
+
+from battleship.bitboard import count_bits, iter_bits
+from battleship.abilities import get_ability, get_move_cost, POINT_INCOME
+from battleship.events import EVENT_STEPS
+from battleship.endgame import get_sunk_ships
+
+# Hits a bit of scouted information is worth, and how much an event is worth
+# less for every turn it still needs to reach a cell.
+INFO_WEIGHT = 0.45
+EVENT_DISCOUNT = 0.8
+EVENT_HORIZON = 0.001
+
+# Points are priced at this share of the best value per point of their pool,
+# and the AI saves for a better ability it can afford within SAVE_TURNS.
+POINT_WEIGHT = 0.2
+SAVE_TURNS = 2
+
+SAMPLE_AMOUNT = 3
+
+def get_entropy(chance):
+    if chance <= 0.0 or chance >= 1.0:
+        return 0.0
+    return -chance*math.log2(chance)-(1.0-chance)*math.log2(1.0-chance)
+
+class Ability_Planner:
+    def __init__(self, sample_amount=SAMPLE_AMOUNT, save_turns=SAVE_TURNS, point_weight=POINT_WEIGHT):
+        self.sample_amount = sample_amount
+        self.save_turns = save_turns
+        self.point_weight = point_weight
+
+        self.knowledge = None
+        self.board_size = None
+        self.known_mask = 0
+        self.found_mask = 0
+        self.known_bytes = b''
+        self.found_bytes = b''
+
+        self.base_chance = 0.0
+        self.cell_chances = {}
+
+        # Expected values of every footprint and cell for the current
+        # knowledge, they are dropped as soon as the target board changes.
+        self.stored_values = {}
+        self.cell_values = {'A': {}, 'S': {}}
+        self.stencil_data = {}
+
+    def copy(self):
+        # A copy starts without the caches, so a planner pondering in another
+        # thread never writes into the one the game uses.
+        return Ability_Planner(self.sample_amount, self.save_turns, self.point_weight)
+
+    def sync(self, target):
+        bit_board = target.bit_board
+        knowledge = (id(bit_board), bit_board.hits, bit_board.misses, bit_board.spotted)
+
+        if knowledge == self.knowledge:
+            return None
+
+        self.knowledge = knowledge
+        self.board_size = bit_board.board_size
+        self.stored_values.clear()
+        self.cell_values = {'A': {}, 'S': {}}
+
+        rows, columns = bit_board.board_size
+        sunk_ships = get_sunk_ships(bit_board)
+        sunk_mask = 0
+        floating_cells = 0
+
+        # Only the sunk reports tell which hits belong to a sunk ship.
+        for ship_object, ship_size in bit_board.get_fleet():
+            if ship_object in sunk_ships:
+                sunk_mask |= sunk_ships[ship_object][1]
+            else:
+                floating_cells += ship_size
+
+        open_hits = bit_board.hits & ~sunk_mask
+        self.found_mask = bit_board.spotted & ~bit_board.hits
+        self.known_mask = bit_board.hits | bit_board.misses | bit_board.spotted
+
+        # Shifting a board sized int for every cell is slow on big boards, the
+        # bytes give every bit at once.
+        byte_amount = (rows*columns+7)//8
+        self.known_bytes = self.known_mask.to_bytes(byte_amount, 'little')
+        self.found_bytes = self.found_mask.to_bytes(byte_amount, 'little')
+
+        unknown_amount = count_bits(bit_board.board_mask & ~self.known_mask)
+        hidden_cells = floating_cells-count_bits(open_hits)-count_bits(self.found_mask)
+        self.base_chance = min(1.0, float(hidden_cells)/unknown_amount) if unknown_amount > 0 else 0.0
+
+        # A ship that was hit but not sunk goes on in one of the unknown
+        # cells next to the hit.
+        self.cell_chances = {}
+
+        for cell in iter_bits(open_hits | self.found_mask):
+            y, x = divmod(cell, columns)
+            neighbour_cells = [ny*columns+nx for ny, nx in ((y-1, x), (y+1, x), (y, x-1), (y, x+1))
+                if 0 <= ny < rows and 0 <= nx < columns and not self.is_known(ny*columns+nx)]
+
+            for neighbour_cell in neighbour_cells:
+                chance = max(self.base_chance, 1.0/len(neighbour_cells))
+                self.cell_chances[neighbour_cell] = max(self.cell_chances.get(neighbour_cell, 0.0), chance)
+
+    def is_known(self, cell):
+        return self.known_bytes[cell >> 3] >> (cell & 7) & 1
+
+    def get_chance(self, cell):
+        if self.known_bytes[cell >> 3] >> (cell & 7) & 1:
+            return 1.0 if self.found_bytes[cell >> 3] >> (cell & 7) & 1 else 0.0
+        return self.cell_chances.get(cell, self.base_chance)
+
+    def get_cell_value(self, cell, mode):
+        cell_values = self.cell_values[mode]
+        value = cell_values.get(cell)
+
+        if value == None:
+            value = self.get_chance(cell) if mode == 'A' else INFO_WEIGHT*get_entropy(self.get_chance(cell))
+            cell_values[cell] = value
+        return value
+
+    def get_event_value(self, ability, position, orientation):
+        rows, columns = self.board_size
+        step_y, step_x = EVENT_STEPS[orientation]
+
+        y = -1 if step_y == 1 else rows if step_y == -1 else position[0]
+        x = -1 if step_x == 1 else columns if step_x == -1 else position[1]
+
+        cell_values = self.cell_values[ability.mode]
+        cell_step = step_y*columns+step_x
+        cell = y*columns+x
+        step_amount = rows if step_y != 0 else columns
+
+        value = 0.0
+        miss_chance = 1.0
+        discount = 1.0
+
+        for step_num in range(0, step_amount):
+            cell += cell_step
+
+            if step_num > 0 and step_num % ability.move_count == 0:
+                discount *= EVENT_DISCOUNT
+
+                # Cells the event only reaches after many turns hardly count.
+                if discount*miss_chance < EVENT_HORIZON:
+                    break
+
+            cell_value = cell_values.get(cell)
+            if cell_value == None:
+                cell_value = self.get_cell_value(cell, ability.mode)
+
+            # Attack events stop at the first ship, scout events go on.
+            if ability.mode == 'A':
+                value += discount*miss_chance*cell_value
+                miss_chance *= 1.0-cell_value
+            else:
+                value += discount*cell_value
+        return value
+
+    def get_value(self, ship_key, mode, position, orientation):
+        columns = self.board_size[1]
+
+        if ship_key == None:
+            return self.get_cell_value(position[0]*columns+position[1], mode)
+
+        ability = get_ability(ship_key, mode)
+
+        if ability.kind == 'event':
+            # An event runs along the whole row or column, wherever on it the
+            # player selected.
+            value_key = (ship_key, mode, position[1] if orientation in ('N', 'S') else position[0], orientation)
+            value = self.stored_values.get(value_key)
+
+            if value == None:
+                value = self.get_event_value(ability, position, orientation)
+                self.stored_values[value_key] = value
+            return value
+
+        stencil_data = self.stencil_data.get(ability)
+
+        # Every draw of a pick ability is a uniform choice, so each offset
+        # lands with the same chance, abilities with the same offsets share
+        # the sum of their cells.
+        if stencil_data == None:
+            stencil_key = (ability.offsets, ability.kind == 'pick' and ability.center == 'exclude')
+            stencil_ids = [data[0] for data in self.stencil_data.values() if data[3] == stencil_key]
+
+            stencil_data = (stencil_ids[0] if len(stencil_ids) > 0 else len(self.stencil_data),
+                1.0-(1.0-1.0/len(ability.offsets))**ability.draws if ability.kind == 'pick' else 1.0,
+                ability.kind == 'pick' and ability.center == 'include', stencil_key)
+            self.stencil_data[ability] = stencil_data
+
+        stencil_id, offset_chance, include_center = stencil_data[:3]
+        cell = position[0]*columns+position[1]
+        value_key = (stencil_id, mode, cell)
+        value = self.stored_values.get(value_key)
+
+        if value == None:
+            cell_values = self.cell_values[mode]
+            value = 0.0
+
+            for offset in ability.get_stencil(position, self.board_size):
+                if offset != None:
+                    offset_cell = cell+offset[0]*columns+offset[1]
+                    cell_value = cell_values.get(offset_cell)
+                    value += cell_value if cell_value != None else self.get_cell_value(offset_cell, mode)
+
+            self.stored_values[value_key] = value
+
+        if include_center:
+            return offset_chance*value+self.get_cell_value(cell, mode)
+        return offset_chance*value
+
+    def get_candidates(self, player, target, mode):
+        bit_board = target.bit_board
+        candidates = []
+
+        if player.strategy != None and hasattr(player.strategy, 'get_position'):
+            candidates.append(player.strategy.get_position(player, target, mode))
+
+        for cell in sorted(self.cell_chances, key=self.cell_chances.__getitem__, reverse=True)[:self.sample_amount]:
+            candidates.append(bit_board.get_position(cell))
+
+        if mode == 'A':
+            for cell in iter_bits(self.found_mask):
+                candidates.append(bit_board.get_position(cell))
+                if len(candidates) >= 2*self.sample_amount:
+                    break
+
+        # Random cells the target board already shows add nothing new.
+        for _ in range(0, self.sample_amount):
+            pos = player.rng.choice(player.attack_piece_positions)
+
+            if not self.is_known(pos[0]*bit_board.board_size[1]+pos[1]) or len(candidates) == 0:
+                candidates.append(pos)
+
+        return list(dict.fromkeys(candidates))
+
+    def get_selection(self, player, target, mode, count, candidates):
+        # Select abilities take the most valuable candidates and fill up
+        # with random cells, like the AI always did.
+        columns = self.board_size[1]
+        get_value = lambda pos: self.get_cell_value(pos[0]*columns+pos[1], mode)
+
+        positions = sorted(candidates, key=get_value, reverse=True)[:count]
+        selected_positions = set(positions)
+
+        while len(selected_positions) < min(count, len(player.attack_piece_positions)):
+            pos = player.rng.choice(player.attack_piece_positions)
+
+            if pos not in selected_positions:
+                selected_positions.add(pos)
+                positions.append(pos)
+
+        return tuple(positions), sum([get_value(pos) for pos in positions])
+
+    def get_options(self, player, target, orientation):
+        points = {'A': player.attack_points, 'S': player.scout_points}
+        ship_keys = (None,)+tuple([ship_object.__class__.__name__ for ship_object in player.bit_board.get_available_ships()])
+        stored_candidates = {}
+        options = []
+
+        for mode in ('A', 'S'):
+            for ship_key in ship_keys:
+                cost = get_move_cost(ship_key, mode)
+
+                if cost > points[mode]+POINT_INCOME*self.save_turns:
+                    continue
+
+                if mode not in stored_candidates:
+                    stored_candidates[mode] = self.get_candidates(player, target, mode)
+                candidates = stored_candidates[mode]
+
+                if ship_key != None and get_ability(ship_key, mode).kind == 'select':
+                    positions, value = self.get_selection(player, target, mode, get_ability(ship_key, mode).count+1, candidates)
+                else:
+                    positions, value = None, -1.0
+
+                    for pos in candidates:
+                        pos_value = self.get_value(ship_key, mode, pos, orientation)
+
+                        if pos_value > value:
+                            positions, value = (pos,), pos_value
+
+                options.append((ship_key, mode, positions, cost, value))
+        return options
+
+    def get_move(self, player, target, orientation):
+        self.sync(target)
+
+        points = {'A': player.attack_points, 'S': player.scout_points}
+        options = self.get_options(player, target, orientation)
+
+        best_rates = {'A': 0.0, 'S': 0.0}
+        saved_points = {'A': 0, 'S': 0}
+
+        for ship_key, mode, positions, cost, value in options:
+            if value/cost > best_rates[mode]:
+                best_rates[mode] = value/cost
+
+                # The best ability of a pool is worth waiting for, nothing
+                # else of that pool may eat into the points it needs.
+                saved_points[mode] = cost if cost > points[mode] else 0
+
+        best_move = None
+        best_utility = None
+
+        for ship_key, mode, positions, cost, value in options:
+            if cost > points[mode]:
+                continue
+
+            if ship_key != None and saved_points[mode] > 0 and points[mode]-cost+POINT_INCOME*self.save_turns < saved_points[mode]:
+                continue
+
+            utility = value-cost*self.point_weight*best_rates[mode]
+
+            if best_utility == None or utility > best_utility:
+                best_utility = utility
+                best_move = (ship_key, mode, positions)
+        return best_move
@@ -0,0 +1,441 @@
+# Battle Ship // Endgame Solver
+# Developed using Python3
+
+__author__ = "Hkaar"
+
+__copyright__ = "Copyright (c) 2021 Hkaar"
+__license__ = "GNU General Public License (GPL) V3"
+
+"""This file is part of Battle Ship.
+
+Battle Ship is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+any later version.
+
+Battle Ship is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Battle Ship.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+__version__ = 0.1
+
+import collections
+
+from battleship.bitboard import count_bits, iter_bits
+from battleship.transposition import Transposition_Table, get_zobrist_keys, splitmix64, HASH_MASK, HIT_LAYER
+
+class Search_Limit(Exception):
+    pass
+
+def get_sunk_ships(bit_board):
+    # An attacker only learns which ship a hit sank. The ship lies on hits in
+    # a line through that cell and never on the hit that sank another ship,
+    # so every sunk ship gets its size, the cells all its placements share
+    # and one of those placements.
+    rows, columns = bit_board.board_size
+    sunk_cells = 0
+    stored_placements = {}
+
+    for cell in bit_board.sunk_hits:
+        sunk_cells |= 1 << cell
+
+    for cell in bit_board.sunk_hits:
+        ship_size = bit_board.sunk_hits[cell][1]
+        y, x = divmod(cell, columns)
+        placements = []
+
+        for start in range(max(0, x-ship_size+1), min(x, columns-ship_size)+1):
+            placements.append(((1 << ship_size)-1) << (y*columns+start))
+        for start in range(max(0, y-ship_size+1), min(y, rows-ship_size)+1):
+            placements.append(sum([1 << ((start+size_num)*columns+x) for size_num in range(0, ship_size)]))
+
+        other_cells = sunk_cells & ~(1 << cell)
+        stored_placements[cell] = [ship_mask for ship_mask in dict.fromkeys(placements)
+            if not ship_mask & ~bit_board.hits and not ship_mask & other_cells]
+
+    # Cells one ship surely covers rule out the placements of the others
+    # over them, until no placement is left out anymore.
+    sure_masks = {cell: 1 << cell for cell in stored_placements}
+    changed = True
+
+    while changed:
+        changed = False
+
+        for cell in stored_placements:
+            taken_mask = 0
+            for other_cell in sure_masks:
+                if other_cell != cell:
+                    taken_mask |= sure_masks[other_cell]
+
+            placements = [ship_mask for ship_mask in stored_placements[cell] if not ship_mask & taken_mask]
+            if 0 < len(placements) < len(stored_placements[cell]):
+                stored_placements[cell] = placements
+
+            sure_mask = stored_placements[cell][0] if len(stored_placements[cell]) > 0 else 1 << cell
+            for ship_mask in stored_placements[cell][1:]:
+                sure_mask &= ship_mask
+
+            if sure_mask != sure_masks[cell]:
+                sure_masks[cell] = sure_mask
+                changed = True
+
+    sunk_ships = {}
+
+    for cell in stored_placements:
+        ship_object, ship_size = bit_board.sunk_hits[cell]
+        placement = stored_placements[cell][0] if len(stored_placements[cell]) > 0 else sure_masks[cell]
+        sunk_ships[ship_object] = (ship_size, sure_masks[cell], placement)
+    return sunk_ships
+
+def get_knowledge(bit_board):
+    # Everything an attacker knows about a board, the hits a sunk ship surely
+    # covers are closed, all other hits are open.
+    sunk_ships = get_sunk_ships(bit_board)
+    sunk_mask = 0
+
+    for ship_object in sunk_ships:
+        sunk_mask |= sunk_ships[ship_object][1]
+
+    remaining_sizes = [ship_size for ship_object, ship_size in bit_board.get_fleet() if ship_object not in sunk_ships]
+
+    return (bit_board.hits & ~sunk_mask, bit_board.misses, bit_board.spotted & ~bit_board.hits, sunk_mask,
+        tuple(sorted(remaining_sizes, reverse=True)))
+
+class Endgame_Solution:
+    def __init__(self, knowledge, total, cell_counts, configurations=None):
+        self.knowledge = knowledge
+        self.total = total
+        self.cell_counts = cell_counts
+
+        # Every consistent fleet as a tuple of ship masks, only kept while
+        # there are few enough of them to filter on the next turn.
+        self.configurations = configurations
+
+    def get_probability(self, cell):
+        if self.total == 0:
+            return 0.0
+        return self.cell_counts.get(cell, 0)/self.total
+
+    def get_probabilities(self):
+        return {cell: float(self.cell_counts[cell])/self.total for cell in self.cell_counts}
+
+    def get_scores(self, unknown_mask):
+        return {cell: self.cell_counts[cell] for cell in self.cell_counts if unknown_mask >> cell & 1}
+
+class Endgame_Solver:
+    def __init__(self, board_size, max_nodes=5000, max_configurations=2048, max_shot_configurations=12, max_shot_nodes=400, shot_amount=4,
+        max_cells=1024, stored_amount=64):
+        self.board_size = board_size
+        self.max_cells = max_cells
+
+        self.max_nodes = max_nodes
+        self.max_configurations = max_configurations
+        self.max_shot_configurations = max_shot_configurations
+        self.max_shot_nodes = max_shot_nodes
+        self.shot_amount = shot_amount
+
+        self.stored_placements = {}
+        self.placement_cells = {}
+        self.stored_solutions = collections.OrderedDict()
+        self.stored_amount = stored_amount
+        self.last_solution = None
+
+        self.transposition_table = Transposition_Table(1 << 14, 'depth')
+
+    def get_placements(self, ship_size):
+        if ship_size not in self.stored_placements:
+            rows, columns = self.board_size
+            placements = []
+
+            if ship_size <= columns:
+                for y in range(0, rows):
+                    for x in range(0, columns-ship_size+1):
+                        placements.append(((1 << ship_size)-1) << (y*columns+x))
+
+            if 1 < ship_size <= rows:
+                column_mask = sum([1 << (size_num*columns) for size_num in range(0, ship_size)])
+
+                for y in range(0, rows-ship_size+1):
+                    for x in range(0, columns):
+                        placements.append(column_mask << (y*columns+x))
+
+            self.stored_placements[ship_size] = tuple(placements)
+            for ship_mask in placements:
+                self.placement_cells[ship_mask] = tuple(iter_bits(ship_mask))
+        return self.stored_placements[ship_size]
+
+    def solve(self, knowledge):
+        if knowledge in self.stored_solutions:
+            self.stored_solutions.move_to_end(knowledge)
+            return self.stored_solutions[knowledge]
+
+        # Every placement is kept as a whole board mask, which does not pay
+        # off on huge boards that never get down to a handful of fleets.
+        if self.board_size[0]*self.board_size[1] > self.max_cells:
+            return None
+
+        solution = None
+        last_solution = self.last_solution
+
+        # Observations only ever grow, so the fleets of the last turn only
+        # have to be filtered as long as no ship sank in between.
+        if last_solution != None and last_solution.configurations != None and last_solution.knowledge[3:] == knowledge[3:]:
+            if all([not last_solution.knowledge[index] & ~knowledge[index] for index in range(0, 3)]):
+                solution = self.filter_solution(last_solution, knowledge)
+
+        if solution == None:
+            try:
+                solution = self.enumerate(knowledge)
+            except Search_Limit:
+                solution = None
+
+        self.stored_solutions[knowledge] = solution
+        if len(self.stored_solutions) > self.stored_amount:
+            self.stored_solutions.popitem(last=False)
+
+        if solution != None:
+            self.last_solution = solution
+        return solution
+
+    def filter_solution(self, last_solution, knowledge):
+        open_hits, misses, spotted = knowledge[0], knowledge[1], knowledge[2]
+        required = open_hits | spotted
+
+        cell_counts = {}
+        configurations = []
+
+        for configuration in last_solution.configurations:
+            fleet_mask = 0
+            for ship_mask in configuration:
+                fleet_mask |= ship_mask
+
+            if fleet_mask & misses or required & ~fleet_mask:
+                continue
+
+            if not all([ship_mask & ~open_hits for ship_mask in configuration]):
+                continue
+
+            configurations.append(configuration)
+            for cell in iter_bits(fleet_mask):
+                cell_counts[cell] = cell_counts.get(cell, 0)+1
+
+        return Endgame_Solution(knowledge, len(configurations), cell_counts, tuple(configurations))
+
+    def enumerate(self, knowledge):
+        open_hits, misses, spotted, sunk_mask, remaining_sizes = knowledge
+        blocked = misses | sunk_mask
+
+        # A floating ship never covers a miss or a sunk ship and always has
+        # at least one cell that was not hit yet.
+        candidates = {}
+        for ship_size in set(remaining_sizes):
+            candidates[ship_size] = tuple([ship_mask for ship_mask in self.get_placements(ship_size) if not ship_mask & blocked and ship_mask & ~open_hits])
+
+        # Without known ship cells every free fleet would be a leaf, so a board
+        # with too many of them is left to the density estimate right away.
+        if not open_hits | spotted:
+            fleet_amount = 1
+            for ship_size in remaining_sizes:
+                fleet_amount *= len(candidates[ship_size])
+
+            if fleet_amount > self.max_nodes*len(remaining_sizes):
+                raise Search_Limit()
+
+        placement_cells = self.placement_cells
+        cell_candidates = {}
+        cell_counts = {}
+        configurations = []
+        chosen = []
+        search = {'nodes': 0, 'total': 0, 'configurations': configurations}
+
+        def get_cell_candidates(ship_size, cell):
+            if (ship_size, cell) not in cell_candidates:
+                bit = 1 << cell
+                cell_candidates[(ship_size, cell)] = tuple([ship_mask for ship_mask in candidates[ship_size] if ship_mask & bit])
+            return cell_candidates[(ship_size, cell)]
+
+        def add_fleets(fleet_mask, ship_masks):
+            # The fleet placed so far once for every last ship that still fits.
+            fleet_amount = max(len(ship_masks), 1)
+
+            search['nodes'] += fleet_amount
+            if search['nodes'] > self.max_nodes:
+                raise Search_Limit()
+
+            search['total'] += fleet_amount
+
+            for cell in iter_bits(fleet_mask):
+                cell_counts[cell] = cell_counts.get(cell, 0)+fleet_amount
+
+            for ship_mask in ship_masks:
+                for cell in placement_cells[ship_mask]:
+                    cell_counts[cell] = cell_counts.get(cell, 0)+1
+
+            if search['configurations'] != None:
+                if len(configurations)+fleet_amount > self.max_configurations:
+                    search['configurations'] = None
+                elif len(ship_masks) > 0:
+                    configurations.extend([tuple(chosen)+(ship_mask,) for ship_mask in ship_masks])
+                else:
+                    configurations.append(tuple(chosen))
+
+        def place(ship_sizes, fleet_mask, uncovered, free_start):
+            search['nodes'] += 1
+
+            if search['nodes'] > self.max_nodes:
+                raise Search_Limit()
+
+            if len(ship_sizes) == 0:
+                if not uncovered:
+                    add_fleets(fleet_mask, ())
+                return None
+
+            # Known ship cells are covered first, the lowest one has to belong
+            # to one of the ships that are left, so every fleet is made once.
+            if uncovered:
+                if count_bits(uncovered) > sum(ship_sizes):
+                    return None
+
+                cell = (uncovered & -uncovered).bit_length()-1
+
+                for ship_size in sorted(set(ship_sizes), reverse=True):
+                    other_sizes = list(ship_sizes)
+                    other_sizes.remove(ship_size)
+                    other_sizes = tuple(other_sizes)
+
+                    for ship_mask in get_cell_candidates(ship_size, cell):
+                        if not ship_mask & fleet_mask:
+                            chosen.append(ship_mask)
+                            place(other_sizes, fleet_mask | ship_mask, uncovered & ~ship_mask, 0)
+                            chosen.pop()
+                return None
+
+            # The rest floats anywhere free, ships of the same size are placed
+            # in candidate order so no fleet is counted twice.
+            ship_size = ship_sizes[0]
+            other_sizes = ship_sizes[1:]
+            size_candidates = candidates[ship_size]
+
+            if len(other_sizes) == 0:
+                ship_masks = [ship_mask for ship_mask in size_candidates[free_start:] if not ship_mask & fleet_mask]
+
+                if len(ship_masks) > 0:
+                    add_fleets(fleet_mask, ship_masks)
+                return None
+
+            for candidate_index in range(free_start, len(size_candidates)):
+                ship_mask = size_candidates[candidate_index]
+
+                if not ship_mask & fleet_mask:
+                    chosen.append(ship_mask)
+                    place(other_sizes, fleet_mask | ship_mask, 0,
+                        candidate_index+1 if len(other_sizes) > 0 and other_sizes[0] == ship_size else 0)
+                    chosen.pop()
+
+        place(remaining_sizes, 0, open_hits | spotted, 0)
+
+        if search['configurations'] != None:
+            return Endgame_Solution(knowledge, search['total'], cell_counts, tuple(configurations))
+        return Endgame_Solution(knowledge, search['total'], cell_counts)
+
+    def get_best_shot(self, solution, max_nodes=None):
+        # Picks the shot that sinks the remaining fleet in the fewest shots on
+        # average over every consistent fleet, or None when there are too many.
+        if solution == None or solution.configurations == None or not 0 < len(solution.configurations) <= self.max_shot_configurations:
+            return None
+
+        configurations = solution.configurations
+        fleet_masks = []
+
+        for configuration in configurations:
+            fleet_mask = 0
+            for ship_mask in configuration:
+                fleet_mask |= ship_mask
+            fleet_masks.append(fleet_mask)
+
+        keys = get_zobrist_keys(self.board_size)
+        # Keys come from the fleets themselves, so the table still holds the
+        # states of the last turn once a shot removed some of the fleets.
+        configuration_keys = [splitmix64(hash(tuple(sorted(configuration))) & HASH_MASK) for configuration in configurations]
+
+        transposition_table = self.transposition_table
+        transposition_table.new_search()
+
+        search = {'nodes': 0, 'max_nodes': max_nodes if max_nodes != None else self.max_shot_nodes}
+
+        def get_outcome(configuration_index, bit, open_hits):
+            if not fleet_masks[configuration_index] & bit:
+                return 0
+
+            for ship_mask in configurations[configuration_index]:
+                if ship_mask & bit:
+                    return ship_mask if not ship_mask & ~(open_hits | bit) else 1
+            return 1
+
+        def get_expected_shots(configuration_ids, open_hits, state_hash):
+            remaining_masks = [fleet_masks[configuration_index] & ~open_hits for configuration_index in configuration_ids]
+
+            if len(configuration_ids) == 1 or remaining_masks.count(remaining_masks[0]) == len(remaining_masks):
+                return count_bits(remaining_masks[0]), None
+
+            stored_entry = transposition_table.get(state_hash)
+            if stored_entry != None:
+                return stored_entry
+
+            search['nodes'] += 1
+            if search['nodes'] > search['max_nodes']:
+                raise Search_Limit()
+
+            cell_counts = {}
+            for remaining_mask in remaining_masks:
+                for cell in iter_bits(remaining_mask):
+                    cell_counts[cell] = cell_counts.get(cell, 0)+1
+
+            best_expected = None
+            best_cell = None
+
+            # Only the likeliest shots are tried, the others rarely win and
+            # would make every level of the search a lot wider.
+            for cell in sorted(cell_counts, key=lambda cell: (-cell_counts[cell], cell))[:self.shot_amount]:
+                bit = 1 << cell
+                outcomes = {}
+
+                for configuration_index in configuration_ids:
+                    outcomes.setdefault(get_outcome(configuration_index, bit, open_hits), []).append(configuration_index)
+
+                expected = 1.0
+
+                for outcome in sorted(outcomes):
+                    outcome_ids = outcomes[outcome]
+                    outcome_hits = open_hits | bit if outcome != 0 else open_hits
+
+                    outcome_hash = keys.get_cell_key(0, HIT_LAYER, cell) if outcome != 0 else 0
+                    for configuration_index in configuration_ids:
+                        if configuration_index not in outcome_ids:
+                            outcome_hash ^= configuration_keys[configuration_index]
+
+                    expected += len(outcome_ids)*get_expected_shots(outcome_ids, outcome_hits, state_hash ^ outcome_hash)[0]/len(configuration_ids)
+
+                    if best_expected != None and expected >= best_expected:
+                        break
+
+                if best_expected == None or expected < best_expected:
+                    best_expected = expected
+                    best_cell = cell
+
+            transposition_table.store(state_hash, len(configuration_ids), best_expected, best_cell)
+            return best_expected, best_cell
+
+        root_hash = keys.get_mask_key(0, HIT_LAYER, solution.knowledge[0])
+        for configuration_key in configuration_keys:
+            root_hash ^= configuration_key
+
+        try:
+            return get_expected_shots(tuple(range(0, len(configurations))), solution.knowledge[0], root_hash)[1]
+        except Search_Limit:
+            return None
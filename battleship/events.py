@@ -0,0 +1,126 @@
+# Battle Ship // Event Scheduler
+# Developed using Python3
+
+__author__ = "Hkaar"
+
+__copyright__ = "Copyright (c) 2021 Hkaar"
+__license__ = "GNU General Public License (GPL) V3"
+
+"""This file is part of Battle Ship.
+
+Battle Ship is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+any later version.
+
+Battle Ship is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Battle Ship.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+__version__ = 0.1
+
+class Event_Attack:
+    __slots__ = ('orientation', 'move_count', 'last_position', 'position')
+    mode = 'A'
+
+    def __init__(self, position, move_count, orientation):
+        self.orientation = orientation
+        self.move_count = move_count
+        self.last_position = None
+        self.position = position
+
+class Event_Scout:
+    __slots__ = ('orientation', 'move_count', 'last_position', 'position')
+    mode = 'S'
+
+    def __init__(self, position, move_count, orientation):
+        self.orientation = orientation
+        self.move_count = move_count
+        self.last_position = None
+        self.position = position
+
+# Row and column step of every orientation, events start just outside the
+# board edge they were launched from and move this far every step.
+EVENT_STEPS = {'N': (1, 0), 'W': (0, 1), 'S': (-1, 0), 'E': (0, -1)}
+
+class Event_Scheduler:
+    __slots__ = ('stored_events',)
+
+    def __init__(self):
+        self.stored_events = []
+
+    def __len__(self):
+        return len(self.stored_events)
+
+    def __iter__(self):
+        return iter(self.stored_events)
+
+    def add_event(self, event):
+        self.stored_events.append(event)
+
+    def clear(self):
+        # A new list lets a running advance know it must not put its
+        # surviving events back.
+        self.stored_events = []
+
+    def get_start_position(self, event, board_size):
+        if event.last_position != None:
+            return event.last_position
+
+        if event.orientation == 'N':
+            return (-1, event.position[1])
+        elif event.orientation == 'W':
+            return (event.position[0], -1)
+        elif event.orientation == 'S':
+            return (board_size[0], event.position[1])
+        return (event.position[0], board_size[1])
+
+    def advance(self, board_size, target_board, exec_attack, exec_scout):
+        rows, columns = board_size
+
+        # Ship cells hit by earlier events of this pass still stop the events
+        # behind them, even though the ray index already dropped them.
+        hit_cells = set([])
+
+        current_events = self.stored_events
+        event_amount = len(current_events)
+        active_events = []
+
+        for event_index in range(0, event_amount):
+            event = current_events[event_index]
+            y, x = self.get_start_position(event, board_size)
+            step_y, step_x = EVENT_STEPS[event.orientation]
+            active = True
+
+            if event.mode == 'A':
+                ship_distance = target_board.get_ray_distance(y, x, step_y, step_x)
+
+            for step_num in range(1, event.move_count+1):
+                y += step_y
+                x += step_x
+
+                if not (0 <= y < rows and 0 <= x < columns):
+                    active = False
+                    break
+
+                if event.mode == 'A':
+                    exec_attack((y, x))
+
+                    if step_num == ship_distance or y*columns+x in hit_cells:
+                        hit_cells.add(y*columns+x)
+                        active = False
+                        break
+                else:
+                    exec_scout((y, x))
+                event.last_position = (y, x)
+
+            if active:
+                active_events.append(event)
+
+        if self.stored_events is current_events:
+            self.stored_events = active_events+current_events[event_amount:]
@@ -0,0 +1,435 @@
+# Battle Ship // Game State
+# Developed using Python3
+
+__author__ = "Hkaar"
+
+__copyright__ = "Copyright (c) 2021 Hkaar"
+__license__ = "GNU General Public License (GPL) V3"
+
+"""This file is part of Battle Ship.
+
+Battle Ship is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+any later version.
+
+Battle Ship is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Battle Ship.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+__version__ = 0.1
+
+import random
+
+from battleship.bitboard import MISS, HIT, SPOTTED
+from battleship.abilities import get_ability, get_move_cost, POINT_INCOME
+from battleship.events import EVENT_STEPS
+from battleship.transposition import get_zobrist_keys, HIT_LAYER, MISS_LAYER, SPOTTED_LAYER, SUNK_KEY
+
+# Passing the turn is a move as well, it hands the turn to the next player,
+# pays its point income and moves its events.
+END_TURN = None
+
+class Board_State:
+    __slots__ = ('ship_masks', 'ships', 'hits', 'misses', 'spotted', 'attack_points', 'scout_points', 'events')
+
+    def __init__(self, ship_masks, hits=0, misses=0, spotted=0, attack_points=0, scout_points=0, events=()):
+        # Ship masks are (ship key, mask) pairs and shared by every copy,
+        # events are (mode, position, move count, orientation, last position).
+        self.ship_masks = ship_masks
+        self.ships = 0
+
+        for _, ship_mask in ship_masks:
+            self.ships |= ship_mask
+
+        self.hits = hits
+        self.misses = misses
+        self.spotted = spotted
+
+        self.attack_points = attack_points
+        self.scout_points = scout_points
+        self.events = events
+
+    def copy(self):
+        board = Board_State.__new__(Board_State)
+        board.ship_masks = self.ship_masks
+        board.ships = self.ships
+
+        board.hits = self.hits
+        board.misses = self.misses
+        board.spotted = self.spotted
+
+        board.attack_points = self.attack_points
+        board.scout_points = self.scout_points
+        board.events = self.events
+        return board
+
+    def get_available_ships(self):
+        return tuple([ship_key for ship_key, ship_mask in self.ship_masks if ship_mask & ~self.hits])
+
+    def get_ship_at(self, bit):
+        for ship_index in range(0, len(self.ship_masks)):
+            if self.ship_masks[ship_index][1] & bit:
+                return ship_index
+        return None
+
+    def is_alive(self):
+        return (self.ships & ~self.hits) != 0
+
+class Game_State:
+    __slots__ = ('board_size', 'enable_abilities', 'boards', 'targets', 'current_turn', 'zobrist_keys', 'zobrist_hash')
+
+    def __init__(self, board_size, boards, targets, current_turn=1, enable_abilities=False, zobrist_keys=None):
+        self.board_size = board_size
+        self.enable_abilities = enable_abilities
+
+        # Boards of every player by player id, targets only hold the players
+        # that are still alive in turn order.
+        self.boards = boards
+        self.targets = targets
+        self.current_turn = current_turn
+
+        # The hash covers only what the players can know, so it is kept up
+        # to date on every change instead of hashing the boards again.
+        self.zobrist_keys = zobrist_keys if zobrist_keys != None else get_zobrist_keys(board_size)
+        self.zobrist_hash = self.gen_hash()
+
+    def copy(self):
+        state = Game_State.__new__(Game_State)
+        state.board_size = self.board_size
+        state.enable_abilities = self.enable_abilities
+
+        state.boards = self.boards.copy()
+        state.targets = self.targets.copy()
+        state.current_turn = self.current_turn
+
+        state.zobrist_keys = self.zobrist_keys
+        state.zobrist_hash = self.zobrist_hash
+        return state
+
+    def gen_hash(self):
+        keys = self.zobrist_keys
+        state_hash = keys.get_turn_key(self.current_turn)
+
+        for player_id in self.boards:
+            board = self.boards[player_id]
+
+            state_hash ^= keys.get_mask_key(player_id, HIT_LAYER, board.hits)
+            state_hash ^= keys.get_mask_key(player_id, MISS_LAYER, board.misses)
+            state_hash ^= keys.get_mask_key(player_id, SPOTTED_LAYER, board.spotted)
+
+            for ship_index in range(0, len(board.ship_masks)):
+                if not board.ship_masks[ship_index][1] & ~board.hits:
+                    state_hash ^= keys.get_key(SUNK_KEY, player_id, ship_index)
+
+            state_hash ^= keys.get_points_key(player_id, board.attack_points, board.scout_points)
+            state_hash ^= keys.get_events_key(player_id, board.events)
+
+        for player_id in self.targets:
+            state_hash ^= keys.get_target_key(player_id, self.targets[player_id])
+        return state_hash
+
+    def get_hash(self):
+        return self.zobrist_hash
+
+    def get_bit(self, pos):
+        if 0 <= pos[0] < self.board_size[0] and 0 <= pos[1] < self.board_size[1]:
+            return 1 << (pos[0]*self.board_size[1]+pos[1])
+        return 0
+
+    def get_target(self, player_id):
+        return self.targets.get(player_id)
+
+    def get_alive_players(self):
+        return tuple(self.targets.keys())
+
+    def is_over(self):
+        return len(self.targets) <= 1
+
+    def get_winner(self):
+        if len(self.targets) == 1:
+            return next(iter(self.targets))
+        return None
+
+    def get_next_player(self):
+        # Every player targets the one that plays after it, the targets are
+        # the turn ring of the game.
+        if self.current_turn in self.targets:
+            return self.targets[self.current_turn]
+
+        alive_players = tuple(self.targets.keys())
+
+        for player_id in alive_players:
+            if player_id > self.current_turn:
+                return player_id
+        return alive_players[0] if len(alive_players) > 0 else None
+
+def get_board_state(player_object):
+    bit_board = player_object.bit_board
+
+    ship_masks = tuple([(ship_object.__class__.__name__, bit_board.ship_masks[ship_object]) for ship_object in bit_board.ship_masks])
+    events = tuple([(event.mode, event.position, event.move_count, event.orientation, event.last_position)
+        for event in player_object.stored_events])
+
+    return Board_State(ship_masks, bit_board.hits, bit_board.misses, bit_board.spotted,
+        player_object.attack_points, player_object.scout_points, events)
+
+def get_game_state(attack_manager):
+    boards = {}
+    board_size = None
+
+    for player_id in attack_manager.player_objects:
+        boards[player_id] = get_board_state(attack_manager.player_objects[player_id])
+        board_size = attack_manager.player_objects[player_id].bit_board.board_size
+
+    return Game_State(board_size, boards, dict(attack_manager.player_targets),
+        attack_manager.current_active_turn, bool(attack_manager.enable_abilities))
+
+def set_points(state, player_id, board, attack_points, scout_points):
+    keys = state.zobrist_keys
+
+    state.zobrist_hash ^= keys.get_points_key(player_id, board.attack_points, board.scout_points)
+    state.zobrist_hash ^= keys.get_points_key(player_id, attack_points, scout_points)
+
+    board.attack_points = attack_points
+    board.scout_points = scout_points
+
+def set_events(state, player_id, board, events):
+    keys = state.zobrist_keys
+
+    state.zobrist_hash ^= keys.get_events_key(player_id, board.events)^keys.get_events_key(player_id, events)
+    board.events = events
+
+def set_target(state, player_id, target_id):
+    keys = state.zobrist_keys
+
+    if player_id in state.targets:
+        state.zobrist_hash ^= keys.get_target_key(player_id, state.targets[player_id])
+
+    if target_id != None:
+        state.zobrist_hash ^= keys.get_target_key(player_id, target_id)
+        state.targets[player_id] = target_id
+    else:
+        del state.targets[player_id]
+
+def write_board(state, player_id, written):
+    # Boards are copied the first time a move changes them, everything the
+    # move does not touch stays shared with the state it came from.
+    if player_id not in written:
+        state.boards[player_id] = state.boards[player_id].copy()
+        written.add(player_id)
+    return state.boards[player_id]
+
+def next_target(state, player_id, written, new_target):
+    # The attacker of an eliminated player takes over its target.
+    if new_target != None and new_target in state.targets:
+        set_events(state, player_id, write_board(state, player_id, written), ())
+        set_target(state, player_id, new_target)
+        return new_target
+    return None
+
+def exec_cell(state, player_id, pos, mode, result, written):
+    if player_id not in state.targets or len(state.targets) <= 1:
+        return False
+
+    target_id = state.targets[player_id]
+    bit = state.get_bit(pos)
+
+    if not bit:
+        return True
+
+    board = write_board(state, target_id, written)
+    hits, misses, spotted = board.hits, board.misses, board.spotted
+
+    if mode == 'A':
+        if bit & board.ships:
+            if bit & board.hits:
+                outcome = MISS
+            else:
+                board.hits |= bit
+                board.spotted &= ~bit
+                outcome = HIT
+        else:
+            board.misses |= bit
+            outcome = MISS
+
+    elif bit & board.ships & ~board.hits:
+        board.spotted |= bit
+        outcome = SPOTTED
+    else:
+        if not bit & board.ships:
+            board.misses |= bit
+        outcome = MISS
+
+    keys = state.zobrist_keys
+    cell = bit.bit_length()-1
+
+    if hits != board.hits:
+        state.zobrist_hash ^= keys.get_cell_key(target_id, HIT_LAYER, cell)
+    if misses != board.misses:
+        state.zobrist_hash ^= keys.get_cell_key(target_id, MISS_LAYER, cell)
+    if spotted != board.spotted:
+        state.zobrist_hash ^= keys.get_cell_key(target_id, SPOTTED_LAYER, cell)
+
+    if outcome == SPOTTED:
+        result['spotted'].append(pos)
+
+    elif outcome == HIT:
+        result['hits'].append(pos)
+        ship_index = board.get_ship_at(bit)
+
+        if not board.ship_masks[ship_index][1] & ~board.hits:
+            state.zobrist_hash ^= keys.get_key(SUNK_KEY, target_id, ship_index)
+            result['sunk'].append((target_id, board.ship_masks[ship_index][0]))
+
+        # The rest of a footprint lands on whoever is targeted next.
+        if not board.is_alive():
+            new_target = state.targets[target_id]
+
+            set_target(state, target_id, None)
+            result['eliminated'].append(target_id)
+
+            if len(state.targets) > 1:
+                next_target(state, player_id, written, new_target)
+    else:
+        result['misses'].append(pos)
+    return True
+
+def advance_events(state, player_id, result, written):
+    current_events = state.boards[player_id].events
+
+    if len(current_events) == 0 or player_id not in state.targets:
+        return None
+
+    rows, columns = state.board_size
+    target_id = state.targets[player_id]
+
+    hit_cells = 0
+    active_events = []
+
+    for mode, position, move_count, orientation, last_position in current_events:
+        if last_position != None:
+            y, x = last_position
+        elif orientation == 'N':
+            y, x = -1, position[1]
+        elif orientation == 'W':
+            y, x = position[0], -1
+        elif orientation == 'S':
+            y, x = rows, position[1]
+        else:
+            y, x = position[0], columns
+
+        step_y, step_x = EVENT_STEPS[orientation]
+        target_board = state.boards[target_id]
+        remaining = target_board.ships & ~target_board.hits
+        active = True
+
+        # Attack events stop on the first ship cell that was not hit when
+        # they started moving, or where an earlier event of this pass stopped.
+        for _ in range(0, move_count):
+            y += step_y
+            x += step_x
+
+            if not (0 <= y < rows and 0 <= x < columns):
+                active = False
+                break
+
+            bit = 1 << (y*columns+x)
+            exec_cell(state, player_id, (y, x), mode, result, written)
+
+            if mode == 'A' and (remaining | hit_cells) & bit:
+                hit_cells |= bit
+                active = False
+                break
+            last_position = (y, x)
+
+        if active:
+            active_events.append((mode, position, move_count, orientation, last_position))
+
+    # Losing the target clears the events, so nothing is put back then.
+    if state.boards[player_id].events is current_events:
+        set_events(state, player_id, write_board(state, player_id, written), tuple(active_events))
+
+def apply(state, move, rng=None):
+    """Plays a move for the player whose turn it is and returns the new state
+    with the result, the given state is never changed.
+
+    A move is (ship key, mode, positions) or (ship key, mode, positions,
+    orientation), a ship key of None is the default attack or scout."""
+    rng = rng if rng != None else random
+
+    if state.is_over():
+        raise ValueError('The game is already over!')
+
+    new_state = state.copy()
+    result = {'hits': [], 'misses': [], 'spotted': [], 'sunk': [], 'eliminated': []}
+    written = set([])
+
+    if move == END_TURN:
+        next_player = new_state.get_next_player()
+
+        new_state.zobrist_hash ^= new_state.zobrist_keys.get_turn_key(new_state.current_turn)^new_state.zobrist_keys.get_turn_key(next_player)
+        new_state.current_turn = next_player
+
+        if new_state.enable_abilities:
+            board = write_board(new_state, next_player, written)
+            set_points(new_state, next_player, board, board.attack_points+POINT_INCOME, board.scout_points+POINT_INCOME)
+
+            advance_events(new_state, new_state.current_turn, result, written)
+        return new_state, result
+
+    player_id = new_state.current_turn
+    ship_key, mode, positions = move[0], move[1], tuple(move[2])
+    orientation = move[3] if len(move) > 3 else 'W'
+
+    if len(positions) == 0:
+        raise ValueError('A move needs at least one position!')
+
+    if not new_state.enable_abilities and (ship_key != None or mode != 'A'):
+        raise ValueError('Only default attacks can be used without abilities!')
+
+    footprint = positions[:1]
+    new_event = None
+
+    if ship_key != None:
+        if ship_key not in new_state.boards[player_id].get_available_ships():
+            raise ValueError(f'{ship_key} can not be used anymore!')
+
+        ability = get_ability(ship_key, mode)
+
+        if ability.kind == 'select':
+            if len(set(positions)) != ability.count+1:
+                raise ValueError(f'{ship_key} needs {ability.count+1} different positions!')
+            footprint = positions
+
+        elif ability.kind == 'event':
+            footprint = ()
+            new_event = (mode, positions[0], ability.move_count, orientation, None)
+        else:
+            footprint = ability.get_footprint(positions[0], new_state.board_size, rng)
+
+    cost = get_move_cost(ship_key, mode) if new_state.enable_abilities else 0
+
+    if cost > 0:
+        board = write_board(new_state, player_id, written)
+
+        if mode == 'A' and board.attack_points >= cost:
+            set_points(new_state, player_id, board, board.attack_points-cost, board.scout_points)
+        elif mode == 'S' and board.scout_points >= cost:
+            set_points(new_state, player_id, board, board.attack_points, board.scout_points-cost)
+        else:
+            raise ValueError('Not enough points for this move!')
+
+    if new_event != None:
+        board = write_board(new_state, player_id, written)
+        set_events(new_state, player_id, board, board.events+(new_event,))
+
+    for pos in footprint:
+        if not exec_cell(new_state, player_id, pos, mode, result, written):
+            break
+    return new_state, result
@@ -24,11 +24,26 @@ along with Battle Ship.  If not, see <https://www.gnu.org/licenses/>.
 
 __version__ = 0.1
 
-import threading
 import random
-import gc
-
-from battleship.ships import Patrol_Boat, Destroyer, Submarine, Battle_Ship, Aircraft_Carrier
+import copy
+
+from battleship.ships import Fleet
+from battleship.bitboard import Bit_Board, HIT, SPOTTED, iter_bits
+from battleship.events import Event_Scheduler
+from battleship.abilities import get_ability, POINT_INCOME
+from battleship.economy import Ability_Planner
+from battleship.game_state import get_game_state
+from battleship.placement import Fleet_Placement
+from battleship.turn_ring import Turn_Ring, Target_Graph
+
+def set_pieces_enabled(piece_positions, enabled):
+    # Board views switch the whole board at once, other piece containers
+    # have every piece switched.
+    if hasattr(piece_positions, 'board_view'):
+        piece_positions.setEnabled(enabled)
+    else:
+        for pos in piece_positions:
+            piece_positions[pos].setEnabled(enabled)
 
 class Deploy_Manager:
     def __init__(self, player_amount, player_objects, attack_manager, player_windows=None):
@@ -63,8 +78,7 @@ class Deploy_Manager:
             if len(self.player_objects[selected_player].ship_positions) > 0:
                 self.deployment_status[selected_player] = True
 
-                for pos in self.player_objects[selected_player].deploy_piece_positions:
-                    self.player_objects[selected_player].deploy_piece_positions[pos].setEnabled(False)
+                set_pieces_enabled(self.player_objects[selected_player].deploy_piece_positions, False)
 
                 if check_deployment_status():
                     self.close()
@@ -151,19 +165,54 @@ class Deploy_Manager:
         return None
 
 class Attack_Manager:
-    def __init__(self, player_amount, player_objects, player_windows=None, close_method=None, enable_abilities=None):
+    def __init__(self, player_amount, player_objects, player_windows=None, close_method=None, enable_abilities=None, replay_recorder=None, turn_runner=None):
         self.enable_abilities = enable_abilities
+        self.replay_recorder = replay_recorder
         self.close_method = close_method
+        self.turn_runner = turn_runner
+
+        self.update_methods = []
+        self.sunk_methods = []
         self.current_active_turn = 1
 
         self.player_windows = player_windows
         self.dead_player_object = None
 
         self.player_objects = {}
-        self.player_targets = {}
+        self.player_targets = Target_Graph()
+        self.turn_ring = Turn_Ring()
+        self.shown_targets = {}
+
+        self.sunk_ships = []
 
         self.gen_players(player_amount, player_objects)
 
+    @property
+    def current_active_turn(self):
+        return self._current_active_turn
+
+    @current_active_turn.setter
+    def current_active_turn(self, player_id):
+        changed = getattr(self, '_current_active_turn', None) != player_id
+        self._current_active_turn = player_id
+
+        if changed:
+            self.exec_update_methods()
+
+    def add_update_method(self, update_method):
+        self.update_methods.append(update_method)
+
+    def exec_update_methods(self):
+        for update_method in self.update_methods:
+            update_method()
+
+    def add_sunk_method(self, sunk_method):
+        self.sunk_methods.append(sunk_method)
+
+    def exec_sunk_methods(self, player_id, ship_object):
+        for sunk_method in self.sunk_methods:
+            sunk_method(player_id, ship_object)
+
     def gen_players(self, player_amount, player_objects):
         if player_amount == len(player_objects):
             for gen_id in range(0, player_amount):
@@ -172,6 +221,8 @@ class Attack_Manager:
                 if isinstance(player_objects[gen_id], AI_Player):
                     player_objects[gen_id].player_id = gen_id+1
 
+                self.turn_ring.add(gen_id+1)
+
                 if gen_id+2 <= player_amount:
                     self.player_targets[gen_id+1] = gen_id+2
                 else:
@@ -180,224 +231,328 @@ class Attack_Manager:
             raise ValueError("Player amount does not match Player objects!")
 
     def next_target(self, selected_player):
-        def get_next_target():
-            targeted_players = tuple(self.player_targets.values())
+        def get_shown_target():
+            if selected_player in self.shown_targets:
+                return self.shown_targets[selected_player]
+            return self.player_objects.get(self.player_targets.get(selected_player), self.dead_player_object)
 
-            for player_id in self.player_targets:
-                if player_id not in targeted_players:
-                    return player_id
-            return None
-
-        def load_hit_positions():
+        def load_hit_positions(shown_target):
             if self.player_targets.get(selected_player):
-                target_hit_positions = self.player_objects[self.player_targets[selected_player]].stored_hit_positions
+                target = self.player_objects[self.player_targets[selected_player]]
             else:
-                target_hit_positions = self.dead_player_object.stored_hit_positions
+                target = self.dead_player_object
+
+            # The shown board always mirrors the masks of the target it was
+            # loaded from, so only cells whose masks differ have to change.
+            shown_masks = shown_target.bit_board.get_hit_masks() if shown_target != None else (0, 0, 0)
+            target_masks = target.bit_board.get_hit_masks() if target != None else (0, 0, 0)
+            misses, hits, spotted = target_masks
+
+            changed_mask = 0
+            for mask_index in range(0, 3):
+                changed_mask |= shown_masks[mask_index] ^ target_masks[mask_index]
+
+            player = self.player_objects[selected_player]
+            piece_positions = player.attack_piece_positions
+
+            self.suspend_piece_updates(player)
 
-            piece_positions = self.player_objects[selected_player].attack_piece_positions
-            piece_values = {0: '0', 1: 'X', 2: '#'}
+            for index in iter_bits(changed_mask):
+                pos = divmod(index, player.board_size[1])
+                bit = 1 << index
 
-            for pos in piece_positions:
-                piece_positions[pos].setText(' ')
-                piece_positions[pos].setEnabled(True)
+                if pos in piece_positions:
+                    if hits & bit:
+                        piece_positions[pos].setText('X')
+                    elif spotted & bit:
+                        piece_positions[pos].setText('#')
+                    elif misses & bit:
+                        piece_positions[pos].setText('0')
+                    else:
+                        piece_positions[pos].setText(' ')
+                    piece_positions[pos].setEnabled(not hits & bit)
 
-            for pos in target_hit_positions:
-                if pos in piece_positions and target_hit_positions[pos] in piece_values:
-                    piece_positions[pos].setText(piece_values[target_hit_positions[pos]])
+            self.resume_piece_updates(player)
 
-                    if target_hit_positions[pos] == 1:
-                        piece_positions[pos].setEnabled(False)
+            self.shown_targets[selected_player] = target
 
-        next_player_target = get_next_target()
+        next_player_target = self.player_targets.get_untargeted()
 
         if selected_player in self.player_objects and next_player_target != None and len(self.player_objects) > 1:
+            shown_target = get_shown_target()
+
             self.player_objects[selected_player].stored_events.clear()
             self.player_targets[selected_player] = next_player_target
 
             if not isinstance(self.player_objects[selected_player], AI_Player):
-                load_hit_positions()
+                load_hit_positions(shown_target)
 
-    def next_turn(self, selected_player):
-        def get_next_player():
-            available_players = tuple(self.player_objects.keys())
+    def get_next_player(self):
+        if self.current_active_turn in self.player_objects and not isinstance(self.player_objects[self.current_active_turn], AI_Player):
+            self.player_objects[self.current_active_turn].reset_positions()
 
-            if self.current_active_turn in self.player_objects and not isinstance(self.player_objects[self.current_active_turn], AI_Player):
-                self.player_objects[self.current_active_turn].reset_positions()
+        return self.turn_ring.get_next(self.current_active_turn)
 
-            for player_id in available_players:
-                if player_id == available_players[len(self.player_objects)-1] and self.current_active_turn == player_id:
-                    return available_players[0]
+    def next_ai_player(self):
+        # Hands the turn to the next player, eliminated players already left
+        # the turn ring. Returns it when it is an AI player whose move has to
+        # be made.
+        next_player = self.get_next_player()
 
-                elif player_id > self.current_active_turn:
-                    return player_id
+        if next_player == None or len(self.player_objects) <= 1:
             return None
 
-        def goto_next_player():
-            while True:
-                next_player = get_next_player()
+        self.current_active_turn = next_player
 
-                if next_player != None and len(self.player_objects[next_player].ship_positions) > 0 and len(self.player_objects) > 1:
-                    if isinstance(self.player_objects[next_player], AI_Player):
-                        self.player_objects[next_player].exec_player(self.player_objects[self.player_targets[next_player]].attack_piece_positions, self)
-                        self.current_active_turn = next_player
-                    else:
-                        self.current_active_turn = next_player
-                        break
-                elif len(self.player_objects[next_player].ship_positions) <= 0:
-                    self.current_active_turn = next_player
-                else:
-                    break
+        if isinstance(self.player_objects[next_player], AI_Player):
+            if self.enable_abilities:
+                self.player_objects[next_player].attack_points += POINT_INCOME
+                self.player_objects[next_player].scout_points += POINT_INCOME
+            return next_player
+        return None
 
-        if selected_player == self.current_active_turn:
-            next_player_thread = threading.Thread(target=goto_next_player, daemon=True)
-            next_player_thread.start()
-            next_player_thread.join()
+    def exec_ai_turn(self, player_id, turn_plan=None):
+        if player_id in self.player_objects and player_id in self.player_targets and len(self.player_objects) > 1:
+            player = self.player_objects[player_id]
+            target_piece_positions = self.player_objects[self.player_targets[player_id]].attack_piece_positions
 
-            if self.current_active_turn in self.player_objects and self.enable_abilities:
-                self.player_objects[self.current_active_turn].attack_points += 3
-                self.player_objects[self.current_active_turn].scout_points += 3
+            if turn_plan == None:
+                player.exec_player(target_piece_positions, self)
+            else:
+                player.exec_turn(turn_plan, self)
+            self.record_turn(player_id)
 
-                self.exec_events(self.current_active_turn)
+    def finish_ai_turns(self):
+        if self.current_active_turn in self.player_objects and self.enable_abilities:
+            self.player_objects[self.current_active_turn].attack_points += POINT_INCOME
+            self.player_objects[self.current_active_turn].scout_points += POINT_INCOME
 
-            self.check_widgets()
+            self.exec_events(self.current_active_turn)
+
+        self.check_widgets()
+
+    def next_turn(self, selected_player):
+        if selected_player == self.current_active_turn:
+            self.record_turn(selected_player)
 
-    def check_widgets(self):
-        def check_player_widgets(player_object):
-            available_ships = set([])
+            # A turn runner plays the AI turns in the background and calls
+            # finish_ai_turns once a human player is reached again.
+            if self.turn_runner != None:
+                return self.turn_runner.start(self)
 
-            for pos in player_object.ship_positions:
-                if player_object.ship_positions[pos] not in available_ships:
-                    available_ships.add(player_object.ship_positions[pos])
+            next_player = self.next_ai_player()
 
+            while next_player != None:
+                self.exec_ai_turn(next_player)
+                next_player = self.next_ai_player()
+
+            self.finish_ai_turns()
+
+    def check_widgets(self, check_all=False):
+        def check_player_widgets(player_object, ship_object=None):
             for widget_id in player_object.stored_widgets:
-                if player_object.stored_widgets[widget_id].ship_object not in available_ships:
-                    player_object.stored_widgets[widget_id].setEnabled(False)
+                widget = player_object.stored_widgets[widget_id]
+
+                if ship_object in (None, widget.ship_object) and player_object.bit_board.is_ship_sunk(widget.ship_object):
+                    widget.setEnabled(False)
             return None
 
-        for player_id in self.player_objects:
-            if not isinstance(self.player_objects[player_id], AI_Player):
-                check_player_widgets(self.player_objects[player_id])
+        if check_all:
+            for player_id in self.player_objects:
+                if not isinstance(self.player_objects[player_id], AI_Player):
+                    check_player_widgets(self.player_objects[player_id])
+
+        # Otherwise only the widgets of ships sunk since the last check change.
+        while len(self.sunk_ships) > 0:
+            player_object, ship_object = self.sunk_ships.pop(0)
+
+            if not isinstance(player_object, AI_Player):
+                check_player_widgets(player_object, ship_object)
 
     def is_player_target_alive(self, selected_player):
         if selected_player in self.player_objects:
             target = self.player_objects[self.player_targets[selected_player]]
 
-            if len(target.ship_positions) == 0:
+            if not target.bit_board.is_alive():
                 if not isinstance(target, AI_Player):
-                    for pos in target.attack_piece_positions:
-                        target.attack_piece_positions[pos].setEnabled(False)
+                    set_pieces_enabled(target.attack_piece_positions, False)
                 self.dead_player_object = target
 
                 self.player_objects.pop(self.player_targets[selected_player], None)
-                self.player_targets.pop(self.player_targets[selected_player], None)
+                self.turn_ring.remove(self.player_targets[selected_player])
+                self.player_targets.discard(self.player_targets[selected_player])
 
                 if len(self.player_objects) > 1:
                     self.next_target(selected_player)
                 else:
                     self.close()
 
+    def show_result(self, player, pos, result):
+        if isinstance(player, AI_Player):
+            return None
+
+        piece_text = player.attack_piece_positions[pos].text()
+
+        if result == HIT:
+            if piece_text != '0':
+                player.attack_piece_positions[pos].setEnabled(False)
+                player.attack_piece_positions[pos].setText('X')
+
+        elif result == SPOTTED:
+            if piece_text != '0':
+                player.attack_piece_positions[pos].setText('#')
+
+        elif piece_text not in ('X', '#'):
+            player.attack_piece_positions[pos].setText('0')
+
+    def check_sunk_ship(self, target_id, bit):
+        target = self.player_objects[target_id]
+        ship_object = target.bit_board.get_ship_at(bit)
+
+        if target.bit_board.is_ship_sunk(ship_object):
+            target.bit_board.add_sunk_ship(ship_object, bit)
+            self.sunk_ships.append((target, ship_object))
+            self.exec_sunk_methods(target_id, ship_object)
+            return ship_object
+        return None
+
+    def suspend_piece_updates(self, player):
+        if hasattr(player.attack_piece_positions, 'suspend_updates'):
+            player.attack_piece_positions.suspend_updates()
+
+    def resume_piece_updates(self, player):
+        if hasattr(player.attack_piece_positions, 'resume_updates'):
+            player.attack_piece_positions.resume_updates()
+
     def exec_attack(self, pos, selected_player):
         if selected_player in self.player_objects and len(self.player_objects) > 1:
             target = self.player_objects[self.player_targets[selected_player]]
             player = self.player_objects[selected_player]
+            bit = target.bit_board.get_bit(pos)
+            result = target.bit_board.attack(bit) if bit else None
 
-            if pos in target.ship_positions and pos in player.attack_piece_positions:
-                target.stored_hit_positions[pos] = 1
-                target.ship_positions.pop(pos, None)
+            if result != None and self.replay_recorder != None:
+                self.replay_recorder.add_result(self.player_targets[selected_player], 'A', bit, result)
 
-                if not isinstance(player, AI_Player) and player.attack_piece_positions[pos].text() != '0':
-                    player.attack_piece_positions[pos].setEnabled(False)
-                    player.attack_piece_positions[pos].setText('X')
+            if result == HIT:
+                target.ship_positions.pop(pos, None)
 
+                self.show_result(player, pos, result)
+                self.check_sunk_ship(self.player_targets[selected_player], bit)
                 self.is_player_target_alive(selected_player)
 
-            elif pos in player.attack_piece_positions:
-                target.stored_hit_positions[pos] = 0
-
-                if not isinstance(player, AI_Player) and player.attack_piece_positions[pos].text() not in ('X', '#'):
-                    player.attack_piece_positions[pos].setText('0')
+            elif bit:
+                self.show_result(player, pos, result)
 
     def exec_scout(self, pos, selected_player):
         if selected_player in self.player_objects and len(self.player_objects) > 1:
             target = self.player_objects[self.player_targets[selected_player]]
             player = self.player_objects[selected_player]
+            bit = target.bit_board.get_bit(pos)
+            result = target.bit_board.scout(bit) if bit else None
+
+            if result != None and self.replay_recorder != None:
+                self.replay_recorder.add_result(self.player_targets[selected_player], 'S', bit, result)
+
+            if bit:
+                self.show_result(player, pos, result)
+
+    def exec_many(self, positions, selected_player, mode):
+        summary = {'hits': [], 'misses': [], 'spotted': [], 'sunk': []}
+
+        if selected_player not in self.player_objects or len(self.player_objects) <= 1:
+            return summary
+
+        player = self.player_objects[selected_player]
+        target_id = self.player_targets[selected_player]
+        bit_board = self.player_objects[target_id].bit_board
+
+        self.suspend_piece_updates(player)
+
+        for pos in positions:
+            bit = bit_board.get_bit(pos)
+
+            if not bit:
+                continue
+
+            result = bit_board.attack(bit) if mode == 'A' else bit_board.scout(bit)
+
+            if self.replay_recorder != None:
+                self.replay_recorder.add_result(target_id, mode, bit, result)
+
+            self.show_result(player, pos, result)
 
-            if pos in target.ship_positions and pos in player.attack_piece_positions:
-                target.stored_hit_positions[pos] = 2
+            if result == SPOTTED:
+                summary['spotted'].append(pos)
 
-                if not isinstance(player, AI_Player) and player.attack_piece_positions[pos].text() != '0':
-                    player.attack_piece_positions[pos].setText('#')
+            elif result == HIT:
+                summary['hits'].append(pos)
+                self.player_objects[target_id].ship_positions.pop(pos, None)
 
-            elif pos in player.attack_piece_positions:
-                target.stored_hit_positions[pos] = 0
+                ship_object = self.check_sunk_ship(target_id, bit)
+                if ship_object != None:
+                    summary['sunk'].append(ship_object)
 
-                if not isinstance(player, AI_Player) and player.attack_piece_positions[pos].text() not in ('X', '#'):
-                    player.attack_piece_positions[pos].setText('0')
+                # The rest of the footprint lands on whoever is targeted next,
+                # the same as attacking the cells one by one.
+                if not bit_board.is_alive():
+                    self.is_player_target_alive(selected_player)
+
+                    if selected_player not in self.player_objects or len(self.player_objects) <= 1:
+                        break
+                    target_id = self.player_targets[selected_player]
+                    bit_board = self.player_objects[target_id].bit_board
+            else:
+                summary['misses'].append(pos)
+
+        self.resume_piece_updates(player)
+        return summary
+
+    def exec_attack_many(self, positions, selected_player):
+        return self.exec_many(positions, selected_player, 'A')
+
+    def exec_scout_many(self, positions, selected_player):
+        return self.exec_many(positions, selected_player, 'S')
 
     def exec_events(self, selected_player):
         if selected_player in self.player_objects and len(self.player_objects) > 1:
-            target_ship_positions = {**self.player_objects[self.player_targets[selected_player]].ship_positions}
+            target = self.player_objects[self.player_targets[selected_player]]
             player = self.player_objects[selected_player]
 
-            temp_stored_events = {**player.stored_events}
+            player.stored_events.advance(player.board_size, target.bit_board,
+                lambda pos: self.exec_attack(pos, selected_player), lambda pos: self.exec_scout(pos, selected_player))
 
-            def exec_event(event_id, event, pos):
-                if pos in player.attack_piece_positions:
-                    if event.__class__.__name__ == 'Event_Attack':
-                        self.exec_attack(pos, selected_player)
-                        if pos in target_ship_positions:
-                            player.stored_events.pop(event_id, None)
-                            return False
-                    else:
-                        self.exec_scout(pos, selected_player)
-                    event.last_position = pos
-                else:
-                    player.stored_events.pop(event_id, None)
-                    return False
-                return True
-
-            for event_id in temp_stored_events:
-                event = temp_stored_events[event_id]
-
-                if event.last_position != None:
-                    for _ in range(0, event.move_count):
-                        if event.orientation == 'N':
-                            pos = ((event.last_position[0]+1, event.last_position[1]))
-                        elif event.orientation == 'W':
-                            pos = ((event.last_position[0], event.last_position[1]+1))
-                        elif event.orientation == 'S':
-                            pos = ((event.last_position[0]-1, event.last_position[1]))
-                        else:
-                            pos = ((event.last_position[0], event.last_position[1]-1))
-
-                        if not exec_event(event_id, event, pos):
-                            del event
-                            break
-                else:
-                    for xy in range(0, event.move_count):
-                        if event.orientation == 'N':
-                            pos = ((xy, event.position[1]))
-                        elif event.orientation == 'W':
-                            pos = ((event.position[0], xy))
-                        elif event.orientation == 'S':
-                            pos = ((player.board_size[0]-(xy+1), event.position[1]))
-                        else:
-                            pos = ((event.position[0], player.board_size[1]-(xy+1)))
-
-                        if not exec_event(event_id, event, pos):
-                            del event
-                            break
-                gc.collect()
+    def load_boards(self):
+        for player_id in self.player_objects:
+            self.player_objects[player_id].load_bit_board()
+
+        if self.replay_recorder != None:
+            self.replay_recorder.start(self)
+
+    def record_move(self, ship_object, mode, positions):
+        if self.replay_recorder != None:
+            self.replay_recorder.add_move(ship_object, mode, positions)
+
+    def record_turn(self, selected_player):
+        if self.replay_recorder != None:
+            self.replay_recorder.end_turn(selected_player)
 
     def show(self):
         if self.player_windows != None:
             for win in self.player_windows:
                 win.show()
-        self.check_widgets()
+        self.load_boards()
+        self.check_widgets(True)
+
+        if self.turn_runner != None:
+            self.turn_runner.ponder(self)
 
         return None
 
     def close(self):
+        if self.turn_runner != None:
+            self.turn_runner.cancel()
+
         if self.player_windows != None:
             for win in self.player_windows:
                 win.close()
@@ -408,7 +563,10 @@ class Attack_Manager:
         return None
 
 class Player:
-    def __init__(self, attack_points, scout_points, ship_positions, orientation='W'):
+    def __init__(self, attack_points, scout_points, ship_positions, orientation='W', rng=None):
+        self.rng = rng if rng != None else random
+        self.update_methods = []
+
         self.attack_points = attack_points
         self.scout_points = scout_points
         self.selected_ship = None
@@ -420,6 +578,8 @@ class Player:
         self.current_mode = 'A'
 
         self.ship_positions = ship_positions
+        self.fleet = Fleet()
+
         self.deploy_piece_positions = {}
         self.attack_piece_positions = {}
         self.board_size = None
@@ -431,9 +591,53 @@ class Player:
         self.undo_positions = {}
         self.redo_positions = {}
 
+        self.bit_board = None
+
         self.stored_positions = set([])
-        self.stored_hit_positions = {}
-        self.stored_events = {}
+        self.stored_events = Event_Scheduler()
+
+    @property
+    def stored_hit_positions(self):
+        if self.bit_board != None:
+            return self.bit_board.get_hit_positions()
+        return {}
+
+    # Point changes are pushed to the update methods, so the attack window
+    # only redraws its displays when something actually changed.
+    @property
+    def attack_points(self):
+        return self._attack_points
+
+    @attack_points.setter
+    def attack_points(self, attack_points):
+        changed = getattr(self, '_attack_points', None) != attack_points
+        self._attack_points = attack_points
+
+        if changed:
+            self.exec_update_methods()
+
+    @property
+    def scout_points(self):
+        return self._scout_points
+
+    @scout_points.setter
+    def scout_points(self, scout_points):
+        changed = getattr(self, '_scout_points', None) != scout_points
+        self._scout_points = scout_points
+
+        if changed:
+            self.exec_update_methods()
+
+    def add_update_method(self, update_method):
+        self.update_methods.append(update_method)
+
+    def exec_update_methods(self):
+        for update_method in self.update_methods:
+            update_method()
+
+    def load_bit_board(self):
+        self.bit_board = Bit_Board(self.board_size)
+        self.bit_board.load_ship_positions(self.ship_positions)
 
     def reset_positions(self):
         self.current_special_ship = None
@@ -450,16 +654,13 @@ class Player:
         self.stored_widgets[gen_id()] = widget
 
     def add_event(self, event):
-        def gen_id():
-            for event_id in range(0, 999):
-                if event_id not in self.stored_events:
-                    return event_id
-            return None
-            
-        self.stored_events[gen_id()] = event
+        self.stored_events.add_event(event)
 
 class AI_Player:
-    def __init__(self, attack_points, scout_points, board_size=(7, 7)):
+    def __init__(self, attack_points, scout_points, board_size=(7, 7), fleet_pool=None, strategy=None, rng=None, ability_planner=True):
+        self.rng = rng if rng != None else random
+        self.ability_planner = Ability_Planner() if ability_planner else None
+
         self.attack_points = attack_points
         self.scout_points = scout_points
         self.selected_ship = None
@@ -471,84 +672,92 @@ class AI_Player:
         self.deploy_piece_positions = tuple([(y, x) for y in range(0, board_size[0]) for x in range(0, board_size[1])])
         self.attack_piece_positions = tuple([(y, x) for y in range(0, board_size[0]) for x in range(0, board_size[1])])
         self.board_size = board_size
+        self.fleet_pool = fleet_pool
+        self.strategy = strategy
         self.ship_positions = {}
+        self.fleet = Fleet()
+
+        self.bit_board = None
+        self.pondered_turn = None
 
         self.stored_positions = set([])
-        self.stored_hit_positions = {}
-        self.stored_events = {}
+        self.stored_events = Event_Scheduler()
 
         self.check_requirements()
         self.gen_ship_positions()
 
-    def gen_ship_positions(self):
-        def generate_positions(pos, selected_ship):
-            ship_positions = {}
-
-            def add_ship_pos(selected_pos):
-                if selected_pos in self.deploy_piece_positions and selected_pos not in self.ship_positions:
-                    ship_positions[selected_pos] = selected_ship
-
-            for size_num in range(0, selected_ship.size):
-                if self.orientation == 'N':
-                    gen_pos = (pos[0]-size_num, pos[1])
-                elif self.orientation == 'W':
-                    gen_pos = (pos[0], pos[1]-size_num)
-                elif self.orientation == 'S':
-                    gen_pos = (pos[0]+size_num, pos[1])
-                else:
-                    gen_pos = (pos[0], pos[1]+size_num)
-                add_ship_pos(gen_pos)
+    @property
+    def stored_hit_positions(self):
+        if self.bit_board != None:
+            return self.bit_board.get_hit_positions()
+        return {}
 
-            if len(ship_positions) == selected_ship.size:
-                self.ship_positions.update(ship_positions)
-            else:
-                return False
-            return True
+    def load_bit_board(self):
+        self.bit_board = Bit_Board(self.board_size)
+        self.bit_board.load_ship_positions(self.ship_positions)
 
-        def goto_generate_positions():
-            deployable_ships = (Patrol_Boat(), Destroyer(), Submarine(), Battle_Ship(), Aircraft_Carrier())
-            ship_index = 0
+    def gen_ship_positions(self):
+        deployable_ships = self.fleet.get_ships()
 
-            while ship_index < 5:
-                self.orientation = random.choice(('N', 'W', 'S', 'E'))
+        # Pooled fleets come from a shared background thread, so a seeded
+        # player always places its own fleet to stay reproducible.
+        if self.fleet_pool != None and self.rng == random and self.fleet_pool.ship_sizes == tuple([ship.size for ship in deployable_ships]):
+            fleet = self.fleet_pool.get_fleet(self.board_size)
+        else:
+            fleet = Fleet_Placement(self.board_size, [ship.size for ship in deployable_ships], self.rng).gen_fleet()
 
-                if generate_positions(random.choice(self.deploy_piece_positions), deployable_ships[ship_index]):
-                    ship_index += 1
+        self.ship_positions.clear()
 
-        ship_gen_thread = threading.Thread(target=goto_generate_positions, daemon=True)
-        ship_gen_thread.start()
+        for ship_index in range(0, len(deployable_ships)):
+            for pos in fleet[ship_index]:
+                self.ship_positions[pos] = deployable_ships[ship_index]
 
-    def exec_player(self, target_piece_positions, attack_manager):
+    def plan_turn(self, target_piece_positions, attack_manager, time_budget=None):
         get_name = lambda selected_object: selected_object.__class__.__name__
 
-        def get_ship():
-            available_ships = []
+        def get_target():
+            return attack_manager.player_objects[attack_manager.player_targets[self.player_id]]
 
-            for pos in self.ship_positions:
-                if self.ship_positions[pos] not in available_ships:
-                    available_ships.append(self.ship_positions[pos])
+        def get_position(mode):
+            if self.strategy != None:
+                return self.strategy.get_position(self, get_target(), mode)
+            return self.rng.choice(target_piece_positions)
 
-            return random.choice(tuple(available_ships))
+        def gen_positions(position_count, mode):
+            generated_positions = set([])
 
-        def gen_positions(position_count):
-            while len(self.stored_positions) < position_count:
-                pos = random.choice(target_piece_positions)
+            if self.strategy != None:
+                generated_positions = self.strategy.get_positions(self, get_target(), position_count, mode)
 
-                if pos not in self.stored_positions:
-                    self.stored_positions.add(pos)
+            while len(generated_positions) < position_count:
+                pos = self.rng.choice(target_piece_positions)
 
-        def exec_multiple_attacks():
-            if self.stored_positions != None and get_name(self.stored_positions):
-                for pos in self.stored_positions:
-                    if self.current_mode == 'A':
-                        attack_manager.exec_attack(pos, self.player_id)
-                    else:
-                        attack_manager.exec_scout(pos, self.player_id)
-            self.stored_positions = set([])
+                if pos not in generated_positions:
+                    generated_positions.add(pos)
+            return tuple(generated_positions)
+
+        def get_move():
+            # Searching strategies never think longer than the turn allows.
+            stored_budget = getattr(self.strategy, 'time_budget', None)
 
-        self.orientation = random.choice(('N', 'W', 'S', 'E'))
-        self.current_mode = random.choice(('A', 'S'))
-        self.selected_ship = get_ship()
+            if time_budget != None and stored_budget != None:
+                self.strategy.time_budget = min(stored_budget, time_budget)
+            try:
+                return self.strategy.get_move(self, get_target(), attack_manager)
+            finally:
+                if stored_budget != None:
+                    self.strategy.time_budget = stored_budget
+
+        orientation = self.rng.choice(('N', 'W', 'S', 'E'))
+
+        if self.strategy != None and hasattr(self.strategy, 'get_move'):
+            return orientation, get_move()
+
+        if attack_manager.enable_abilities and self.ability_planner != None:
+            return orientation, self.ability_planner.get_move(self, get_target(), orientation)
+
+        mode = self.rng.choice(('A', 'S'))
+        ship_object = self.rng.choice(self.bit_board.get_available_ships())
 
         if isinstance(target_piece_positions, dict):
             target_piece_positions = tuple(target_piece_positions.keys())
@@ -556,31 +765,214 @@ class AI_Player:
             target_piece_positions = tuple(target_piece_positions)
 
         if attack_manager.enable_abilities:
-            if (isinstance(self.selected_ship, Aircraft_Carrier) and self.current_mode == 'A') or (isinstance(self.selected_ship, Patrol_Boat) and self.current_mode == 'S'):
-                position_counts = {'Aircraft_Carrier': 9, 'Patrol_Boat': 5}
+            if ship_object.is_multi_select(mode):
+                # The AI always selects one cell more than the ability needs.
+                position_count = get_ability(get_name(ship_object), mode).count+1
+                return orientation, (get_name(ship_object), mode, gen_positions(position_count, mode))
+            return orientation, (get_name(ship_object), mode, (get_position(mode),))
+        return orientation, (None, 'A', (get_position(mode),))
+
+    def exec_turn(self, turn_plan, attack_manager):
+        get_name = lambda selected_object: selected_object.__class__.__name__
 
-                gen_position_thread = threading.Thread(target=gen_positions, args=(position_counts[get_name(self.selected_ship)],), daemon=True)
-                gen_position_thread.start()
-                gen_position_thread.join()
-            else:
+        def exec_multiple_attacks():
+            if self.stored_positions != None and get_name(self.stored_positions) in ('set', 'tuple'):
                 if self.current_mode == 'A':
-                    self.stored_positions = self.selected_ship.get_attack(random.choice(target_piece_positions), self)
+                    attack_manager.exec_attack_many(self.stored_positions, self.player_id)
+                else:
+                    attack_manager.exec_scout_many(self.stored_positions, self.player_id)
+            self.stored_positions = set([])
+
+        def is_multi_select():
+            return self.selected_ship.is_multi_select(self.current_mode)
+
+        def get_own_ship(ship_name):
+            for ship_object in self.bit_board.get_available_ships():
+                if get_name(ship_object) == ship_name:
+                    return ship_object
+            return None
+
+        def exec_strategy_move(move):
+            if move != None:
+                ship_name, self.current_mode, positions = move
+                self.selected_ship = get_own_ship(ship_name)
+
+                if self.selected_ship != None:
+                    cost = self.selected_ship.attack_cost if self.current_mode == 'A' else self.selected_ship.scout_cost
                 else:
-                    self.stored_positions = self.selected_ship.get_scout(random.choice(target_piece_positions), self)
+                    cost = 1
+
+                if not attack_manager.enable_abilities:
+                    cost = 0
+
+                if self.current_mode == 'A':
+                    self.attack_points -= cost
+                else:
+                    self.scout_points -= cost
+
+                if self.selected_ship == None or is_multi_select():
+                    self.stored_positions = set(positions)
+                elif self.current_mode == 'A':
+                    self.stored_positions = self.selected_ship.get_attack(positions[0], self)
+                else:
+                    self.stored_positions = self.selected_ship.get_scout(positions[0], self)
+
+                attack_manager.record_move(self.selected_ship, self.current_mode, positions)
+
+            if attack_manager.enable_abilities:
+                attack_manager.exec_events(self.player_id)
+            exec_multiple_attacks()
+
+        self.orientation, move = turn_plan
+
+        if self.strategy != None and hasattr(self.strategy, 'get_move'):
+            return exec_strategy_move(move)
+
+        if attack_manager.enable_abilities and self.ability_planner != None:
+            return exec_strategy_move(move)
+
+        ship_name, self.current_mode, positions = move
+
+        if attack_manager.enable_abilities:
+            self.selected_ship = get_own_ship(ship_name)
+
+            if is_multi_select():
+                self.stored_positions = positions
+            elif self.current_mode == 'A':
+                self.stored_positions = self.selected_ship.get_attack(positions[0], self)
+            else:
+                self.stored_positions = self.selected_ship.get_scout(positions[0], self)
+
+            attack_manager.record_move(self.selected_ship, self.current_mode, positions)
             attack_manager.exec_events(self.player_id)
             exec_multiple_attacks()
         else:
-            attack_manager.exec_attack(random.choice(target_piece_positions), self.player_id, q)
+            attack_manager.record_move(None, 'A', positions)
+            attack_manager.exec_attack(positions[0], self.player_id)
 
-    def add_event(self, event):
-        def gen_id():
-            for event_id in range(0, 999):
-                if event_id not in self.stored_events:
-                    return event_id
+    def exec_player(self, target_piece_positions, attack_manager):
+        self.exec_turn(self.plan_turn(target_piece_positions, attack_manager), attack_manager)
+
+    def get_turn_key(self, attack_manager, next_turn=False):
+        # Everything plan_turn looks at, a pondered turn is only played while
+        # the game still has the same key.
+        point_bonus = 3 if next_turn and attack_manager.enable_abilities else 0
+        target_id = attack_manager.player_targets.get(self.player_id)
+
+        turn_key = (target_id, self.bit_board.get_available_ships(), attack_manager.enable_abilities)
+
+        if (self.strategy != None or attack_manager.enable_abilities) and target_id in attack_manager.player_objects:
+            turn_key += (attack_manager.player_objects[target_id].bit_board.get_hit_masks(),
+                self.attack_points+point_bonus, self.scout_points+point_bonus)
+        return turn_key
+
+    def get_ponder_game(self, attack_manager):
+        return Ponder_Game(self, attack_manager)
+
+    def ponder_turn(self, ponder_game, time_budget=None):
+        # Runs on the ponder thread, which reads nothing but the ponder game.
+        ponder_player = ponder_game.player_object
+        turn_plan = ponder_player.plan_turn(ponder_game.target_piece_positions, ponder_game, time_budget)
+
+        self.pondered_turn = (ponder_game.turn_key, ponder_game.rng_states, turn_plan,
+            ponder_player.rng, ponder_player.strategy, ponder_player.ability_planner)
+
+    def is_turn_pondered(self, attack_manager):
+        pondered_turn = self.pondered_turn
+
+        if pondered_turn == None or pondered_turn[0] != self.get_turn_key(attack_manager):
+            return False
+
+        # Seeded generators have to be exactly where the ponder started, the
+        # shared random module is left as it is.
+        rng_states = pondered_turn[1]
+
+        if self.rng != random and self.rng.getstate() != rng_states[0]:
+            return False
+
+        if self.strategy != None and self.strategy.rng != random and self.strategy.rng.getstate() != rng_states[1]:
+            return False
+        return True
+
+    def get_pondered_turn(self, attack_manager):
+        if not self.is_turn_pondered(attack_manager):
+            self.pondered_turn = None
             return None
 
-        self.stored_events[gen_id()] = event
+        turn_key, rng_states, turn_plan, ponder_rng, ponder_strategy, ponder_planner = self.pondered_turn
+        self.pondered_turn = None
+
+        stored_rngs = [(self.rng, ponder_rng)]
+
+        if self.strategy != None:
+            stored_rngs.append((self.strategy.rng, ponder_strategy.rng))
+
+        for rng, ponder_rng in stored_rngs:
+            if rng != random:
+                rng.setstate(ponder_rng.getstate())
+
+        # The caches of the ponder are taken over here on the thread that
+        # plays the turn.
+        if self.strategy != None:
+            self.strategy.merge(ponder_strategy)
+
+        if self.ability_planner != None:
+            self.ability_planner = ponder_planner
+        return turn_plan
+
+    def add_event(self, event):
+        self.stored_events.add_event(event)
 
     def check_requirements(self):
         if self.board_size < (7, 7):
             raise ValueError("AI Player board size must be 7 x 7 or bigger!")
+
+# Everything a pondering AI player plans from, taken on the GUI thread before
+# the ponder is queued. It stands in for the attack manager, so the ponder
+# thread never reads a game that changes under it.
+class Ponder_Game:
+    def __init__(self, player_object, attack_manager):
+        def copy_rng(rng):
+            rng_copy = random.Random()
+            rng_copy.setstate(rng.getstate())
+            return rng_copy
+
+        self.game_state = get_game_state(attack_manager)
+        self.enable_abilities = self.game_state.enable_abilities
+        self.player_targets = self.game_state.targets
+        self.turn_key = player_object.get_turn_key(attack_manager, True)
+
+        player_id = player_object.player_id
+        target_id = self.game_state.get_target(player_id)
+
+        target_object = copy.copy(attack_manager.player_objects[target_id])
+        target_object.bit_board = target_object.bit_board.copy()
+        self.target_piece_positions = tuple(target_object.attack_piece_positions)
+
+        # The turn is planned on copies of the random generators, the real
+        # ones only move on once the pondered turn gets played.
+        ponder_player = copy.copy(player_object)
+        ponder_player.rng = copy_rng(player_object.rng)
+        ponder_player.bit_board = player_object.bit_board.copy()
+        ponder_player.stored_events = copy.deepcopy(player_object.stored_events)
+        ponder_player.stored_positions = set([])
+        ponder_player.pondered_turn = None
+        self.rng_states = (ponder_player.rng.getstate(), None)
+
+        # Strategies and planners cache what they know about the target, the
+        # ponder gets caches of its own and they are merged back once the
+        # pondered turn is played.
+        if player_object.strategy != None:
+            ponder_player.strategy = player_object.strategy.copy()
+            ponder_player.strategy.rng = copy_rng(player_object.strategy.rng)
+            self.rng_states = (self.rng_states[0], ponder_player.strategy.rng.getstate())
+
+        if player_object.ability_planner != None:
+            ponder_player.ability_planner = player_object.ability_planner.copy()
+
+        if self.enable_abilities:
+            ponder_player.attack_points += POINT_INCOME
+            ponder_player.scout_points += POINT_INCOME
+
+        self.player_object = ponder_player
+        self.player_objects = {player_id: ponder_player, target_id: target_object}
@@ -0,0 +1,212 @@
+# Battle Ship // Fleet Placement Classes
+# Developed using Python3
+
+__author__ = "Hkaar"
+
+__copyright__ = "Copyright (c) 2021 Hkaar"
+__license__ = "GNU General Public License (GPL) V3"
+
+"""This file is part of Battle Ship.
+
+Battle Ship is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+any later version.
+
+Battle Ship is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Battle Ship.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+__version__ = 0.1
+
+import collections
+import threading
+import random
+
+from battleship.bitboard import count_bits
+
+FLEET_SIZES = (2, 3, 3, 4, 5)
+
+def select_bit(mask, bit_rank):
+    index = 0
+    width = mask.bit_length()
+
+    while width > 1:
+        half = width // 2
+        low_mask = mask & ((1 << half)-1)
+        low_count = count_bits(low_mask)
+
+        if bit_rank < low_count:
+            mask = low_mask
+            width = half
+        else:
+            bit_rank -= low_count
+            mask >>= half
+            index += half
+            width -= half
+    return index
+
+# Every ship size keeps two masks of still valid start cells, one for
+# horizontal and one for vertical placements, so sampling a placement and
+# removing the ones a new ship overlaps are a handful of int operations.
+class Fleet_Placement:
+    def __init__(self, board_size=(7, 7), ship_sizes=FLEET_SIZES, rng=None):
+        self.board_size = board_size
+        self.ship_sizes = tuple(ship_sizes)
+        self.rng = rng if rng != None else random
+
+        self.check_requirements()
+
+        rows, columns = board_size
+        row_repeat = ((1 << (rows*columns))-1) // ((1 << columns)-1)
+
+        self.start_masks = {}
+
+        for ship_size in set(self.ship_sizes):
+            horizontal_mask = ((1 << (columns-ship_size+1))-1)*row_repeat if ship_size <= columns else 0
+            vertical_mask = (1 << ((rows-ship_size+1)*columns))-1 if ship_size <= rows else 0
+            self.start_masks[ship_size] = (horizontal_mask, vertical_mask)
+
+    def get_ship_mask(self, start, ship_size, horizontal):
+        if horizontal:
+            return ((1 << ship_size)-1) << start
+
+        ship_mask = 0
+        for size_num in range(0, ship_size):
+            ship_mask |= 1 << (start+size_num*self.board_size[1])
+        return ship_mask
+
+    def get_blocked_starts(self, ship_mask, ship_size):
+        horizontal_blocked = 0
+        vertical_blocked = 0
+
+        for size_num in range(0, ship_size):
+            horizontal_blocked |= ship_mask >> size_num
+            vertical_blocked |= ship_mask >> (size_num*self.board_size[1])
+        return horizontal_blocked, vertical_blocked
+
+    def sample_placement(self, ship_size, placement_index):
+        horizontal_mask, vertical_mask = placement_index[ship_size]
+        horizontal_count = count_bits(horizontal_mask)
+        total_count = horizontal_count+count_bits(vertical_mask)
+
+        if total_count == 0:
+            return None
+
+        placement_rank = self.rng.randrange(total_count)
+
+        if placement_rank < horizontal_count:
+            return self.get_ship_mask(select_bit(horizontal_mask, placement_rank), ship_size, True)
+        return self.get_ship_mask(select_bit(vertical_mask, placement_rank-horizontal_count), ship_size, False)
+
+    def gen_fleet_masks(self, blocked_mask=0, max_restarts=None):
+        start_masks = {**self.start_masks}
+        restart_count = 0
+
+        if blocked_mask:
+            for ship_size in start_masks:
+                horizontal_blocked, vertical_blocked = self.get_blocked_starts(blocked_mask, ship_size)
+                start_masks[ship_size] = (start_masks[ship_size][0] & ~horizontal_blocked, start_masks[ship_size][1] & ~vertical_blocked)
+
+        while max_restarts == None or restart_count <= max_restarts:
+            placement_index = {**start_masks}
+            fleet_masks = []
+            restart_count += 1
+
+            for ship_size in self.ship_sizes:
+                ship_mask = self.sample_placement(ship_size, placement_index)
+
+                if ship_mask == None:
+                    break
+                fleet_masks.append(ship_mask)
+
+                for remaining_size in placement_index:
+                    horizontal_blocked, vertical_blocked = self.get_blocked_starts(ship_mask, remaining_size)
+                    horizontal_mask, vertical_mask = placement_index[remaining_size]
+
+                    placement_index[remaining_size] = (horizontal_mask & ~horizontal_blocked, vertical_mask & ~vertical_blocked)
+            else:
+                return tuple(fleet_masks)
+        return None
+
+    def gen_fleet(self):
+        fleet = []
+
+        for ship_mask in self.gen_fleet_masks():
+            positions = []
+
+            while ship_mask:
+                low_bit = ship_mask & -ship_mask
+                positions.append(divmod(low_bit.bit_length()-1, self.board_size[1]))
+                ship_mask ^= low_bit
+
+            fleet.append(tuple(positions))
+        return tuple(fleet)
+
+    def check_requirements(self):
+        if len(self.ship_sizes) > 0 and max(self.ship_sizes) > max(self.board_size):
+            raise ValueError('Ship is too big for the selected board size!')
+
+class Fleet_Pool:
+    def __init__(self, pool_size=16, ship_sizes=FLEET_SIZES):
+        self.ship_sizes = tuple(ship_sizes)
+        self.pool_size = pool_size
+
+        self.stored_fleets = {}
+        self.stored_placements = {}
+
+        self.pool_lock = threading.Lock()
+        self.refill_event = threading.Event()
+        self.pool_thread = None
+
+    def get_placement(self, board_size):
+        if board_size not in self.stored_placements:
+            self.stored_placements[board_size] = Fleet_Placement(board_size, self.ship_sizes, random.Random())
+        return self.stored_placements[board_size]
+
+    def get_fleet(self, board_size):
+        with self.pool_lock:
+            fleets = self.stored_fleets.setdefault(board_size, collections.deque())
+            fleet = fleets.popleft() if len(fleets) > 0 else None
+
+        self.start()
+
+        if fleet == None:
+            fleet = Fleet_Placement(board_size, self.ship_sizes).gen_fleet()
+        return fleet
+
+    def prepare(self, board_size):
+        with self.pool_lock:
+            self.stored_fleets.setdefault(board_size, collections.deque())
+        self.start()
+
+    def start(self):
+        if self.pool_thread == None or not self.pool_thread.is_alive():
+            self.pool_thread = threading.Thread(target=self.fill_pool, daemon=True)
+            self.pool_thread.start()
+        self.refill_event.set()
+
+    def fill_pool(self):
+        while True:
+            self.refill_event.wait()
+            self.refill_event.clear()
+
+            while True:
+                with self.pool_lock:
+                    board_sizes = [board_size for board_size in self.stored_fleets if len(self.stored_fleets[board_size]) < self.pool_size]
+
+                if len(board_sizes) == 0:
+                    break
+
+                for board_size in board_sizes:
+                    fleet = self.get_placement(board_size).gen_fleet()
+
+                    with self.pool_lock:
+                        self.stored_fleets[board_size].append(fleet)
+
+fleet_pool = Fleet_Pool()
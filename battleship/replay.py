@@ -0,0 +1,430 @@
+# Battle Ship // Game Replays
+# Developed using Python3
+
+__author__ = "Hkaar"
+
+__copyright__ = "Copyright (c) 2021 Hkaar"
+__license__ = "GNU General Public License (GPL) V3"
+
+"""This file is part of Battle Ship.
+
+Battle Ship is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+any later version.
+
+Battle Ship is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Battle Ship.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+__version__ = 0.1
+
+import argparse
+import bisect
+import struct
+import io
+
+from battleship.bitboard import Bit_Board, iter_bits
+from battleship.abilities import stored_ship_data
+
+# A replay file is a header with the ship keys it uses, a keyframe for turn
+# 0, one record per turn with a keyframe after every keyframe interval turns,
+# and a footer indexing the keyframes. Seeking loads the closest keyframe and
+# applies at most one interval of turn records, the game itself is never
+# simulated again.
+REPLAY_MAGIC = b'BSRP'
+REPLAY_VERSION = 3
+
+HEADER_FORMAT = '<4sBHHHQHB'
+FOOTER_FORMAT = '<Q4s'
+
+TURN_RECORD = 1
+KEYFRAME_RECORD = 2
+INDEX_RECORD = 3
+
+MODES = ('A', 'S')
+
+def write_varint(replay_file, value):
+    while value >= 0x80:
+        replay_file.write(bytes(((value & 0x7f) | 0x80,)))
+        value >>= 7
+    replay_file.write(bytes((value,)))
+
+def read_varint(replay_file):
+    value = 0
+    shift = 0
+
+    while True:
+        byte = replay_file.read(1)[0]
+        value |= (byte & 0x7f) << shift
+        shift += 7
+
+        if not byte & 0x80:
+            return value
+
+def write_signed(replay_file, value):
+    write_varint(replay_file, value*2 if value >= 0 else -value*2-1)
+
+def read_signed(replay_file):
+    value = read_varint(replay_file)
+    return value//2 if not value & 1 else -(value+1)//2
+
+def write_cells(replay_file, cells):
+    write_varint(replay_file, len(cells))
+    last_cell = 0
+
+    for cell in sorted(cells):
+        write_varint(replay_file, cell-last_cell)
+        last_cell = cell
+
+def read_cells(replay_file):
+    cells = []
+    last_cell = 0
+
+    for _ in range(0, read_varint(replay_file)):
+        last_cell += read_varint(replay_file)
+        cells.append(last_cell)
+    return cells
+
+def write_mask(replay_file, mask, cell_amount):
+    # Sparse layers are stored as delta coded cells, dense ones as raw bits.
+    cells = tuple(iter_bits(mask))
+    mask_bytes = mask.to_bytes((cell_amount+7)//8, 'little')
+
+    if len(cells)*2 < len(mask_bytes):
+        replay_file.write(b'\x00')
+        write_cells(replay_file, cells)
+    else:
+        replay_file.write(b'\x01')
+        replay_file.write(mask_bytes)
+
+def read_mask(replay_file, cell_amount):
+    if replay_file.read(1) == b'\x00':
+        mask = 0
+        for cell in read_cells(replay_file):
+            mask |= 1 << cell
+        return mask
+    return int.from_bytes(replay_file.read((cell_amount+7)//8), 'little')
+
+def write_text(replay_file, text):
+    text_bytes = text.encode('utf-8')
+    write_varint(replay_file, len(text_bytes))
+    replay_file.write(text_bytes)
+
+def read_text(replay_file):
+    return replay_file.read(read_varint(replay_file)).decode('utf-8')
+
+def get_ship_code(ship_object, ship_codes):
+    if ship_object == None:
+        return 0
+    return ship_codes[ship_object.__class__.__name__]
+
+class Replay_Recorder:
+    def __init__(self, replay_file, seed=0, keyframe_interval=32, enable_abilities=False):
+        self.replay_file = open(replay_file, 'wb') if isinstance(replay_file, str) else replay_file
+        self.owns_file = isinstance(replay_file, str)
+        self.keyframe_interval = keyframe_interval
+        self.enable_abilities = enable_abilities
+        self.seed = seed
+
+        self.board_size = None
+        self.player_objects = {}
+        self.ship_codes = {}
+        self.turn_count = 0
+
+        self.current_move = None
+        self.current_results = []
+        self.keyframe_offsets = []
+
+        self.closed = False
+
+    def start(self, attack_manager):
+        # Defeated players are dropped from the attack manager, the recorder
+        # keeps its own references so keyframes still hold their boards.
+        self.player_objects = {**attack_manager.player_objects}
+        self.board_size = self.player_objects[1].board_size
+
+        self.replay_file.write(struct.pack(HEADER_FORMAT, REPLAY_MAGIC, REPLAY_VERSION, self.board_size[0], self.board_size[1],
+            len(self.player_objects), self.seed, self.keyframe_interval, int(bool(self.enable_abilities))))
+
+        # Ships are stored by their index in the ship registry of this game,
+        # so custom ships from a ship file can be replayed without it.
+        self.ship_codes = {ship_key: ship_code+1 for ship_code, ship_key in enumerate(stored_ship_data)}
+
+        write_varint(self.replay_file, len(self.ship_codes))
+        for ship_key in self.ship_codes:
+            write_text(self.replay_file, ship_key)
+
+        self.write_keyframe()
+
+    def add_move(self, ship_object, mode, positions):
+        self.current_move = (get_ship_code(ship_object, self.ship_codes), MODES.index(mode), positions)
+
+    def add_result(self, target_id, mode, bit, result):
+        self.current_results.append((target_id, MODES.index(mode), bit.bit_length()-1, result))
+
+    def end_turn(self, player_id):
+        rows, columns = self.board_size
+        ship_code, mode_code, positions = self.current_move if self.current_move != None else (0, 0, ())
+
+        self.turn_count += 1
+        self.replay_file.write(bytes((TURN_RECORD,)))
+        write_varint(self.replay_file, self.turn_count)
+        write_varint(self.replay_file, player_id)
+        write_varint(self.replay_file, ship_code)
+        self.replay_file.write(bytes((mode_code,)))
+
+        cells = [pos[0]*columns+pos[1] for pos in positions if 0 <= pos[0] < rows and 0 <= pos[1] < columns]
+        write_varint(self.replay_file, len(cells))
+        for cell in cells:
+            write_varint(self.replay_file, cell)
+
+        write_varint(self.replay_file, len(self.current_results))
+        for target_id, result_mode, cell, result in self.current_results:
+            write_varint(self.replay_file, target_id)
+            self.replay_file.write(bytes((result_mode << 4 | result,)))
+            write_varint(self.replay_file, cell)
+
+        self.write_points()
+
+        self.current_move = None
+        self.current_results = []
+
+        if self.turn_count % self.keyframe_interval == 0:
+            self.write_keyframe()
+
+    def write_points(self):
+        for player_id in self.player_objects:
+            write_signed(self.replay_file, self.player_objects[player_id].attack_points)
+            write_signed(self.replay_file, self.player_objects[player_id].scout_points)
+
+    def write_keyframe(self):
+        cell_amount = self.board_size[0]*self.board_size[1]
+        self.keyframe_offsets.append((self.turn_count, self.replay_file.tell()))
+
+        self.replay_file.write(bytes((KEYFRAME_RECORD,)))
+        write_varint(self.replay_file, self.turn_count)
+        self.write_points()
+
+        for player_id in self.player_objects:
+            bit_board = self.player_objects[player_id].bit_board
+
+            write_varint(self.replay_file, len(bit_board.ship_masks))
+            for ship_object in bit_board.ship_masks:
+                write_varint(self.replay_file, get_ship_code(ship_object, self.ship_codes))
+                write_cells(self.replay_file, tuple(iter_bits(bit_board.ship_masks[ship_object])))
+
+            for mask in (bit_board.hits, bit_board.misses, bit_board.spotted):
+                write_mask(self.replay_file, mask, cell_amount)
+
+    def close(self):
+        if self.closed:
+            return None
+
+        index_offset = self.replay_file.tell()
+        self.replay_file.write(bytes((INDEX_RECORD,)))
+        write_varint(self.replay_file, len(self.keyframe_offsets))
+
+        for turn, offset in self.keyframe_offsets:
+            write_varint(self.replay_file, turn)
+            write_varint(self.replay_file, offset)
+
+        self.replay_file.write(struct.pack(FOOTER_FORMAT, index_offset, REPLAY_MAGIC))
+        self.closed = True
+
+        if self.owns_file:
+            self.replay_file.close()
+
+class Replay_State:
+    def __init__(self, board_size, player_ids):
+        self.board_size = board_size
+        self.turn = 0
+        self.last_move = None
+
+        self.bit_boards = {player_id: Bit_Board(board_size) for player_id in player_ids}
+        self.points = {player_id: (0, 0) for player_id in player_ids}
+
+    def get_alive_players(self):
+        return tuple([player_id for player_id in self.bit_boards if self.bit_boards[player_id].is_alive()])
+
+    def apply_result(self, target_id, mode, cell, result):
+        bit_board = self.bit_boards[target_id]
+
+        if mode == 'A':
+            return bit_board.attack(1 << cell) == result
+        return bit_board.scout(1 << cell) == result
+
+class Replay_Reader:
+    def __init__(self, replay_file):
+        if isinstance(replay_file, (bytes, bytearray)):
+            self.replay_file = io.BytesIO(replay_file)
+        elif isinstance(replay_file, str):
+            self.replay_file = open(replay_file, 'rb')
+        else:
+            self.replay_file = replay_file
+
+        header = self.replay_file.read(struct.calcsize(HEADER_FORMAT))
+        magic, version, rows, columns, player_amount, self.seed, self.keyframe_interval, flags = struct.unpack(HEADER_FORMAT, header)
+
+        if magic != REPLAY_MAGIC or version != REPLAY_VERSION:
+            raise ValueError('File is not a supported Battle Ship replay!')
+
+        self.board_size = (rows, columns)
+        self.player_ids = tuple(range(1, player_amount+1))
+        self.enable_abilities = bool(flags & 1)
+        self.ship_keys = tuple([read_text(self.replay_file) for _ in range(0, read_varint(self.replay_file))])
+
+        self.keyframe_turns = []
+        self.keyframe_offsets = []
+        self.read_index()
+
+    @property
+    def turn_amount(self):
+        return self.last_turn
+
+    def read_index(self):
+        self.replay_file.seek(-struct.calcsize(FOOTER_FORMAT), io.SEEK_END)
+        index_offset, magic = struct.unpack(FOOTER_FORMAT, self.replay_file.read(struct.calcsize(FOOTER_FORMAT)))
+
+        if magic != REPLAY_MAGIC:
+            raise ValueError('Replay file was not closed properly!')
+
+        self.index_offset = index_offset
+        self.replay_file.seek(index_offset)
+
+        if self.replay_file.read(1)[0] != INDEX_RECORD:
+            raise ValueError('Replay index is damaged!')
+
+        for _ in range(0, read_varint(self.replay_file)):
+            self.keyframe_turns.append(read_varint(self.replay_file))
+            self.keyframe_offsets.append(read_varint(self.replay_file))
+
+        self.last_turn = self.keyframe_turns[-1]
+        self.replay_file.seek(self.keyframe_offsets[-1])
+        self.read_record(Replay_State(self.board_size, self.player_ids))
+
+        while self.replay_file.tell() < self.index_offset:
+            self.last_turn = self.read_record(None)
+
+    def read_points(self, state):
+        for player_id in self.player_ids:
+            points = (read_signed(self.replay_file), read_signed(self.replay_file))
+
+            if state != None:
+                state.points[player_id] = points
+
+    def read_record(self, state):
+        record_type = self.replay_file.read(1)[0]
+        turn = read_varint(self.replay_file)
+
+        if record_type == KEYFRAME_RECORD:
+            cell_amount = self.board_size[0]*self.board_size[1]
+            self.read_points(state)
+
+            for player_id in self.player_ids:
+                bit_board = state.bit_boards[player_id] if state != None else Bit_Board(self.board_size)
+                bit_board.clear()
+
+                for _ in range(0, read_varint(self.replay_file)):
+                    ship_name = self.ship_keys[read_varint(self.replay_file)-1]
+
+                    for cell in read_cells(self.replay_file):
+                        bit_board.ship_masks[ship_name] = bit_board.ship_masks.get(ship_name, 0) | 1 << cell
+                        bit_board.ships |= 1 << cell
+
+                bit_board.hits = read_mask(self.replay_file, cell_amount)
+                bit_board.misses = read_mask(self.replay_file, cell_amount)
+                bit_board.spotted = read_mask(self.replay_file, cell_amount)
+
+        elif record_type == TURN_RECORD:
+            player_id = read_varint(self.replay_file)
+            ship_code = read_varint(self.replay_file)
+            mode_code = self.replay_file.read(1)[0]
+            cells = tuple([read_varint(self.replay_file) for _ in range(0, read_varint(self.replay_file))])
+
+            for _ in range(0, read_varint(self.replay_file)):
+                target_id = read_varint(self.replay_file)
+                result_code = self.replay_file.read(1)[0]
+                cell = read_varint(self.replay_file)
+
+                if state != None and not state.apply_result(target_id, MODES[result_code >> 4], cell, result_code & 0x0f):
+                    raise ValueError(f'Replay turn {turn} does not match its recorded result!')
+
+            self.read_points(state)
+
+            if state != None:
+                ship_name = self.ship_keys[ship_code-1] if ship_code > 0 else None
+                state.last_move = (player_id, ship_name, MODES[mode_code], tuple([divmod(cell, self.board_size[1]) for cell in cells]))
+        else:
+            raise ValueError('Replay record is damaged!')
+
+        if state != None:
+            state.turn = turn
+        return turn
+
+    def seek(self, turn):
+        if turn < 0 or turn > self.last_turn:
+            raise ValueError(f'Replay only has turns 0 to {self.last_turn}!')
+
+        keyframe_index = bisect.bisect_right(self.keyframe_turns, turn)-1
+        state = Replay_State(self.board_size, self.player_ids)
+
+        self.replay_file.seek(self.keyframe_offsets[keyframe_index])
+        self.read_record(state)
+
+        while state.turn < turn:
+            record_offset = self.replay_file.tell()
+            record_type = self.replay_file.read(1)[0]
+            self.replay_file.seek(record_offset)
+
+            if record_type == KEYFRAME_RECORD:
+                self.read_record(None)
+            else:
+                self.read_record(state)
+        return state
+
+    def close(self):
+        self.replay_file.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m battleship.replay', description='Show the board state of a recorded game.')
+    parser.add_argument('replay', help='replay file written by python -m battleship.simulate --record')
+    parser.add_argument('--turn', type=int, default=None, help='turn to show, defaults to the last one')
+    args = parser.parse_args(argv)
+
+    reader = Replay_Reader(args.replay)
+    state = reader.seek(args.turn if args.turn != None else reader.last_turn)
+    piece_values = {0: '0', 1: 'X', 2: '#'}
+
+    print(f'Seed {reader.seed}, turn {state.turn} of {reader.last_turn}')
+
+    if state.last_move != None:
+        player_id, ship_name, mode, positions = state.last_move
+        print(f"Last move: player {player_id} {ship_name or 'default'} {mode} {', '.join([str(pos) for pos in positions])}")
+
+    for player_id in reader.player_ids:
+        bit_board = state.bit_boards[player_id]
+        hit_positions = bit_board.get_hit_positions()
+
+        print(f'Player {player_id}: {bit_board.get_remaining_count()} ship cells left, points {state.points[player_id]}')
+
+        if reader.board_size[0]*reader.board_size[1] <= 400:
+            for y in range(0, reader.board_size[0]):
+                row = []
+
+                for x in range(0, reader.board_size[1]):
+                    if (y, x) in hit_positions:
+                        row.append(piece_values[hit_positions[(y, x)]])
+                    else:
+                        row.append('+' if bit_board.get_bit((y, x)) & bit_board.ships else '.')
+                print(' '.join(row))
+    reader.close()
+    return state
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,424 @@
+# Battle Ship // AI Search Functions
+# Developed using Python3
+
+__author__ = "Hkaar"
+
+__copyright__ = "Copyright (c) 2021 Hkaar"
+__license__ = "GNU General Public License (GPL) V3"
+
+"""This file is part of Battle Ship.
+
+Battle Ship is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+any later version.
+
+Battle Ship is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Battle Ship.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+__version__ = 0.1
+
+import concurrent.futures
+import itertools
+import random
+import math
+import time
+import os
+
+from battleship.bitboard import count_bits, iter_bits
+from battleship.placement import Fleet_Placement
+from battleship.abilities import get_ability, get_move_cost
+from battleship.game_state import Board_State, Game_State, apply, set_points, END_TURN
+from battleship.transposition import Transposition_Table
+
+SINK_REWARD = 2
+
+# The search plays the player against its target only, under ids of its own
+# so searches of every game and seat look the same.
+SEARCH_PLAYER = 1
+SEARCH_TARGET = 2
+
+# Every process keeps the search trees of the last strategies it searched
+# for, so the nodes of one move are found again on the next one.
+TABLE_AMOUNT = 16
+TABLE_ENTRY_AMOUNT = 1 << 16
+
+stored_pools = {}
+default_worker_amount = None
+
+stored_tables = {}
+table_ids = itertools.count(1)
+
+def get_worker_amount(worker_amount=None):
+    if worker_amount != None:
+        return worker_amount
+    elif default_worker_amount != None:
+        return default_worker_amount
+    return os.cpu_count() or 1
+
+def set_default_worker_amount(worker_amount):
+    global default_worker_amount
+    default_worker_amount = worker_amount
+
+def get_process_pool(worker_amount=None):
+    worker_amount = get_worker_amount(worker_amount)
+
+    if worker_amount not in stored_pools:
+        stored_pools[worker_amount] = concurrent.futures.ProcessPoolExecutor(max_workers=worker_amount)
+    return stored_pools[worker_amount]
+
+def shutdown_process_pools():
+    for worker_amount in tuple(stored_pools.keys()):
+        stored_pools.pop(worker_amount).shutdown(wait=False)
+
+def new_table_id():
+    return next(table_ids)
+
+def get_transposition_table(table_id):
+    if table_id not in stored_tables:
+        while len(stored_tables) >= TABLE_AMOUNT:
+            stored_tables.pop(next(iter(stored_tables)))
+
+        stored_tables[table_id] = Transposition_Table(TABLE_ENTRY_AMOUNT)
+    return stored_tables[table_id]
+
+def get_footprint_size(ship_name, mode):
+    ability = get_ability(ship_name, mode)
+
+    if ability.kind == 'pick':
+        return min(ability.draws, len(ability.offsets))+(1 if ability.center == 'include' else 0)
+    elif ability.kind == 'fixed':
+        return len(ability.offsets)
+    return 0
+
+def get_rollout_ships(available_ships):
+    # Rollouts attack with the widest footprint the points pay for, select
+    # and event abilities need more planning than a rollout does.
+    rollout_ships = [ship_name for ship_name in available_ships if get_footprint_size(ship_name, 'A') > 1]
+    return tuple(sorted(rollout_ships, key=lambda ship_name: -get_footprint_size(ship_name, 'A')))+(None,)
+
+def get_root_state(snapshot):
+    cell_amount = snapshot['board_size'][0]*snapshot['board_size'][1]
+    target_ships = []
+
+    # Ships that are not sunk yet get a cell above the board until a fleet
+    # is drawn for them, so the root counts them as afloat.
+    for ship_index in range(0, len(snapshot['target_ships'])):
+        ship_key, _, ship_mask = snapshot['target_ships'][ship_index]
+        target_ships.append((ship_key, ship_mask if ship_mask != None else 1 << (cell_amount+ship_index)))
+
+    # Shots of other players at the own board change between turns, only
+    # the sunk ships matter to the search, so the root hash of the next turn
+    # finds the nodes this turn expanded.
+    own_board = snapshot['own_board'].copy()
+    own_board.hits = 0
+    own_board.misses = 0
+    own_board.spotted = 0
+
+    for _, ship_mask in own_board.ship_masks:
+        if not ship_mask & ~snapshot['own_board'].hits:
+            own_board.hits |= ship_mask
+
+    boards = {
+        SEARCH_PLAYER: own_board,
+        SEARCH_TARGET: Board_State(tuple(target_ships), snapshot['hits'], snapshot['misses'], snapshot['spotted'])
+        }
+
+    return Game_State(snapshot['board_size'], boards, {SEARCH_PLAYER: SEARCH_TARGET, SEARCH_TARGET: SEARCH_PLAYER},
+        SEARCH_PLAYER, snapshot['enable_abilities'])
+
+def get_search_state(root_state, snapshot, fleet_masks):
+    # The drawn masks follow the remaining sizes, they are handed to the
+    # ships that are not sunk by size.
+    size_masks = {}
+
+    if fleet_masks != None:
+        for ship_size, ship_mask in zip(snapshot['remaining_sizes'], fleet_masks):
+            size_masks.setdefault(ship_size, []).append(ship_mask)
+    else:
+        known_mask = (snapshot['hits'] | snapshot['spotted']) & ~snapshot['sunk_mask']
+
+    state = root_state.copy()
+    board = state.boards[SEARCH_TARGET].copy()
+    ship_masks = []
+
+    for ship_index in range(0, len(board.ship_masks)):
+        ship_key, ship_mask = board.ship_masks[ship_index]
+        ship_size = snapshot['target_ships'][ship_index][1]
+
+        if snapshot['target_ships'][ship_index][2] == None:
+            if len(size_masks.get(ship_size, ())) > 0:
+                ship_mask = size_masks[ship_size].pop()
+            elif fleet_masks == None:
+                ship_mask |= known_mask
+                known_mask = 0
+        ship_masks.append((ship_key, ship_mask))
+
+    board.ship_masks = tuple(ship_masks)
+    board.ships = 0
+
+    for _, ship_mask in board.ship_masks:
+        board.ships |= ship_mask
+
+    state.boards[SEARCH_TARGET] = board
+    return state
+
+def determinize(snapshot, placement, rng, attempts=32):
+    known_mask = (snapshot['hits'] | snapshot['spotted']) & ~snapshot['sunk_mask']
+    blocked_mask = snapshot['misses'] | snapshot['sunk_mask']
+
+    best_fleet = None
+    best_covered = -1
+
+    for _ in range(0, attempts):
+        fleet_masks = placement.gen_fleet_masks(blocked_mask, 8)
+
+        if fleet_masks == None:
+            continue
+
+        fleet_cells = 0
+        for ship_mask in fleet_masks:
+            fleet_cells |= ship_mask
+
+            # A ship lying on hit cells only would have been reported sunk.
+            if not ship_mask & ~snapshot['hits']:
+                fleet_cells = None
+                break
+
+        if fleet_cells == None:
+            continue
+
+        covered = count_bits(fleet_cells & known_mask)
+
+        if covered > best_covered:
+            best_fleet = fleet_masks
+            best_covered = covered
+
+        if not known_mask & ~fleet_cells:
+            break
+    return best_fleet
+
+def get_reward(result):
+    return len(result['hits'])+SINK_REWARD*len(result['sunk'])
+
+def play_turn(state, move, rng):
+    state, result = apply(state, move, rng)
+    reward = get_reward(result)
+
+    # The target only passes, so the next turn is the player's again with
+    # its point income paid and its events moved.
+    while not state.is_over():
+        state, result = apply(state, END_TURN, rng)
+        reward += get_reward(result)
+
+        if state.current_turn == SEARCH_PLAYER:
+            break
+
+        # The points of the target are not known and never spent, keeping
+        # them at zero lets the states of later turns match the root.
+        target_board = state.boards[SEARCH_TARGET].copy()
+        state.boards[SEARCH_TARGET] = target_board
+        set_points(state, SEARCH_TARGET, target_board, 0, 0)
+    return state, reward
+
+def get_rollout_masks(state, snapshot):
+    board_size = snapshot['board_size']
+    board = state.boards[SEARCH_TARGET]
+    board_mask = (1 << (board_size[0]*board_size[1]))-1
+    unknown_mask = board_mask & ~(board.hits | board.misses | board.spotted)
+
+    # Spotted cells come first, then the cells next to hits of ships that
+    # are still afloat, everything else is hunted at random.
+    if board.spotted & ~board.hits:
+        return board.spotted & ~board.hits, unknown_mask
+
+    sunk_cells = 0
+    for _, ship_mask in board.ship_masks:
+        if not ship_mask & ~board.hits:
+            sunk_cells |= ship_mask
+
+    open_hits = board.hits & ~sunk_cells
+    neighbours = 0
+
+    if open_hits:
+        columns = board_size[1]
+
+        neighbours = ((open_hits << 1) & ~snapshot['first_column']) | ((open_hits >> 1) & ~snapshot['last_column'])
+        neighbours |= (open_hits << columns) | (open_hits >> columns)
+        neighbours &= unknown_mask
+    return neighbours, unknown_mask
+
+def get_random_cell(unknown_mask, cell_amount, rng):
+    for _ in range(0, 8):
+        cell = rng.randrange(cell_amount)
+
+        if unknown_mask >> cell & 1:
+            return cell
+    return rng.choice(tuple(iter_bits(unknown_mask)))
+
+def get_rollout_cell(state, snapshot, rng):
+    priority_mask, unknown_mask = get_rollout_masks(state, snapshot)
+
+    if priority_mask:
+        return rng.choice(tuple(iter_bits(priority_mask)))
+
+    if unknown_mask:
+        return get_random_cell(unknown_mask, snapshot['board_size'][0]*snapshot['board_size'][1], rng)
+    return None
+
+def get_rollout_ship(state, snapshot):
+    board = state.boards[SEARCH_PLAYER]
+    available_ships = board.get_available_ships()
+
+    for rollout_ship in snapshot['rollout_ships']:
+        if rollout_ship != None and rollout_ship not in available_ships:
+            continue
+
+        if not state.enable_abilities or get_move_cost(rollout_ship, 'A') <= board.attack_points:
+            return rollout_ship
+    return None
+
+def get_rollout_action(state, snapshot, rng):
+    cell = get_rollout_cell(state, snapshot, rng)
+
+    if cell == None:
+        return None
+    return (get_rollout_ship(state, snapshot), 'A', (cell,))
+
+def get_node_actions(state, snapshot, rng):
+    priority_mask, unknown_mask = get_rollout_masks(state, snapshot)
+    branching = snapshot['branching']
+
+    cells = list(iter_bits(priority_mask))
+    if len(cells) > branching:
+        cells = rng.sample(cells, branching)
+
+    unknown_mask &= ~priority_mask
+    cell_amount = snapshot['board_size'][0]*snapshot['board_size'][1]
+
+    while len(cells) < branching and unknown_mask:
+        cell = get_random_cell(unknown_mask, cell_amount, rng)
+        unknown_mask &= ~(1 << cell)
+        cells.append(cell)
+
+    rollout_ship = get_rollout_ship(state, snapshot)
+    ship_names = (rollout_ship,) if rollout_ship == None else (rollout_ship, None)
+
+    return tuple([(ship_name, 'A', (cell,)) for ship_name in ship_names for cell in cells])
+
+def get_move(snapshot, action):
+    ship_name, mode, cells = action
+    return (ship_name, mode, tuple([divmod(cell, snapshot['board_size'][1]) for cell in cells]))
+
+class Search_Node:
+    __slots__ = ('visits', 'actions', 'action_visits', 'action_totals')
+
+    def __init__(self, actions):
+        self.visits = 0
+        self.actions = actions
+        self.action_visits = [0]*len(actions)
+        self.action_totals = [0.0]*len(actions)
+
+    def select(self, exploration):
+        # Every action is played once before UCB1 picks between them.
+        if 0 in self.action_visits:
+            return self.action_visits.index(0)
+
+        log_count = math.log(self.visits)
+        return max(range(0, len(self.actions)), key=lambda index: self.action_totals[index]/self.action_visits[index]
+            +exploration*math.sqrt(log_count/self.action_visits[index]))
+
+    def update(self, action_index, reward):
+        self.visits += 1
+        self.action_visits[action_index] += 1
+        self.action_totals[action_index] += reward
+
+def search_tree(table, root_node, state, snapshot, rng, exploration):
+    # Nodes are the states at the start of the player's turns, found by
+    # their hash so moves played in another order share one node. One node
+    # is added per iteration, the turns after it follow the rollout policy.
+    node = root_node
+    expanded = False
+
+    path = []
+    rewards = []
+
+    for depth in range(snapshot['horizon'], 0, -1):
+        if state.is_over():
+            break
+
+        if node != None:
+            action_index = node.select(exploration)
+            action = node.actions[action_index]
+            path.append((node, action_index, len(rewards)))
+        else:
+            action = get_rollout_action(state, snapshot, rng)
+
+            if action == None:
+                break
+
+        state, reward = play_turn(state, get_move(snapshot, action), rng)
+        rewards.append(reward)
+
+        if node != None:
+            entry = table.get(state.get_hash())
+            node = entry[0] if entry != None else None
+
+            if node == None and not expanded and not state.is_over():
+                expanded = True
+                actions = get_node_actions(state, snapshot, rng)
+
+                if len(actions) > 0:
+                    node = Search_Node(actions)
+                    table.store(state.get_hash(), depth-1, node)
+    return path, rewards
+
+def get_root_node(table, root_state, actions, horizon):
+    # The root keeps the statistics an earlier search gathered for the
+    # actions that are still offered.
+    root_node = Search_Node(tuple(actions))
+    entry = table.get(root_state.get_hash())
+
+    if entry != None:
+        stored_node = entry[0]
+
+        for action_index in range(0, len(root_node.actions)):
+            if root_node.actions[action_index] in stored_node.actions:
+                stored_index = stored_node.actions.index(root_node.actions[action_index])
+
+                root_node.action_visits[action_index] = stored_node.action_visits[stored_index]
+                root_node.action_totals[action_index] = stored_node.action_totals[stored_index]
+                root_node.visits += stored_node.action_visits[stored_index]
+
+    table.store(root_state.get_hash(), horizon, root_node)
+    return root_node
+
+def run_rollouts(snapshot, actions, time_budget, seed, table_id=None, exploration=1.4):
+    # Searches with the same table id share their nodes within a process,
+    # the process id tells the caller which results already hold others.
+    rng = random.Random(seed)
+    placement = Fleet_Placement(snapshot['board_size'], snapshot['remaining_sizes'], rng)
+    root_state = get_root_state(snapshot)
+
+    table = get_transposition_table(table_id) if table_id != None else Transposition_Table(TABLE_ENTRY_AMOUNT)
+    table.new_search()
+
+    root_node = get_root_node(table, root_state, actions, snapshot['horizon'])
+    reward_scale = float(max(1, sum(snapshot['remaining_sizes'])))
+
+    deadline = time.perf_counter()+time_budget
+    start_visits = root_node.visits
+
+    while root_node.visits-start_visits < len(actions) or time.perf_counter() < deadline:
+        state = get_search_state(root_state, snapshot, determinize(snapshot, placement, rng))
+        path, rewards = search_tree(table, root_node, state, snapshot, rng, exploration)
+
+        for node, action_index, reward_index in path:
+            node.update(action_index, sum(rewards[reward_index:])/reward_scale)
+    return os.getpid(), root_node.action_visits, root_node.action_totals
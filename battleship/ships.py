@@ -24,189 +24,64 @@ along with Battle Ship.  If not, see <https://www.gnu.org/licenses/>.
 
 __version__ = 0.1
 
-import random
-
-class Event_Attack:
-    def __init__(self, position, move_count, orientation):
-        self.orientation = orientation
-        self.move_count = move_count
-        self.last_position = None
-        self.position = position
-
-class Event_Scout:
-    def __init__(self, position, move_count, orientation):
-        self.orientation = orientation
-        self.move_count = move_count
-        self.last_position = None
-        self.position = position
-
-class Patrol_Boat:
-    def __init__(self, ship_name='Patrol Boat'):
-        self.name = ship_name
-        self.size = 2
-
-        self.attack_cost = 4
-        self.scout_cost = 4
+from battleship.events import Event_Attack, Event_Scout
+from battleship.abilities import get_ship_data, get_ability, stored_fleets
 
-    def get_attack(self, position, player_object):
-        positions = ((position[0], position[1]-1), (position[0], position[1]+1), (position[0]-1, position[1]), (position[0]+1, position[1]))
-        generated_positions = []
-
-        if player_object.__class__.__name__ != 'AI_Player':
-            player_object.reset_positions()
+# Stats and abilities of every ship come from the ship data in abilities,
+# a class only names the ship.
+class Ship:
+    def __init__(self, ship_name=None):
+        ship_data = get_ship_data(self.__class__.__name__)
 
-        for _ in range(0, 4):
-            pos = random.choice(positions)
-            if pos not in generated_positions:
-                generated_positions.append(pos)
+        self.name = ship_name if ship_name != None else ship_data['name']
+        self.size = ship_data['size']
 
-        return tuple(generated_positions)
+        self.attack_cost = ship_data['attack_cost']
+        self.scout_cost = ship_data['scout_cost']
 
-    def get_scout(self, position, player_object):
-        if player_object.available_positions > 0 and player_object.current_special_ship != 'aircraft_carrier':
-            if position not in player_object.stored_positions:
-                player_object.stored_positions.add(position)
-                player_object.available_positions -= 1
-
-            if player_object.available_positions <= 0:
-                return True
-        else:
-            if player_object.__class__.__name__ != 'AI_Player':
-                player_object.reset_positions()
-
-            player_object.current_special_ship = 'patrol_boat'
-            player_object.stored_positions.add(position)
-            player_object.available_positions = 4
-        return None
-
-class Destroyer:
-    def __init__(self, ship_name='Destroyer'):
-        self.name = ship_name
-        self.size = 3
-
-        self.attack_cost = 3
-        self.scout_cost = 3
+    def is_multi_select(self, mode):
+        return get_ability(self.__class__.__name__, mode).kind == 'select'
 
     def get_attack(self, position, player_object):
-        positions = ((position[0], position[1]-1), (position[0], position[1]+1), (position[0]-1, position[1]), (position[0]+1, position[1]))
-        generated_positions = [position]
-
-        if player_object.__class__.__name__ != 'AI_Player':
-            player_object.reset_positions()
-
-        for _ in range(0, 4):
-            pos = random.choice(positions)
-            if pos not in generated_positions and pos != position:
-                generated_positions.append(pos)
-
-        return tuple(generated_positions)
+        return get_ability(self.__class__.__name__, 'A').get_positions(position, player_object)
 
     def get_scout(self, position, player_object):
-        positions = ((position[0], position[1]-1), (position[0], position[1]+1), (position[0]-1, position[1]), (position[0]+1, position[1]))
-        generated_positions = [position]
+        return get_ability(self.__class__.__name__, 'S').get_positions(position, player_object)
 
-        if player_object.__class__.__name__ != 'AI_Player':
-            player_object.reset_positions()
+class Patrol_Boat(Ship):
+    pass
 
-        for _ in range(0, 5):
-            pos = random.choice(positions)
-            if pos not in generated_positions and pos != position:
-                generated_positions.append(pos)
+class Destroyer(Ship):
+    pass
 
-        return tuple(generated_positions)
+class Submarine(Ship):
+    pass
 
-class Submarine:
-    def __init__(self, ship_name='Submarine'):
-        self.name = ship_name
-        self.size = 3
+class Battle_Ship(Ship):
+    pass
 
-        self.attack_cost = 2
-        self.scout_cost = 4
+class Aircraft_Carrier(Ship):
+    pass
 
-    def get_attack(self, position, player_object):
-        if player_object.__class__.__name__ != 'AI_Player':
-            player_object.reset_positions()
+stored_ship_classes = {ship_class.__name__: ship_class for ship_class in (Patrol_Boat, Destroyer, Submarine, Battle_Ship, Aircraft_Carrier)}
 
-        event_torpedo_attack = Event_Attack(position, 1, player_object.orientation)
-        player_object.add_event(event_torpedo_attack)
-        return None
+def get_ship_class(ship_key):
+    if ship_key not in stored_ship_classes:
+        get_ship_data(ship_key)
+        stored_ship_classes[ship_key] = type(ship_key, (Ship,), {})
+    return stored_ship_classes[ship_key]
 
-    def get_scout(self, position, player_object):
-        positions = (
-            (position[0]-1, position[1]-1), (position[0]-1, position[1]), (position[0]-1, position[1]+1),
-            (position[0], position[1]-1), position, (position[0], position[1]+1)
-            )
-        generated_positions = []
-
-        if player_object.__class__.__name__ != 'AI_Player':
-            player_object.reset_positions()
-
-        for _ in range(0, 6):
-            pos = random.choice(positions)
-            if pos not in generated_positions and pos != position:
-                generated_positions.append(pos)
+# Every player owns its own ship objects, so hull counters and sunk events
+# never mix up two players' ships of the same class.
+class Fleet:
+    def __init__(self, fleet_name='default'):
+        if fleet_name not in stored_fleets:
+            raise ValueError(f'Unknown fleet: {fleet_name}!')
 
-        return tuple(generated_positions)
+        self.stored_ships = tuple([get_ship_class(ship_key)() for ship_key in stored_fleets[fleet_name]])
 
-class Battle_Ship:
-    def __init__(self, ship_name='Battle Ship'):
-        self.name = ship_name
-        self.size = 4
-
-        self.attack_cost = 5
-        self.scout_cost = 5
-
-    def get_attack(self, position, player_object):
-        positions = (
-            (position[0]-1, position[1]-1), (position[0]-1, position[1]), (position[0]-1, position[1]+1),
-            (position[0], position[1]-1), position, (position[0], position[1]+1)
-            )
-
-        if player_object.__class__.__name__ != 'AI_Player':
-            player_object.reset_positions()
-
-        return positions
-
-    def get_scout(self, position, player_object):
-        positions = (
-            (position[0]-1, position[1]-1), (position[0]-1, position[1]), (position[0]-1, position[1]+1),
-            (position[0], position[1]-1), position, (position[0], position[1]+1)
-            )
-
-        if player_object.__class__.__name__ != 'AI_Player':
-            player_object.reset_positions()
-
-        return positions
-
-class Aircraft_Carrier:
-    def __init__(self, ship_name='Aircraft Carrier'):
-        self.name = ship_name
-        self.size = 5
-
-        self.attack_cost = 8
-        self.scout_cost = 5
-
-    def get_attack(self, position, player_object):
-        if player_object.available_positions > 0 and player_object.current_special_ship != 'patrol_boat':
-            if position not in player_object.stored_positions:
-                player_object.stored_positions.add(position)
-                player_object.available_positions -= 1
-
-            if player_object.available_positions <= 0:
-                return True
-        else:
-            if player_object.__class__.__name__ != 'AI_Player':
-                player_object.reset_positions()
-
-            player_object.current_special_ship = 'aircraft_carrier'
-            player_object.stored_positions.add(position)
-            player_object.available_positions = 8
-        return None
-
-    def get_scout(self, position, player_object):
-        if player_object.__class__.__name__ != 'AI_Player':
-            player_object.reset_positions()
+        for ship_object in self.stored_ships:
+            setattr(self, ship_object.__class__.__name__.lower(), ship_object)
 
-        event_airplane_scout = Event_Scout(position, 3, player_object.orientation)
-        player_object.add_event(event_airplane_scout)
-        return None
\ No newline at end of file
+    def get_ships(self):
+        return self.stored_ships
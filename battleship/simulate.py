@@ -0,0 +1,221 @@
+# Battle Ship // Headless Simulation
+# Developed using Python3
+
+__author__ = "Hkaar"
+
+__copyright__ = "Copyright (c) 2021 Hkaar"
+__license__ = "GNU General Public License (GPL) V3"
+
+"""This file is part of Battle Ship.
+
+Battle Ship is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+any later version.
+
+Battle Ship is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Battle Ship.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+__version__ = 0.1
+
+import argparse
+import random
+import time
+import os
+
+from battleship.main_game import Attack_Manager, AI_Player
+from battleship.strategies import get_strategy, stored_strategies
+from battleship.replay import Replay_Recorder
+from battleship.abilities import load_ship_data
+
+class Simulation:
+    def __init__(self, player_amount=2, board_size=(7, 7), enable_abilities=False, max_turns=100000, strategy_names=None, seed=None):
+        self.strategy_names = tuple(strategy_names) if strategy_names != None else ('random',)*player_amount
+        self.enable_abilities = enable_abilities
+        self.player_amount = player_amount
+        self.board_size = board_size
+        self.max_turns = max_turns
+
+        self.rng = random.Random(seed)
+
+        self.games_played = 0
+        self.total_turns = 0
+        self.total_time = 0.0
+        self.unfinished_games = 0
+
+        self.player_wins = {player_id: 0 for player_id in range(1, player_amount+1)}
+
+        self.check_requirements()
+
+    def play_game(self, game_seed=None, replay_file=None):
+        ranking, turn_count = self.play_ranked_game(game_seed, replay_file)
+
+        if len(ranking[0]) == 1:
+            return ranking[0][0], turn_count
+        return None, turn_count
+
+    def play_ranked_game(self, game_seed=None, replay_file=None):
+        def gen_player(strategy_name):
+            player_rng = random.Random(game_rng.getrandbits(64))
+            return AI_Player(1, 1, self.board_size, strategy=get_strategy(strategy_name, player_rng), rng=player_rng)
+
+        # Every game draws from its own generator, so a game seed alone is
+        # enough to play the exact same game again.
+        game_seed = game_seed if game_seed != None else self.rng.getrandbits(64)
+        game_rng = random.Random(game_seed)
+
+        player_objects = tuple([gen_player(strategy_name) for strategy_name in self.strategy_names])
+        replay_recorder = Replay_Recorder(replay_file, game_seed, enable_abilities=self.enable_abilities) if replay_file != None else None
+
+        attack_manager = Attack_Manager(self.player_amount, player_objects, enable_abilities=self.enable_abilities, replay_recorder=replay_recorder)
+        attack_manager.load_boards()
+        turn_count = 0
+        ranking = []
+
+        # The turns are stepped by the game itself, so simulated games follow
+        # the same turn order and point income as played ones.
+        player_id = attack_manager.current_active_turn
+
+        while player_id != None and turn_count < self.max_turns:
+            alive_players = set(attack_manager.player_objects.keys())
+
+            attack_manager.exec_ai_turn(player_id)
+            turn_count += 1
+
+            if len(attack_manager.player_objects) < len(alive_players):
+                ranking.insert(0, sorted(alive_players-set(attack_manager.player_objects.keys())))
+
+            player_id = attack_manager.next_ai_player()
+
+        if replay_recorder != None:
+            replay_recorder.close()
+
+        ranking.insert(0, sorted(attack_manager.player_objects.keys()))
+        return ranking, turn_count
+
+    def run(self, game_amount, replay_dir=None):
+        start_time = time.perf_counter()
+
+        for _ in range(0, game_amount):
+            if replay_dir != None:
+                winner, turn_count = self.play_game(replay_file=os.path.join(replay_dir, f'game_{self.games_played+1}.bsr'))
+            else:
+                winner, turn_count = self.play_game()
+
+            if winner != None:
+                self.player_wins[winner] += 1
+            else:
+                self.unfinished_games += 1
+
+            self.games_played += 1
+            self.total_turns += turn_count
+
+        self.total_time += time.perf_counter()-start_time
+        return self.get_results()
+
+    def get_results(self):
+        results = {
+            'games': self.games_played,
+            'unfinished_games': self.unfinished_games,
+            'seconds': self.total_time,
+            'games_per_second': self.games_played/self.total_time if self.total_time > 0 else 0.0,
+            'turns_per_game': self.total_turns/self.games_played if self.games_played > 0 else 0.0,
+            'win_rates': {}
+            }
+
+        for player_id in self.player_wins:
+            if self.games_played > 0:
+                results['win_rates'][player_id] = self.player_wins[player_id]/self.games_played
+            else:
+                results['win_rates'][player_id] = 0.0
+        return results
+
+    def check_requirements(self):
+        if self.player_amount < 2:
+            raise ValueError('Simulation needs at least 2 players!')
+
+        if self.board_size < (7, 7):
+            raise ValueError('Entered board size must be 7 x 7 or bigger!')
+
+        if len(self.strategy_names) != self.player_amount:
+            raise ValueError('Strategy amount does not match player amount!')
+
+def parse_board_size(board_size):
+    try:
+        board_y, board_x = board_size.lower().split('x')
+        return (int(board_y), int(board_x))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'Board size must look like 7x7, not {board_size}!')
+
+def run_batch(game_amount, player_amount=2, board_size=(7, 7), enable_abilities=False, max_turns=100000, seed=None):
+    from battleship.batch_game import Batch_Game
+
+    start_time = time.perf_counter()
+    batch_results = Batch_Game(game_amount, player_amount, board_size, enable_abilities, seed).run(max_turns)
+    total_time = time.perf_counter()-start_time
+
+    results = {
+        'games': game_amount,
+        'unfinished_games': int((~batch_results['finished']).sum()),
+        'seconds': total_time,
+        'games_per_second': game_amount/total_time if total_time > 0 else 0.0,
+        'turns_per_game': float(batch_results['turns'].mean()) if game_amount > 0 else 0.0,
+        'win_rates': {}
+        }
+
+    for player_id in range(1, player_amount+1):
+        results['win_rates'][player_id] = float((batch_results['winners'] == player_id).sum())/max(game_amount, 1)
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m battleship.simulate', description='Run headless AI vs AI Battle Ship games.')
+    parser.add_argument('--games', type=int, default=100, help='amount of games to play')
+    parser.add_argument('--players', type=int, default=2, help='amount of AI players in every game')
+    parser.add_argument('--board', type=parse_board_size, default=(7, 7), help='board size, e.g. 7x7')
+    parser.add_argument('--abilities', action='store_true', help='enable ship abilities')
+    parser.add_argument('--max-turns', type=int, default=100000, help='turn limit before a game is counted as unfinished')
+    parser.add_argument('--strategies', type=lambda names: names.split(','), default=None,
+        help=f"comma separated AI strategy per player, one of: {', '.join(stored_strategies)}")
+    parser.add_argument('--batch', action='store_true', help='play all games at once with the NumPy batch engine')
+    parser.add_argument('--seed', type=int, default=None, help='seed for every random decision of the run')
+    parser.add_argument('--record', default=None, help='write a replay file for every game into this directory')
+    parser.add_argument('--ships', default=None, help='JSON file with custom ships and fleets')
+    args = parser.parse_args(argv)
+
+    # The batch engine plays the random AI and picks abilities at random,
+    # its games would not compare to the ones of the AI players.
+    if args.batch and args.abilities:
+        parser.error('--batch can not be used with --abilities, batch games do not plan their abilities like the AI players!')
+
+    if args.batch and args.strategies != None:
+        parser.error('--batch can not be used with --strategies, batch games always play the random AI!')
+
+    if args.ships != None:
+        load_ship_data(args.ships)
+
+    if args.batch:
+        results = run_batch(args.games, args.players, args.board, args.abilities, args.max_turns, args.seed)
+    else:
+        if args.record != None:
+            os.makedirs(args.record, exist_ok=True)
+
+        simulation = Simulation(args.players, args.board, args.abilities, args.max_turns, args.strategies, args.seed)
+        results = simulation.run(args.games, args.record)
+
+    print(f"Games: {results['games']} ({results['unfinished_games']} unfinished)")
+    print(f"Time: {results['seconds']:.3f}s")
+    print(f"Games/sec: {results['games_per_second']:.2f}")
+    print(f"Turns/game: {results['turns_per_game']:.2f}")
+
+    for player_id in results['win_rates']:
+        print(f"Player {player_id} win rate: {results['win_rates'][player_id]:.3f}")
+    return results
+
+if __name__ == "__main__":
+    main()
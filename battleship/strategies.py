@@ -0,0 +1,455 @@
+# Battle Ship // AI Strategy Classes
+# Developed using Python3
+
+__author__ = "Hkaar"
+
+__copyright__ = "Copyright (c) 2021 Hkaar"
+__license__ = "GNU General Public License (GPL) V3"
+
+"""This file is part of Battle Ship.
+
+Battle Ship is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+any later version.
+
+Battle Ship is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Battle Ship.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+__version__ = 0.1
+
+import concurrent.futures
+import heapq
+import copy
+import random
+import threading
+
+from battleship.bitboard import iter_bits
+from battleship.endgame import Endgame_Solver, get_knowledge, get_sunk_ships
+from battleship.abilities import get_ability, get_move_cost
+from battleship.game_state import Board_State, get_board_state
+from battleship.search import get_worker_amount, get_process_pool, get_rollout_ships, new_table_id, run_rollouts
+
+# Placements covering a known, not yet sunk ship cell are weighted this much
+# more than plain hunting placements.
+TARGET_WEIGHT = 100
+
+# Once this few ships are left every fleet that fits the board is counted
+# exactly instead of using the density estimate.
+ENDGAME_SHIPS = 2
+
+class Density_Map:
+    def __init__(self, board_size, ship_sizes):
+        self.board_size = board_size
+        self.cell_amount = board_size[0]*board_size[1]
+
+        self.ship_counts = {}
+        for ship_size in ship_sizes:
+            self.ship_counts[ship_size] = self.ship_counts.get(ship_size, 0)+1
+
+        self.placements = {}
+        self.cell_placements = {}
+        self.placement_counts = {}
+
+        self.density = [0]*self.cell_amount
+        self.blocked = 0
+        self.sunk_ships = set([])
+
+        self.gen_placements()
+
+    def gen_placements(self):
+        rows, columns = self.board_size
+
+        for ship_size in self.ship_counts:
+            placements = []
+            cell_placements = [[] for _ in range(0, self.cell_amount)]
+            placement_counts = [0]*self.cell_amount
+
+            for y in range(0, rows):
+                for x in range(0, columns):
+                    if x+ship_size <= columns:
+                        placements.append(tuple([y*columns+x+size_num for size_num in range(0, ship_size)]))
+                    if y+ship_size <= rows:
+                        placements.append(tuple([(y+size_num)*columns+x for size_num in range(0, ship_size)]))
+
+            for placement_id in range(0, len(placements)):
+                for cell in placements[placement_id]:
+                    cell_placements[cell].append(placement_id)
+                    placement_counts[cell] += 1
+
+            self.placements[ship_size] = tuple([(cells, sum([1 << cell for cell in cells])) for cells in placements])
+            self.cell_placements[ship_size] = cell_placements
+            self.placement_counts[ship_size] = placement_counts
+
+            for cell in range(0, self.cell_amount):
+                self.density[cell] += self.ship_counts[ship_size]*placement_counts[cell]
+
+    def copy(self):
+        # Placements never change once generated, only the counts are copied.
+        density_map = copy.copy(self)
+        density_map.ship_counts = {**self.ship_counts}
+        density_map.placement_counts = {ship_size: list(self.placement_counts[ship_size]) for ship_size in self.placement_counts}
+        density_map.density = list(self.density)
+        density_map.sunk_ships = set(self.sunk_ships)
+        return density_map
+
+    def block_cell(self, cell):
+        bit = 1 << cell
+
+        if self.blocked & bit:
+            return None
+
+        for ship_size in self.placements:
+            placements = self.placements[ship_size]
+            placement_counts = self.placement_counts[ship_size]
+            ship_count = self.ship_counts[ship_size]
+
+            for placement_id in self.cell_placements[ship_size][cell]:
+                cells, placement_mask = placements[placement_id]
+
+                if not placement_mask & self.blocked:
+                    for placement_cell in cells:
+                        placement_counts[placement_cell] -= 1
+                        self.density[placement_cell] -= ship_count
+
+        self.blocked |= bit
+
+    def sink_ship(self, ship_size):
+        if self.ship_counts.get(ship_size, 0) > 0:
+            self.ship_counts[ship_size] -= 1
+            placement_counts = self.placement_counts[ship_size]
+
+            for cell in range(0, self.cell_amount):
+                self.density[cell] -= placement_counts[cell]
+
+    def sync(self, bit_board):
+        # Cells of a sunk ship are blocked once the hits show where it lay.
+        if len(bit_board.sunk_hits) > 0:
+            sunk_ships = get_sunk_ships(bit_board)
+
+            for ship_object in sunk_ships:
+                ship_size, sure_mask, _ = sunk_ships[ship_object]
+
+                if ship_object not in self.sunk_ships:
+                    self.sunk_ships.add(ship_object)
+                    self.sink_ship(ship_size)
+
+                for cell in iter_bits(sure_mask & ~self.blocked):
+                    self.block_cell(cell)
+
+        for cell in iter_bits(bit_board.misses & ~self.blocked):
+            self.block_cell(cell)
+
+    def get_target_scores(self, known_cells, unknown_mask):
+        target_scores = {}
+
+        for known_cell in known_cells:
+            for ship_size in self.placements:
+                ship_count = self.ship_counts[ship_size]
+                if ship_count == 0:
+                    continue
+
+                placements = self.placements[ship_size]
+
+                for placement_id in self.cell_placements[ship_size][known_cell]:
+                    cells, placement_mask = placements[placement_id]
+
+                    if not placement_mask & self.blocked:
+                        for cell in cells:
+                            if unknown_mask >> cell & 1:
+                                target_scores[cell] = target_scores.get(cell, 0)+TARGET_WEIGHT*ship_count
+        return target_scores
+
+class Density_Strategy:
+    def __init__(self, rng=None, endgame_ships=ENDGAME_SHIPS):
+        self.rng = rng if rng != None else random
+        self.stored_maps = {}
+
+        self.endgame_ships = endgame_ships
+        self.stored_solvers = {}
+
+    def copy(self):
+        # Pondering plans on a copy with caches of its own, they are merged
+        # back once the pondered turn is played.
+        strategy = copy.copy(self)
+        strategy.stored_maps = {target_key: self.stored_maps[target_key].copy() for target_key in self.stored_maps}
+        strategy.stored_solvers = {}
+        return strategy
+
+    def merge(self, strategy):
+        self.stored_maps.update(strategy.stored_maps)
+        self.stored_solvers.update(strategy.stored_solvers)
+
+    def get_target_key(self, target):
+        # Caches are kept by the fleet of the target, so they are found again
+        # on the copies of the target a ponder plans with.
+        return target.bit_board.get_fleet()
+
+    def get_map(self, target):
+        bit_board = target.bit_board
+        target_key = self.get_target_key(target)
+        density_map = self.stored_maps.get(target_key)
+
+        if density_map == None:
+            ship_sizes = [ship_size for _, ship_size in target_key]
+            density_map = Density_Map(bit_board.board_size, ship_sizes)
+            self.stored_maps[target_key] = density_map
+
+        density_map.sync(bit_board)
+        return density_map
+
+    def get_solution(self, target):
+        bit_board = target.bit_board
+        knowledge = get_knowledge(bit_board)
+
+        if not 0 < len(knowledge[4]) <= self.endgame_ships:
+            return None
+
+        target_key = self.get_target_key(target)
+        solver = self.stored_solvers.get(target_key)
+
+        if solver == None:
+            solver = Endgame_Solver(bit_board.board_size)
+            self.stored_solvers[target_key] = solver
+
+        solution = solver.solve(knowledge)
+        if solution == None or solution.total == 0:
+            return None
+        return solution
+
+    def get_scores(self, target, mode='A'):
+        bit_board = target.bit_board
+        density_map = self.get_map(target)
+
+        known_mask = bit_board.hits | bit_board.misses | bit_board.spotted
+        unknown_mask = bit_board.board_mask & ~known_mask
+
+        if mode == 'A' and bit_board.spotted & ~bit_board.hits:
+            return {cell: TARGET_WEIGHT for cell in iter_bits(bit_board.spotted & ~bit_board.hits)}
+
+        solution = self.get_solution(target)
+        if solution != None:
+            endgame_scores = solution.get_scores(unknown_mask)
+
+            if len(endgame_scores) > 0:
+                return endgame_scores
+
+        known_cells = tuple(iter_bits((bit_board.hits | bit_board.spotted) & ~density_map.blocked))
+        if len(known_cells) > 0:
+            target_scores = density_map.get_target_scores(known_cells, unknown_mask)
+
+            if len(target_scores) > 0:
+                return target_scores
+
+        density = density_map.density
+        return {cell: density[cell] for cell in iter_bits(unknown_mask)}
+
+    def get_position(self, player, target, mode='A'):
+        bit_board = target.bit_board
+
+        if mode == 'A' and not bit_board.spotted & ~bit_board.hits:
+            solution = self.get_solution(target)
+
+            if solution != None:
+                best_cell = self.stored_solvers[self.get_target_key(target)].get_best_shot(solution)
+
+                if best_cell != None:
+                    return bit_board.get_position(best_cell)
+
+        scores = self.get_scores(target, mode)
+
+        if len(scores) == 0:
+            return self.rng.choice(player.attack_piece_positions)
+
+        best_score = max(scores.values())
+        best_cells = [cell for cell in scores if scores[cell] == best_score]
+        return target.bit_board.get_position(self.rng.choice(best_cells))
+
+    def get_positions(self, player, target, position_count, mode='A'):
+        scores = self.get_scores(target, mode)
+
+        if len(scores) < position_count:
+            density = self.get_map(target).density
+            unknown_mask = target.bit_board.board_mask & ~(target.bit_board.hits | target.bit_board.misses | target.bit_board.spotted)
+
+            for cell in iter_bits(unknown_mask):
+                if cell not in scores:
+                    scores[cell] = density[cell]
+
+        best_cells = heapq.nlargest(position_count, scores, key=scores.__getitem__)
+        return set([target.bit_board.get_position(cell) for cell in best_cells])
+
+class MCTS_Strategy(Density_Strategy):
+    def __init__(self, rng=None, time_budget=0.1, worker_amount=None, candidate_amount=8, horizon=3, endgame_ships=ENDGAME_SHIPS):
+        super(MCTS_Strategy, self).__init__(rng, endgame_ships)
+        self.candidate_amount = candidate_amount
+        self.worker_amount = worker_amount
+        self.time_budget = time_budget
+        self.horizon = horizon
+
+        self.table_id = new_table_id()
+
+    def copy(self):
+        strategy = super(MCTS_Strategy, self).copy()
+        strategy.table_id = new_table_id()
+        return strategy
+
+    def merge(self, strategy):
+        super(MCTS_Strategy, self).merge(strategy)
+
+        # The tree of the pondered search holds the nodes of the turns ahead.
+        self.table_id = strategy.table_id
+
+    def get_snapshot(self, player, target, enable_abilities):
+        bit_board = target.bit_board
+        sunk_ships = get_sunk_ships(bit_board)
+        rows, columns = bit_board.board_size
+
+        # Sunk ships get a placement their hits allow, the search draws the
+        # others.
+        sunk_mask = 0
+        remaining_sizes = []
+        target_ships = []
+
+        for ship_object, ship_size in bit_board.get_fleet():
+            if ship_object in sunk_ships:
+                sunk_mask |= sunk_ships[ship_object][2]
+                target_ships.append((ship_object.__class__.__name__, ship_size, sunk_ships[ship_object][2]))
+            else:
+                remaining_sizes.append(ship_size)
+                target_ships.append((ship_object.__class__.__name__, ship_size, None))
+
+        available_ships = []
+        own_board = Board_State((), attack_points=player.attack_points, scout_points=player.scout_points)
+
+        if player.bit_board != None:
+            available_ships = [ship_object.__class__.__name__ for ship_object in player.bit_board.get_available_ships()]
+            own_board = get_board_state(player)
+
+        return {
+            'board_size': bit_board.board_size,
+            'hits': bit_board.hits,
+            'misses': bit_board.misses,
+            'spotted': bit_board.spotted,
+            'sunk_mask': sunk_mask,
+            'remaining_sizes': tuple(sorted(remaining_sizes)),
+            'target_ships': tuple(target_ships),
+            'own_board': own_board,
+            'enable_abilities': enable_abilities,
+            'available_ships': tuple(available_ships),
+            'rollout_ships': get_rollout_ships(available_ships) if enable_abilities else (None,),
+            'attack_points': player.attack_points,
+            'scout_points': player.scout_points,
+            'first_column': sum([1 << (y*columns) for y in range(0, rows)]),
+            'last_column': sum([1 << (y*columns+columns-1) for y in range(0, rows)]),
+            'branching': self.candidate_amount,
+            'horizon': self.horizon
+            }
+
+    def get_actions(self, snapshot, target, enable_abilities):
+        # Select abilities take as many of the best cells as they need.
+        cell_amount = self.candidate_amount
+
+        if enable_abilities:
+            for ship_name in snapshot['available_ships']:
+                for mode in ('A', 'S'):
+                    if get_ability(ship_name, mode).kind == 'select':
+                        cell_amount = max(cell_amount, get_ability(ship_name, mode).count+1)
+
+        attack_cells = self.get_scores(target, 'A')
+        attack_cells = heapq.nlargest(cell_amount, attack_cells, key=attack_cells.__getitem__)
+
+        if not enable_abilities:
+            return [(None, 'A', (cell,)) for cell in attack_cells]
+
+        scout_cells = self.get_scores(target, 'S')
+        scout_cells = heapq.nlargest(cell_amount, scout_cells, key=scout_cells.__getitem__)
+
+        actions = []
+        for ship_name in (None,)+snapshot['available_ships']:
+            for mode in ('A', 'S'):
+                points = snapshot['attack_points'] if mode == 'A' else snapshot['scout_points']
+
+                ability = get_ability(ship_name, mode) if ship_name != None else None
+
+                if (ability != None and ability.kind == 'event') or get_move_cost(ship_name, mode) > points:
+                    continue
+
+                cells = attack_cells if mode == 'A' else scout_cells
+
+                if ability != None and ability.kind == 'select':
+                    selected_cells = tuple(cells[:ability.count+1])
+
+                    if len(selected_cells) == ability.count+1:
+                        actions.append((ship_name, mode, selected_cells))
+                else:
+                    for cell in cells[:self.candidate_amount]:
+                        actions.append((ship_name, mode, (cell,)))
+        return actions
+
+    def search(self, snapshot, actions):
+        worker_amount = get_worker_amount(self.worker_amount)
+        visits = [0]*len(actions)
+        totals = [0.0]*len(actions)
+
+        # Process pools are only started from the main thread, a search on a
+        # turn or ponder thread runs its rollouts where it is.
+        if worker_amount > 1 and threading.current_thread() is threading.main_thread():
+            try:
+                process_pool = get_process_pool(worker_amount)
+                futures = [process_pool.submit(run_rollouts, snapshot, actions, self.time_budget, self.rng.getrandbits(32), self.table_id)
+                    for _ in range(0, worker_amount)]
+                results = [future.result() for future in futures]
+            except (OSError, RuntimeError, concurrent.futures.process.BrokenProcessPool):
+                results = [run_rollouts(snapshot, actions, self.time_budget, self.rng.getrandbits(32), self.table_id)]
+        else:
+            results = [run_rollouts(snapshot, actions, self.time_budget, self.rng.getrandbits(32), self.table_id)]
+
+        # A process that ran several of the searches shares one tree between
+        # them, its last result already holds the earlier ones.
+        process_results = {}
+        for process_id, worker_visits, worker_totals in results:
+            if sum(worker_visits) >= sum(process_results.get(process_id, ((), ()))[0]):
+                process_results[process_id] = (worker_visits, worker_totals)
+
+        for worker_visits, worker_totals in process_results.values():
+            for action_index in range(0, len(actions)):
+                visits[action_index] += worker_visits[action_index]
+                totals[action_index] += worker_totals[action_index]
+        return visits, totals
+
+    def get_move(self, player, target, attack_manager):
+        snapshot = self.get_snapshot(player, target, attack_manager.enable_abilities)
+        actions = self.get_actions(snapshot, target, attack_manager.enable_abilities)
+
+        if len(actions) == 0:
+            return None
+
+        if len(actions) == 1:
+            best_action = actions[0]
+        else:
+            visits, totals = self.search(snapshot, actions)
+            best_action = actions[max(range(0, len(actions)), key=lambda index: (visits[index], totals[index]))]
+
+        ship_name, mode, cells = best_action
+        return ship_name, mode, tuple([target.bit_board.get_position(cell) for cell in cells])
+
+stored_strategies = {
+    'random': None,
+    'density': Density_Strategy,
+    'mcts': MCTS_Strategy
+    }
+
+def get_strategy(strategy_name, rng=None):
+    if strategy_name not in stored_strategies:
+        raise ValueError(f'Unknown AI strategy: {strategy_name}!')
+
+    if stored_strategies[strategy_name] != None:
+        return stored_strategies[strategy_name](rng)
+    return None
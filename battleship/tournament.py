@@ -0,0 +1,275 @@
+# Battle Ship // AI Tournament
+# Developed using Python3
+
+__author__ = "Hkaar"
+
+__copyright__ = "Copyright (c) 2021 Hkaar"
+__license__ = "GNU General Public License (GPL) V3"
+
+"""This file is part of Battle Ship.
+
+Battle Ship is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+any later version.
+
+Battle Ship is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Battle Ship.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+__version__ = 0.1
+
+import concurrent.futures
+import itertools
+import argparse
+import random
+import math
+import time
+
+import battleship.search as search
+
+from battleship.simulate import Simulation, parse_board_size
+from battleship.strategies import stored_strategies
+
+def init_worker():
+    search.set_default_worker_amount(1)
+
+def play_tournament_game(strategy_names, board_size, enable_abilities, max_turns, seed):
+    simulation = Simulation(len(strategy_names), board_size, enable_abilities, max_turns, strategy_names)
+    ranking, turn_count = simulation.play_ranked_game(seed)
+
+    return tuple(strategy_names), [[strategy_names[player_id-1] for player_id in group] for group in ranking], turn_count
+
+def get_bradley_terry_ratings(entrants, game_results, iterations=200):
+    wins = {entrant: {opponent: 0.0 for opponent in entrants} for entrant in entrants}
+
+    for ranking in game_results:
+        for group_index in range(0, len(ranking)):
+            for entrant in ranking[group_index]:
+                for opponent in ranking[group_index]:
+                    if entrant != opponent:
+                        wins[entrant][opponent] += 0.5
+
+                for lower_group in ranking[group_index+1:]:
+                    for opponent in lower_group:
+                        if entrant != opponent:
+                            wins[entrant][opponent] += 1.0
+
+    # One virtual draw per pair keeps the ratings finite for unbeaten entrants.
+    for entrant in entrants:
+        for opponent in entrants:
+            if entrant != opponent:
+                wins[entrant][opponent] += 0.5
+
+    strengths = {entrant: 1.0 for entrant in entrants}
+
+    for _ in range(0, iterations):
+        new_strengths = {}
+
+        for entrant in entrants:
+            total_wins = sum(wins[entrant].values())
+            denominator = 0.0
+
+            for opponent in entrants:
+                if entrant != opponent:
+                    denominator += (wins[entrant][opponent]+wins[opponent][entrant])/(strengths[entrant]+strengths[opponent])
+
+            new_strengths[entrant] = total_wins/denominator if denominator > 0 else strengths[entrant]
+
+        scale = math.exp(sum([math.log(strength) for strength in new_strengths.values()])/len(entrants))
+        strengths = {entrant: new_strengths[entrant]/scale for entrant in entrants}
+
+    return {entrant: 1500+400*math.log10(strengths[entrant]) for entrant in entrants}
+
+class Tournament:
+    def __init__(self, entrants, player_amount=2, board_size=(7, 7), enable_abilities=False, games_per_pairing=10,
+            pairing_format='round-robin', rounds=5, max_turns=100000, worker_amount=None, seed=None):
+        self.entrants = tuple(entrants)
+        self.player_amount = player_amount
+        self.board_size = board_size
+        self.enable_abilities = enable_abilities
+        self.games_per_pairing = games_per_pairing
+        self.pairing_format = pairing_format
+        self.rounds = rounds
+        self.max_turns = max_turns
+        self.worker_amount = worker_amount
+
+        self.rng = random.Random(seed)
+
+        self.game_results = []
+        self.total_turns = 0
+        self.total_time = 0.0
+
+        self.check_requirements()
+
+    def gen_seatings(self, pairing):
+        seatings = []
+
+        for game_index in range(0, self.games_per_pairing):
+            rotation = game_index % len(pairing)
+            seatings.append(tuple(pairing[rotation:])+tuple(pairing[:rotation]))
+        return seatings
+
+    def gen_round_robin(self):
+        if len(self.entrants) >= self.player_amount:
+            pairings = itertools.combinations(self.entrants, self.player_amount)
+        else:
+            pairings = [tuple(itertools.islice(itertools.cycle(self.entrants), self.player_amount))]
+
+        seatings = []
+        for pairing in pairings:
+            seatings += self.gen_seatings(pairing)
+        return seatings
+
+    def gen_swiss_round(self):
+        if len(self.entrants) <= self.player_amount:
+            return self.gen_round_robin()
+
+        scores = self.get_scores()
+        played = set([])
+
+        for ranking in self.game_results:
+            played.add(frozenset([entrant for group in ranking for entrant in group]))
+
+        standings = sorted(self.entrants, key=lambda entrant: (-scores[entrant], self.rng.random()))
+        seatings = []
+
+        while len(standings) >= self.player_amount:
+            pairing = standings[:self.player_amount]
+
+            for candidate_index in range(self.player_amount, len(standings)):
+                if frozenset(pairing) not in played:
+                    break
+                pairing = standings[:self.player_amount-1]+[standings[candidate_index]]
+
+            if frozenset(pairing) in played:
+                pairing = standings[:self.player_amount]
+
+            for entrant in pairing:
+                standings.remove(entrant)
+            seatings += self.gen_seatings(pairing)
+        return seatings
+
+    def get_scores(self):
+        scores = {entrant: 0.0 for entrant in self.entrants}
+
+        for ranking in self.game_results:
+            if len(ranking[0]) == 1:
+                scores[ranking[0][0]] += 1.0
+            else:
+                for entrant in ranking[0]:
+                    scores[entrant] += 1.0/len(ranking[0])
+        return scores
+
+    def play_seatings(self, process_pool, seatings, report_method=None):
+        futures = [process_pool.submit(play_tournament_game, seating, self.board_size, self.enable_abilities,
+            self.max_turns, self.rng.getrandbits(32)) for seating in seatings]
+
+        for future in concurrent.futures.as_completed(futures):
+            seating, ranking, turn_count = future.result()
+
+            self.game_results.append(ranking)
+            self.total_turns += turn_count
+
+            if report_method != None:
+                report_method(seating, ranking, turn_count)
+
+    def run(self, report_method=None):
+        start_time = time.perf_counter()
+
+        with concurrent.futures.ProcessPoolExecutor(max_workers=search.get_worker_amount(self.worker_amount), initializer=init_worker) as process_pool:
+            if self.pairing_format == 'swiss':
+                for _ in range(0, self.rounds):
+                    self.play_seatings(process_pool, self.gen_swiss_round(), report_method)
+            else:
+                self.play_seatings(process_pool, self.gen_round_robin(), report_method)
+
+        self.total_time += time.perf_counter()-start_time
+        return self.get_results()
+
+    def get_ratings(self, bootstrap_amount=200):
+        ratings = get_bradley_terry_ratings(self.entrants, self.game_results)
+        samples = {entrant: [] for entrant in self.entrants}
+
+        for _ in range(0, bootstrap_amount if len(self.game_results) > 0 else 0):
+            resampled_results = [self.rng.choice(self.game_results) for _ in range(0, len(self.game_results))]
+            resampled_ratings = get_bradley_terry_ratings(self.entrants, resampled_results, 50)
+
+            for entrant in self.entrants:
+                samples[entrant].append(resampled_ratings[entrant])
+
+        intervals = {}
+        for entrant in self.entrants:
+            entrant_samples = sorted(samples[entrant])
+
+            if len(entrant_samples) > 0:
+                intervals[entrant] = (entrant_samples[int(0.025*(len(entrant_samples)-1))], entrant_samples[int(0.975*(len(entrant_samples)-1))])
+            else:
+                intervals[entrant] = (ratings[entrant], ratings[entrant])
+        return ratings, intervals
+
+    def get_results(self):
+        ratings, intervals = self.get_ratings()
+
+        return {
+            'games': len(self.game_results),
+            'seconds': self.total_time,
+            'games_per_second': len(self.game_results)/self.total_time if self.total_time > 0 else 0.0,
+            'turns_per_game': self.total_turns/len(self.game_results) if len(self.game_results) > 0 else 0.0,
+            'workers': search.get_worker_amount(self.worker_amount),
+            'scores': self.get_scores(),
+            'ratings': ratings,
+            'intervals': intervals
+            }
+
+    def check_requirements(self):
+        for entrant in self.entrants:
+            if entrant not in stored_strategies:
+                raise ValueError(f'Unknown AI strategy: {entrant}!')
+
+        if self.player_amount not in (2, 4):
+            raise ValueError('Tournament games must have 2 or 4 players!')
+
+        if self.pairing_format not in ('round-robin', 'swiss'):
+            raise ValueError('Pairing format must be round-robin or swiss!')
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m battleship.tournament', description='Rate AI strategies against each other.')
+    parser.add_argument('--strategies', type=lambda names: names.split(','), default=list(stored_strategies.keys()),
+        help=f"comma separated AI strategies, any of: {', '.join(stored_strategies)}")
+    parser.add_argument('--players', type=int, default=2, choices=(2, 4), help='players in every game')
+    parser.add_argument('--board', type=parse_board_size, default=(7, 7), help='board size, e.g. 7x7')
+    parser.add_argument('--abilities', action='store_true', help='enable ship abilities')
+    parser.add_argument('--games', type=int, default=10, help='games for every pairing')
+    parser.add_argument('--format', choices=('round-robin', 'swiss'), default='round-robin', help='pairing format')
+    parser.add_argument('--rounds', type=int, default=5, help='rounds for swiss pairing')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes, defaults to every core')
+    parser.add_argument('--max-turns', type=int, default=100000, help='turn limit before a game is counted as a draw')
+    parser.add_argument('--seed', type=int, default=None, help='seed for pairings and games')
+    args = parser.parse_args(argv)
+
+    tournament = Tournament(args.strategies, args.players, args.board, args.abilities, args.games, args.format,
+        args.rounds, args.max_turns, args.workers, args.seed)
+
+    def report_method(seating, ranking, turn_count):
+        print(f"Game {len(tournament.game_results)}: {' vs '.join(seating)} -> winner {'/'.join(ranking[0])} ({turn_count} turns)")
+
+    results = tournament.run(report_method)
+
+    print(f"Games: {results['games']} on {results['workers']} workers")
+    print(f"Time: {results['seconds']:.3f}s")
+    print(f"Games/sec: {results['games_per_second']:.2f}")
+    print(f"Turns/game: {results['turns_per_game']:.2f}")
+
+    for entrant in sorted(results['ratings'], key=lambda entrant: -results['ratings'][entrant]):
+        low, high = results['intervals'][entrant]
+        print(f"{entrant}: Elo {results['ratings'][entrant]:.0f} (95% CI {low:.0f} - {high:.0f}), score {results['scores'][entrant]:.1f}")
+    return results
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+# Battle Ship // Transposition Table
+# Developed using Python3
+
+__author__ = "Hkaar"
+
+__copyright__ = "Copyright (c) 2021 Hkaar"
+__license__ = "GNU General Public License (GPL) V3"
+
+"""This file is part of Battle Ship.
+
+Battle Ship is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+any later version.
+
+Battle Ship is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Battle Ship.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+__version__ = 0.1
+
+HASH_MASK = (1 << 64)-1
+
+# Layers of the per cell keys, the rest of the keys use their own kind so
+# no two parts of a state can share a key.
+HIT_LAYER = 0
+MISS_LAYER = 1
+SPOTTED_LAYER = 2
+
+SUNK_KEY = 3
+POINTS_KEY = 4
+EVENTS_KEY = 5
+TARGET_KEY = 6
+TURN_KEY = 7
+
+REPLACEMENT_POLICIES = ('depth', 'always')
+
+def splitmix64(value):
+    value = (value+0x9E3779B97F4A7C15) & HASH_MASK
+    value = ((value ^ (value >> 30))*0xBF58476D1CE4E5B9) & HASH_MASK
+    value = ((value ^ (value >> 27))*0x94D049BB133111EB) & HASH_MASK
+    return value ^ (value >> 31)
+
+class Zobrist_Keys:
+    def __init__(self, board_size, seed=0):
+        self.board_size = board_size
+        self.seed = splitmix64(seed)
+
+        # Keys are made on first use, a 500 x 500 board would otherwise need
+        # millions of them before the first move.
+        self.stored_keys = {}
+
+    def get_key(self, kind, player_id, value):
+        key_index = ((value*8+kind) << 16 | player_id) ^ self.seed
+        key = self.stored_keys.get(key_index)
+
+        if key == None:
+            key = splitmix64(key_index)
+            self.stored_keys[key_index] = key
+        return key
+
+    def get_cell_key(self, player_id, layer, cell):
+        return self.get_key(layer, player_id, cell)
+
+    def get_mask_key(self, player_id, layer, mask):
+        mask_key = 0
+
+        while mask:
+            low_bit = mask & -mask
+            mask_key ^= self.get_key(layer, player_id, low_bit.bit_length()-1)
+            mask ^= low_bit
+        return mask_key
+
+    def get_points_key(self, player_id, attack_points, scout_points):
+        return self.get_key(POINTS_KEY, player_id, attack_points << 24 | scout_points & 0xFFFFFF)
+
+    def get_events_key(self, player_id, events):
+        modes = {'A': 1, 'S': 2}
+        orientations = {'N': 1, 'W': 2, 'S': 3, 'E': 4}
+
+        events_key = self.get_key(EVENTS_KEY, player_id, len(events))
+
+        for mode, position, move_count, orientation, last_position in events:
+            last_position = last_position if last_position != None else (-2, -2)
+
+            for value in (modes[mode], position[0], position[1], move_count, orientations[orientation], last_position[0], last_position[1]):
+                events_key = splitmix64(events_key ^ (value & HASH_MASK))
+        return events_key
+
+    def get_target_key(self, player_id, target_id):
+        return self.get_key(TARGET_KEY, player_id, target_id)
+
+    def get_turn_key(self, player_id):
+        return self.get_key(TURN_KEY, 0, player_id)
+
+stored_zobrist_keys = {}
+
+def get_zobrist_keys(board_size):
+    # Every state of one board size uses the same keys, so hashes stay
+    # comparable between turns and searches.
+    if board_size not in stored_zobrist_keys:
+        stored_zobrist_keys[board_size] = Zobrist_Keys(board_size)
+    return stored_zobrist_keys[board_size]
+
+class Transposition_Table:
+    def __init__(self, entry_amount=1 << 16, replacement='depth'):
+        if replacement not in REPLACEMENT_POLICIES:
+            raise ValueError(f'Unknown replacement policy: {replacement}!')
+
+        # One entry per slot, the slot is picked by the low bits of the hash.
+        slot_amount = 1
+        while slot_amount < entry_amount:
+            slot_amount <<= 1
+
+        self.replacement = replacement
+        self.slot_mask = slot_amount-1
+        self.stored_entries = [None]*slot_amount
+
+        self.generation = 0
+        self.hit_count = 0
+        self.miss_count = 0
+
+    def __len__(self):
+        return sum([1 for entry in self.stored_entries if entry != None])
+
+    def new_search(self):
+        # Entries of earlier searches are kept, but may always be replaced.
+        self.generation += 1
+
+    def clear(self):
+        self.stored_entries = [None]*(self.slot_mask+1)
+        self.hit_count = 0
+        self.miss_count = 0
+
+    def get(self, state_hash, depth=0):
+        entry = self.stored_entries[state_hash & self.slot_mask]
+
+        if entry != None and entry[0] == state_hash and entry[1] >= depth:
+            self.hit_count += 1
+            return entry[2], entry[3]
+
+        self.miss_count += 1
+        return None
+
+    def store(self, state_hash, depth, value, best_move=None):
+        slot = state_hash & self.slot_mask
+        entry = self.stored_entries[slot]
+
+        if self.replacement == 'depth' and entry != None and entry[0] != state_hash:
+            if entry[4] == self.generation and entry[1] > depth:
+                return False
+
+        self.stored_entries[slot] = (state_hash, depth, value, best_move, self.generation)
+        return True
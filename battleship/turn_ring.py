@@ -0,0 +1,153 @@
+# Battle Ship // Turn Ring
+# Developed using Python3
+
+__author__ = "Hkaar"
+
+__copyright__ = "Copyright (c) 2021 Hkaar"
+__license__ = "GNU General Public License (GPL) V3"
+
+"""This file is part of Battle Ship.
+
+Battle Ship is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+any later version.
+
+Battle Ship is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Battle Ship.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+__version__ = 0.1
+
+class Turn_Ring:
+    def __init__(self, player_ids=()):
+        self.next_players = {}
+        self.previous_players = {}
+        self.first_player = None
+
+        for player_id in player_ids:
+            self.add(player_id)
+
+    def __len__(self):
+        return len(self.previous_players)
+
+    def __contains__(self, player_id):
+        return player_id in self.previous_players
+
+    def __iter__(self):
+        player_id = self.first_player
+
+        for _ in range(0, len(self)):
+            yield player_id
+            player_id = self.next_players[player_id]
+
+    def add(self, player_id):
+        if player_id in self:
+            raise ValueError(f'Player {player_id} is already in the turn ring!')
+
+        if self.first_player == None:
+            self.first_player = player_id
+            self.next_players[player_id] = player_id
+            self.previous_players[player_id] = player_id
+        else:
+            last_player = self.previous_players[self.first_player]
+
+            self.next_players[last_player] = player_id
+            self.next_players[player_id] = self.first_player
+            self.previous_players[player_id] = last_player
+            self.previous_players[self.first_player] = player_id
+
+    def remove(self, player_id):
+        if player_id not in self:
+            return None
+
+        previous_player = self.previous_players.pop(player_id)
+        next_player = self.next_players[player_id]
+
+        if len(self) == 0:
+            self.first_player = None
+            return None
+
+        self.next_players[previous_player] = next_player
+        self.previous_players[next_player] = previous_player
+
+        if self.first_player == player_id:
+            self.first_player = next_player
+
+    def get_next(self, player_id):
+        # A removed player keeps the link it had, the players it leads to
+        # were removed after it, so following the links ends on the player
+        # that came after it.
+        if len(self) == 0 or player_id not in self.next_players:
+            return self.first_player
+
+        next_player = self.next_players[player_id]
+
+        while next_player not in self:
+            next_player = self.next_players[next_player]
+        return next_player
+
+    def get_previous(self, player_id):
+        return self.previous_players.get(player_id)
+
+class Target_Graph(dict):
+    def __init__(self, player_targets=()):
+        super().__init__()
+
+        # Every player is attacked by one player at most, the ones nobody
+        # targets are kept in order so a free target is found at once.
+        self.attackers = {}
+        self.untargeted = {}
+
+        for player_id, target_id in dict(player_targets).items():
+            self[player_id] = target_id
+
+    def __setitem__(self, player_id, target_id):
+        if player_id in self:
+            self.release(player_id, self[player_id])
+        elif player_id not in self.attackers:
+            self.untargeted[player_id] = None
+
+        super().__setitem__(player_id, target_id)
+
+        self.attackers[target_id] = player_id
+        self.untargeted.pop(target_id, None)
+
+    def __delitem__(self, player_id):
+        if player_id not in self:
+            raise KeyError(player_id)
+        self.discard(player_id)
+
+    def release(self, player_id, target_id):
+        if self.attackers.get(target_id) == player_id:
+            del self.attackers[target_id]
+
+            if target_id in self:
+                self.untargeted[target_id] = None
+
+    def pop(self, player_id, *default):
+        if player_id not in self:
+            return super().pop(player_id, *default)
+        return self.discard(player_id)
+
+    def discard(self, player_id):
+        # Same as pop, but a player that is not in the graph is no error.
+        if player_id not in self:
+            return None
+
+        target_id = super().pop(player_id)
+
+        self.release(player_id, target_id)
+        self.untargeted.pop(player_id, None)
+        return target_id
+
+    def get_attacker(self, player_id):
+        return self.attackers.get(player_id)
+
+    def get_untargeted(self):
+        return next(iter(self.untargeted), None)
@@ -0,0 +1,121 @@
+# Battle Ship // Ability Tests
+# Developed using Python3
+
+__author__ = "Hkaar"
+
+__copyright__ = "Copyright (c) 2021 Hkaar"
+__license__ = "GNU General Public License (GPL) V3"
+
+"""This file is part of Battle Ship.
+
+Battle Ship is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+any later version.
+
+Battle Ship is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Battle Ship.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+__version__ = 0.1
+
+import json
+import random
+
+import pytest
+
+from battleship import abilities
+from battleship.abilities import get_ability, load_ship_data, stored_ship_data, stored_fleets
+
+def get_naive_footprint(ability_data, position, board_size, rng):
+    generated_positions = [position] if ability_data.get('center') == 'include' else []
+    offsets = ability_data['offsets']
+
+    for _ in range(0, ability_data.get('draws', 1) if ability_data['kind'] == 'pick' else 0):
+        offset = rng.choice(offsets)
+        if offset == (0, 0) and ability_data.get('center') == 'exclude':
+            continue
+
+        new_pos = (position[0]+offset[0], position[1]+offset[1])
+        if 0 <= new_pos[0] < board_size[0] and 0 <= new_pos[1] < board_size[1] and new_pos not in generated_positions:
+            generated_positions.append(new_pos)
+
+    if ability_data['kind'] == 'fixed':
+        for offset in offsets:
+            new_pos = (position[0]+offset[0], position[1]+offset[1])
+            if 0 <= new_pos[0] < board_size[0] and 0 <= new_pos[1] < board_size[1]:
+                generated_positions.append(new_pos)
+
+    return tuple(generated_positions)
+
+def test_stencils_match_naive_offsets():
+    for board_size in ((1, 1), (2, 3), (7, 7)):
+        for ship_key in stored_ship_data:
+            for mode in ('A', 'S'):
+                ability = get_ability(ship_key, mode)
+                ability_data = stored_ship_data[ship_key]['attack' if mode == 'A' else 'scout']
+
+                if ability.kind not in ('pick', 'fixed'):
+                    continue
+
+                for row in range(0, board_size[0]):
+                    for column in range(0, board_size[1]):
+                        seed = row*board_size[1]+column
+                        footprint = ability.get_footprint((row, column), board_size, random.Random(seed))
+
+                        assert footprint == get_naive_footprint(ability_data, (row, column), board_size, random.Random(seed))
+
+def test_load_ship_data(tmp_path):
+    backup_ships = dict(stored_ship_data)
+    backup_fleets = dict(stored_fleets)
+
+    ship_data = {
+        'ships': {'Corvette': {'name': 'Corvette', 'size': 2, 'attack_cost': 2, 'scout_cost': 1,
+            'attack': {'kind': 'fixed', 'offsets': [[0, 0], [0, 2]]},
+            'scout': {'kind': 'pick', 'offsets': [[1, 0], [-1, 0]], 'draws': 2}}},
+        'fleets': {'small': ['Patrol_Boat', 'Corvette']}
+        }
+    file_path = tmp_path / 'ships.json'
+    file_path.write_text(json.dumps(ship_data))
+
+    try:
+        get_ability('Battle_Ship', 'A')
+        load_ship_data(str(file_path))
+
+        assert stored_fleets['small'] == ('Patrol_Boat', 'Corvette')
+        assert abilities.stored_abilities == {}
+
+        ability = get_ability('Corvette', 'A')
+        assert ability.offsets == ((0, 0), (0, 2))
+        assert ability.get_footprint((3, 3), (5, 5)) == ((3, 3),)
+        assert get_ability('Corvette', 'S').reach == 1
+
+        ship_data['ships']['Corvette']['attack'] = {'kind': 'beam'}
+        file_path.write_text(json.dumps(ship_data))
+        load_ship_data(str(file_path))
+
+        with pytest.raises(ValueError):
+            get_ability('Corvette', 'A')
+
+        del ship_data['ships']['Corvette']['scout']
+        file_path.write_text(json.dumps(ship_data))
+
+        with pytest.raises(ValueError):
+            load_ship_data(str(file_path))
+
+        file_path.write_text(json.dumps({'fleets': {'bad': ['Frigate']}}))
+
+        with pytest.raises(ValueError):
+            load_ship_data(str(file_path))
+        assert 'bad' not in stored_fleets
+    finally:
+        stored_ship_data.clear()
+        stored_ship_data.update(backup_ships)
+        stored_fleets.clear()
+        stored_fleets.update(backup_fleets)
+        abilities.stored_abilities.clear()
@@ -0,0 +1,51 @@
+# Battle Ship // Batch Game Tests
+# Developed using Python3
+
+__author__ = "Hkaar"
+
+__copyright__ = "Copyright (c) 2021 Hkaar"
+__license__ = "GNU General Public License (GPL) V3"
+
+"""This file is part of Battle Ship.
+
+Battle Ship is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+any later version.
+
+Battle Ship is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Battle Ship.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+__version__ = 0.1
+
+import pytest
+
+from battleship.simulate import Simulation, run_batch, main
+
+pytest.importorskip('numpy')
+
+def test_batch_games_match_engine_games():
+    for player_amount in (2, 3):
+        simulation = Simulation(player_amount, (7, 7), seed=player_amount)
+        simulation.run(200)
+
+        engine_turns = float(simulation.total_turns)/simulation.games_played
+        batch_results = run_batch(2000, player_amount, (7, 7), seed=player_amount)
+
+        assert simulation.unfinished_games == 0 and batch_results['unfinished_games'] == 0
+        assert abs(batch_results['turns_per_game']-engine_turns) < 0.05*engine_turns
+
+        for player_id in range(1, player_amount+1):
+            engine_rate = float(simulation.player_wins[player_id])/simulation.games_played
+            assert abs(batch_results['win_rates'][player_id]-engine_rate) < 0.1
+
+def test_batch_rejects_abilities_and_strategies():
+    for argv in (['--batch', '--abilities'], ['--batch', '--strategies', 'density,random']):
+        with pytest.raises(SystemExit):
+            main(['--games', '1']+argv)
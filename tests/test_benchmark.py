@@ -0,0 +1,81 @@
+# Battle Ship // Benchmark Tests
+# Developed using Python3
+
+__author__ = "Hkaar"
+
+__copyright__ = "Copyright (c) 2021 Hkaar"
+__license__ = "GNU General Public License (GPL) V3"
+
+"""This file is part of Battle Ship.
+
+Battle Ship is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+any later version.
+
+Battle Ship is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Battle Ship.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+__version__ = 0.1
+
+import random
+
+from battleship.main_game import Attack_Manager
+from battleship.benchmark import bench_next_turn, bench_exec_events, compare_results, load_results, save_results, main
+
+def test_compare_results_flags_slowdowns():
+    baseline_results = {'exec_attack@7x7': 1.0, 'next_turn@7x7': 2.0, 'exec_scout@7x7': 0.0}
+    results = {'exec_attack@7x7': 1.2, 'next_turn@7x7': 3.0, 'exec_scout@7x7': 5.0, 'exec_events@7x7': 9.0}
+
+    assert compare_results(results, baseline_results) == {'next_turn@7x7': 1.5}
+    assert compare_results(results, baseline_results, 0.1) == {'exec_attack@7x7': 1.2, 'next_turn@7x7': 1.5}
+
+def test_baseline_run_exits_on_regression(tmp_path):
+    baseline_file = str(tmp_path/'baseline.json')
+    argv = ['--only', 'exec_attack,gen_ship_positions', '--sizes', '7x7', '--calls', '5', '--repeat', '1']
+
+    assert main(argv+['--output', baseline_file]) == 0
+    results = load_results(baseline_file)
+    assert set(results) == set(['exec_attack@7x7', 'gen_ship_positions@7x7'])
+
+    save_results(baseline_file, {result_name: 1e-12 for result_name in results}, 5, 1)
+    assert main(argv+['--baseline', baseline_file]) == 1
+
+    save_results(baseline_file, {result_name: 1e3 for result_name in results}, 5, 1)
+    assert main(argv+['--baseline', baseline_file]) == 0
+
+def test_timed_calls_are_never_idle(monkeypatch):
+    # Only the calls a benchmark makes itself are checked, the AI turns of
+    # next_turn move their own events.
+    idle_calls = []
+    depth = [0]
+
+    for benchmark_method, method_name in ((bench_next_turn, 'next_turn'), (bench_exec_events, 'exec_events')):
+        method = getattr(Attack_Manager, method_name)
+
+        def check_call(attack_manager, selected_player, method=method, method_name=method_name):
+            if depth[0] == 0:
+                if len(attack_manager.player_objects) <= 1 or selected_player != attack_manager.current_active_turn:
+                    idle_calls.append(method_name)
+                elif method_name == 'exec_events' and len(attack_manager.player_objects[selected_player].stored_events) == 0:
+                    idle_calls.append(method_name)
+
+            depth[0] += 1
+            try:
+                return method(attack_manager, selected_player)
+            finally:
+                depth[0] -= 1
+
+        monkeypatch.setattr(Attack_Manager, method_name, check_call)
+
+        random.seed(0)
+        assert benchmark_method((7, 7), 200)() > 0.0
+        monkeypatch.undo()
+
+    assert idle_calls == []
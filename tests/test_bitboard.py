@@ -0,0 +1,159 @@
+# Battle Ship // Bit Board Tests
+# Developed using Python3
+
+__author__ = "Hkaar"
+
+__copyright__ = "Copyright (c) 2021 Hkaar"
+__license__ = "GNU General Public License (GPL) V3"
+
+"""This file is part of Battle Ship.
+
+Battle Ship is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+any later version.
+
+Battle Ship is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Battle Ship.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+__version__ = 0.1
+
+import random
+
+from battleship.bitboard import Bit_Board, MISS, HIT, SPOTTED, count_bits, iter_bits
+
+def test_bits_round_trip():
+    bit_board = Bit_Board((5, 9))
+
+    assert bit_board.board_mask == (1 << 45)-1
+    assert bit_board.get_bit((-1, 0)) == 0 and bit_board.get_bit((5, 0)) == 0 and bit_board.get_bit((0, 9)) == 0
+
+    positions = tuple([(y, x) for y in range(0, 5) for x in range(0, 9) if (y*3+x) % 4 == 0])
+    mask = bit_board.get_mask(positions)
+
+    assert count_bits(mask) == len(positions)
+    assert list(iter_bits(mask)) == sorted([y*9+x for y, x in positions])
+    assert bit_board.get_positions(mask) == positions
+
+def test_attack_and_scout_match_cell_sets():
+    rng = random.Random(2)
+
+    for _ in range(0, 20):
+        board_size = (rng.randint(1, 12), rng.randint(1, 12))
+        bit_board = Bit_Board(board_size)
+        cells = [(y, x) for y in range(0, board_size[0]) for x in range(0, board_size[1])]
+
+        ship_cells = set(rng.sample(cells, rng.randint(0, len(cells))))
+        ship_positions = {pos: 'ship' for pos in ship_cells}
+        bit_board.load_ship_positions(ship_positions)
+
+        hits, misses, spotted = set(), set(), set()
+
+        for _ in range(0, len(cells)):
+            pos = rng.choice(cells)
+            bit = bit_board.get_bit(pos)
+
+            if rng.random() < 0.5:
+                expected = HIT if pos in ship_cells and pos not in hits else MISS
+
+                if pos in ship_cells:
+                    hits.add(pos)
+                    spotted.discard(pos)
+                else:
+                    misses.add(pos)
+                assert bit_board.attack(bit) == expected
+            else:
+                expected = SPOTTED if pos in ship_cells and pos not in hits else MISS
+
+                if expected == SPOTTED:
+                    spotted.add(pos)
+                elif pos not in ship_cells:
+                    misses.add(pos)
+                assert bit_board.scout(bit) == expected
+
+            assert bit_board.get_mask(hits) == bit_board.hits
+            assert bit_board.get_mask(misses) == bit_board.misses
+            assert bit_board.get_mask(spotted) == bit_board.spotted
+            assert bit_board.get_remaining_count() == len(ship_cells-hits)
+            assert bit_board.is_alive() == (len(ship_cells-hits) > 0)
+
+        hit_positions = bit_board.get_hit_positions()
+
+        assert set(hit_positions) == hits | misses | spotted
+        assert all([hit_positions[pos] == HIT for pos in hits])
+        assert all([hit_positions[pos] == SPOTTED for pos in spotted])
+
+def test_add_ship_rejects_overlap():
+    bit_board = Bit_Board((7, 7))
+
+    assert bit_board.add_ship('first', ((0, 0), (0, 1), (0, 2)))
+    assert not bit_board.add_ship('second', ((0, 2), (1, 2)))
+    assert bit_board.add_ship('second', ((1, 2), (2, 2)))
+
+    assert bit_board.ship_masks == {'first': 0b111, 'second': (1 << 9) | (1 << 16)}
+    assert bit_board.ships == 0b111 | (1 << 9) | (1 << 16)
+
+    bit_board.clear()
+
+    assert bit_board.ships == 0 and bit_board.ship_masks == {}
+
+def get_ray_distance(bit_board, y, x, step_y, step_x):
+    rows, columns = bit_board.board_size
+    open_ships = bit_board.ships & ~bit_board.hits
+
+    for distance in range(1, max(rows, columns)+2):
+        cell_y, cell_x = y+step_y*distance, x+step_x*distance
+
+        if not (0 <= cell_y < rows and 0 <= cell_x < columns):
+            return None
+        if open_ships >> (cell_y*columns+cell_x) & 1:
+            return distance
+
+def test_ray_index_follows_hits():
+    rng = random.Random(11)
+
+    for _ in range(0, 30):
+        board_size = (rng.randint(1, 15), rng.randint(1, 15))
+        rows, columns = board_size
+        cells = [(y, x) for y in range(0, rows) for x in range(0, columns)]
+
+        bit_board = Bit_Board(board_size)
+        bit_board.load_ship_positions({pos: 'ship' for pos in rng.sample(cells, rng.randint(0, len(cells)//2))})
+
+        for _ in range(0, 2*len(cells)):
+            # Rays start on the board or just outside of it, like events do.
+            y, x = rng.randint(-1, rows), rng.randint(-1, columns)
+            step_y, step_x = rng.choice(((1, 0), (-1, 0), (0, 1), (0, -1)))
+
+            if (step_y != 0 and 0 <= x < columns) or (step_x != 0 and 0 <= y < rows):
+                assert bit_board.get_ray_distance(y, x, step_y, step_x) == get_ray_distance(bit_board, y, x, step_y, step_x)
+
+            bit_board.attack(bit_board.get_bit(rng.choice(cells)))
+
+def test_hull_index_follows_hits():
+    rng = random.Random(16)
+
+    for _ in range(0, 20):
+        bit_board = Bit_Board((9, 9))
+        ship_cells = rng.sample([(y, x) for y in range(0, 9) for x in range(0, 9)], 20)
+        ship_positions = {pos: f'ship_{index % 6}' for index, pos in enumerate(ship_cells)}
+        bit_board.load_ship_positions(ship_positions)
+
+        for pos in rng.sample(list(ship_positions), 12)+rng.sample(list(ship_positions), 12):
+            bit_board.attack(bit_board.get_bit(pos))
+
+            for ship_object in bit_board.ship_masks:
+                hull = count_bits(bit_board.ship_masks[ship_object] & ~bit_board.hits)
+
+                assert bit_board.get_hull(ship_object) == hull
+                assert bit_board.is_ship_sunk(ship_object) == (hull == 0)
+
+            assert bit_board.get_ship_at(bit_board.get_bit(pos)) == ship_positions[pos]
+            assert bit_board.get_available_ships() == tuple([ship_object for ship_object in bit_board.ship_masks if not bit_board.is_ship_sunk(ship_object)])
+            assert bit_board.get_fleet() == tuple([(ship_object, count_bits(bit_board.ship_masks[ship_object])) for ship_object in bit_board.ship_masks])
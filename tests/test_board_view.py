@@ -0,0 +1,176 @@
+# Battle Ship // Board View Tests
+# Developed using Python3
+
+__author__ = "Hkaar"
+
+__copyright__ = "Copyright (c) 2021 Hkaar"
+__license__ = "GNU General Public License (GPL) V3"
+
+"""This file is part of Battle Ship.
+
+Battle Ship is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+any later version.
+
+Battle Ship is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Battle Ship.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+__version__ = 0.1
+
+import os
+
+import pytest
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+pytest.importorskip('PySide2')
+
+from PySide2.QtWidgets import QApplication
+from PySide2.QtGui import QMouseEvent
+from PySide2.QtCore import Qt, QEvent, QPoint
+
+from ui.main_widgets import Board_View, Board_Piece
+
+app = QApplication.instance() or QApplication([])
+
+class Click_Piece(Board_Piece):
+    __slots__ = ('clicks',)
+
+    def board_piece_method(self):
+        self.clicks.append(self.position)
+
+class Click_Board(Board_View):
+    def __init__(self, row_amount, column_amount, clicks):
+        super(Click_Board, self).__init__(row_amount, column_amount)
+        self.clicks = clicks
+        self.resize(column_amount*20, row_amount*20)
+
+    def create_piece(self, pos):
+        board_piece = Click_Piece(pos)
+        board_piece.board_view = self
+        board_piece.clicks = self.clicks
+        return board_piece
+
+def click(board_view, point):
+    for event_type in (QEvent.MouseButtonPress, QEvent.MouseButtonRelease):
+        board_view.event(QMouseEvent(event_type, point, Qt.LeftButton, Qt.LeftButton, Qt.NoModifier))
+
+def test_pieces_are_kept_only_while_they_differ():
+    board_view = Click_Board(9, 12, [])
+    board_pieces = board_view.board_pieces
+
+    assert len(board_pieces) == 9*12 and len(list(board_pieces)) == 9*12
+    assert (8, 11) in board_pieces and (9, 0) not in board_pieces and (0, -1) not in board_pieces
+
+    with pytest.raises(KeyError):
+        board_pieces[(9, 0)]
+
+    board_pieces[(2, 3)].setText('X')
+    board_pieces[(4, 5)].setEnabled(False)
+    assert set(board_pieces.stored_pieces) == set([(2, 3), (4, 5)])
+    assert board_pieces[(2, 3)].text() == 'X' and not board_pieces[(4, 5)].isEnabled()
+
+    board_pieces[(2, 3)].setText(' ')
+    board_pieces[(4, 5)].setEnabled(True)
+    assert board_pieces.stored_pieces == {}
+
+def test_cells_and_points_round_trip():
+    board_view = Click_Board(9, 12, [])
+
+    for pos in board_view.board_pieces:
+        cell_rect = board_view.get_cell_rect(pos)
+
+        assert board_view.get_position(cell_rect.center()) == pos
+        assert board_view.get_position(cell_rect.topLeft()) == pos
+
+    assert board_view.get_position(QPoint(-1, 0)) == None
+    assert board_view.get_position(QPoint(board_view.width(), 0)) == None
+
+def test_clicks_reach_enabled_pieces_only():
+    clicks = []
+    board_view = Click_Board(9, 12, clicks)
+
+    click(board_view, board_view.get_cell_rect((3, 4)).center())
+    assert clicks == [(3, 4)]
+
+    board_view.board_pieces[(3, 4)].setEnabled(False)
+    click(board_view, board_view.get_cell_rect((3, 4)).center())
+    assert clicks == [(3, 4)]
+
+    board_view.board_pieces.setEnabled(False)
+    click(board_view, board_view.get_cell_rect((5, 6)).center())
+    assert clicks == [(3, 4)] and not board_view.board_pieces.isEnabled()
+
+    board_view.board_pieces.setEnabled(True)
+    click(board_view, board_view.get_cell_rect((5, 6)).center())
+    assert clicks == [(3, 4), (5, 6)] and not board_view.board_pieces[(3, 4)].isEnabled()
+
+    # A press and release on two cells is no click.
+    for event_type, pos in ((QEvent.MouseButtonPress, (1, 1)), (QEvent.MouseButtonRelease, (1, 2))):
+        board_view.event(QMouseEvent(event_type, board_view.get_cell_rect(pos).center(), Qt.LeftButton, Qt.LeftButton, Qt.NoModifier))
+    assert clicks == [(3, 4), (5, 6)]
+
+def test_paints_without_errors():
+    board_view = Click_Board(9, 12, [])
+    board_view.resize(120, 90)
+    board_view.board_pieces[(1, 1)].setText('#')
+    board_view.board_pieces[(2, 2)].setEnabled(False)
+
+    assert not board_view.grab().isNull()
+
+def test_zoom_keeps_the_anchor_cell():
+    board_view = Click_Board(200, 300, [])
+    board_view.resize(600, 400)
+
+    assert board_view.get_minimap_rect() == None
+
+    anchor = QPoint(450, 100)
+    anchor_pos = board_view.get_position(anchor)
+
+    board_view.set_zoom(8.0, anchor)
+    assert board_view.zoom_level == 8.0 and board_view.get_position(anchor) == anchor_pos
+    assert board_view.get_minimap_rect() != None
+
+    first_y, last_y, first_x, last_x = board_view.get_visible_cells(board_view.rect())
+    assert (first_y, first_x) == board_view.get_position(QPoint(0, 0))
+    assert (last_y, last_x) == board_view.get_position(QPoint(599, 399))
+
+    board_view.set_view(-50.0, 1e9)
+    assert board_view.view_x == 0.0 and board_view.view_y == 400*8.0-400
+
+    board_view.set_zoom(1e9)
+    assert board_view.get_cell_size() == (64.0, 64.0)
+
+    board_view.set_zoom(0.1)
+    assert board_view.zoom_level == 1.0 and (board_view.view_x, board_view.view_y) == (0.0, 0.0)
+
+def test_overview_patches_changed_cells():
+    board_view = Click_Board(37, 45, [])
+    overview_image = board_view.get_overview()
+
+    board_view.board_pieces[(0, 0)].setText('X')
+    board_view.board_pieces[(36, 44)].setText('0')
+    board_view.board_pieces[(10, 20)].setText('#')
+    board_view.board_pieces[(10, 20)].setEnabled(False)
+    board_view.board_pieces[(5, 6)].setEnabled(False)
+
+    # The cached image is patched in place and matches a full rebuild.
+    assert board_view.get_overview() is overview_image
+
+    rebuilt_view = Click_Board(37, 45, [])
+    for pos in board_view.board_pieces.stored_pieces:
+        board_piece = board_view.board_pieces[pos]
+        rebuilt_view.board_pieces[pos].setText(board_piece.text())
+        rebuilt_view.board_pieces[pos].setEnabled(board_piece.isEnabled())
+
+    rebuilt_image = rebuilt_view.get_overview()
+    assert overview_image.pixel(0, 0) != overview_image.pixel(1, 0)
+
+    for pos in board_view.board_pieces:
+        assert overview_image.pixel(pos[1], pos[0]) == rebuilt_image.pixel(pos[1], pos[0])
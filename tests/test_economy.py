@@ -0,0 +1,87 @@
+# Battle Ship // Economy Tests
+# Developed using Python3
+
+__author__ = "Hkaar"
+
+__copyright__ = "Copyright (c) 2021 Hkaar"
+__license__ = "GNU General Public License (GPL) V3"
+
+"""This file is part of Battle Ship.
+
+Battle Ship is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+any later version.
+
+Battle Ship is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Battle Ship.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+__version__ = 0.1
+
+import random
+
+from battleship.abilities import get_move_cost
+from battleship.economy import Ability_Planner
+from tests.test_strategies import Board_Owner, gen_shot_game, get_decoy
+
+def get_planner_moves(player_object, target_object):
+    planner = Ability_Planner()
+    rng_state = player_object.rng.getstate()
+
+    move = planner.get_move(player_object, target_object, 'W')
+    player_object.rng.setstate(rng_state)
+    return move, (planner.base_chance, planner.cell_chances, planner.known_mask, planner.found_mask)
+
+def test_planner_ignores_hidden_ships():
+    for seed in range(0, 6):
+        attack_manager = gen_shot_game(seed)
+        player_object = attack_manager.player_objects[1]
+        target_object = attack_manager.player_objects[2]
+
+        rng = random.Random(seed)
+        cells = list(player_object.attack_piece_positions)
+        rng.shuffle(cells)
+
+        for pos in cells[:40]:
+            attack_manager.exec_attack(pos, 1)
+            attack_manager.exec_scout(rng.choice(cells), 1)
+
+            if 2 not in attack_manager.player_objects:
+                break
+
+            player_object.attack_points = rng.randint(0, 10)
+            player_object.scout_points = rng.randint(0, 10)
+
+            decoy_object = Board_Owner(get_decoy(target_object.bit_board))
+            assert get_planner_moves(player_object, decoy_object) == get_planner_moves(player_object, target_object)
+
+def test_planner_moves_are_affordable():
+    for seed in range(0, 4):
+        attack_manager = gen_shot_game(seed)
+
+        for _ in range(0, 60):
+            player_id = attack_manager.current_active_turn
+            player_object = attack_manager.player_objects[player_id]
+            target_object = attack_manager.player_objects[attack_manager.player_targets[player_id]]
+
+            available_ships = [ship_object.__class__.__name__ for ship_object in player_object.bit_board.get_available_ships()]
+            move = player_object.ability_planner.get_move(player_object, target_object, 'W')
+
+            if move != None:
+                ship_key, mode, positions = move
+                points = player_object.attack_points if mode == 'A' else player_object.scout_points
+
+                assert ship_key == None or ship_key in available_ships
+                assert get_move_cost(ship_key, mode) <= points and len(positions) > 0
+
+            attack_manager.exec_ai_turn(player_id)
+            assert player_object.attack_points >= 0 and player_object.scout_points >= 0
+
+            if attack_manager.next_ai_player() == None:
+                break
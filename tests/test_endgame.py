@@ -0,0 +1,124 @@
+# Battle Ship // Endgame Tests
+# Developed using Python3
+
+__author__ = "Hkaar"
+
+__copyright__ = "Copyright (c) 2021 Hkaar"
+__license__ = "GNU General Public License (GPL) V3"
+
+"""This file is part of Battle Ship.
+
+Battle Ship is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+any later version.
+
+Battle Ship is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Battle Ship.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+__version__ = 0.1
+
+import itertools
+import random
+
+from battleship.endgame import Endgame_Solver
+
+def count_fleets(board_size, knowledge):
+    open_hits, misses, spotted, sunk_mask, remaining_sizes = knowledge
+    solver = Endgame_Solver(board_size)
+
+    stored_fleets = set([])
+    cell_counts = {}
+
+    for fleet_masks in itertools.product(*[solver.get_placements(ship_size) for ship_size in remaining_sizes]):
+        fleet_cells = 0
+
+        for ship_mask in fleet_masks:
+            if ship_mask & fleet_cells:
+                break
+            fleet_cells |= ship_mask
+        else:
+            if fleet_cells & (misses | sunk_mask) or (open_hits | spotted) & ~fleet_cells:
+                continue
+
+            # A ship lying on hit cells only would have been reported sunk.
+            if any([not ship_mask & ~open_hits for ship_mask in fleet_masks]):
+                continue
+
+            fleet_key = tuple(sorted(fleet_masks))
+            if fleet_key in stored_fleets:
+                continue
+            stored_fleets.add(fleet_key)
+
+            for cell in range(0, board_size[0]*board_size[1]):
+                if fleet_cells >> cell & 1:
+                    cell_counts[cell] = cell_counts.get(cell, 0)+1
+    return len(stored_fleets), cell_counts
+
+def gen_knowledge(board_size, ship_sizes, rng):
+    cell_amount = board_size[0]*board_size[1]
+    solver = Endgame_Solver(board_size)
+
+    fleet_masks = []
+    fleet_cells = 0
+
+    for ship_size in ship_sizes:
+        placements = [ship_mask for ship_mask in solver.get_placements(ship_size) if not ship_mask & fleet_cells]
+
+        if len(placements) == 0:
+            return None
+
+        fleet_masks.append(rng.choice(placements))
+        fleet_cells |= fleet_masks[-1]
+
+    hits = 0
+    misses = 0
+    spotted = 0
+
+    for cell in rng.sample(range(0, cell_amount), rng.randint(0, cell_amount//2)):
+        if fleet_cells >> cell & 1:
+            hits |= 1 << cell
+        else:
+            misses |= 1 << cell
+
+    for cell in rng.sample(range(0, cell_amount), 2):
+        if fleet_cells >> cell & 1 and not hits >> cell & 1:
+            spotted |= 1 << cell
+
+    sunk_mask = 0
+    remaining_sizes = []
+
+    for ship_size, ship_mask in zip(ship_sizes, fleet_masks):
+        if ship_mask & ~hits:
+            remaining_sizes.append(ship_size)
+        else:
+            sunk_mask |= ship_mask
+
+    if len(remaining_sizes) == 0:
+        return None
+    return (hits & ~sunk_mask, misses, spotted, sunk_mask, tuple(sorted(remaining_sizes, reverse=True)))
+
+def test_solver_matches_brute_force():
+    rng = random.Random(3)
+    checked_amount = 0
+
+    while checked_amount < 60:
+        board_size = (rng.randint(3, 5), rng.randint(3, 5))
+        ship_sizes = tuple(sorted([rng.choice((2, 3, 3, 4)) for _ in range(0, rng.randint(1, 3))], reverse=True))
+        knowledge = gen_knowledge(board_size, ship_sizes, rng)
+
+        if knowledge == None:
+            continue
+
+        solution = Endgame_Solver(board_size, max_nodes=10**7).solve(knowledge)
+        fleet_amount, cell_counts = count_fleets(board_size, knowledge)
+
+        assert solution.total == fleet_amount
+        assert solution.cell_counts == cell_counts
+        checked_amount += 1
@@ -0,0 +1,116 @@
+# Battle Ship // Event Tests
+# Developed using Python3
+
+__author__ = "Hkaar"
+
+__copyright__ = "Copyright (c) 2021 Hkaar"
+__license__ = "GNU General Public License (GPL) V3"
+
+"""This file is part of Battle Ship.
+
+Battle Ship is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+any later version.
+
+Battle Ship is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Battle Ship.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+__version__ = 0.1
+
+import random
+
+from battleship.bitboard import Bit_Board
+from battleship.events import Event_Attack, Event_Scout, Event_Scheduler, EVENT_STEPS
+
+def advance_events(events, board_size, bit_board, calls):
+    # Walks every event cell by cell on the board as it was before the pass.
+    rows, columns = board_size
+    open_ships = bit_board.ships & ~bit_board.hits
+    hit_cells = set([])
+    active_events = []
+
+    for event in events:
+        y, x = event[0]
+        step_y, step_x = EVENT_STEPS[event[2]]
+        active = True
+
+        for _ in range(0, event[1]):
+            y += step_y
+            x += step_x
+
+            if not (0 <= y < rows and 0 <= x < columns):
+                active = False
+                break
+
+            calls.append((event[3], (y, x)))
+
+            if event[3] == 'A':
+                if open_ships >> (y*columns+x) & 1 or y*columns+x in hit_cells:
+                    hit_cells.add(y*columns+x)
+                    active = False
+                    break
+
+            event[0] = (y, x)
+
+        if active:
+            active_events.append(event)
+
+    for mode, pos in calls:
+        bit = bit_board.get_bit(pos)
+        bit_board.attack(bit) if mode == 'A' else bit_board.scout(bit)
+    return active_events
+
+def test_scheduler_matches_cell_walk():
+    rng = random.Random(10)
+
+    for _ in range(0, 60):
+        board_size = (rng.randint(4, 14), rng.randint(4, 14))
+        rows, columns = board_size
+        ship_positions = {(rng.randrange(rows), rng.randrange(columns)): 'ship' for _ in range(0, rows*columns//4)}
+
+        bit_board = Bit_Board(board_size)
+        bit_board.load_ship_positions(ship_positions)
+        reference_board = Bit_Board(board_size)
+        reference_board.load_ship_positions(ship_positions)
+
+        for pos in rng.sample(list(ship_positions), len(ship_positions)//3):
+            bit_board.attack(bit_board.get_bit(pos))
+            reference_board.attack(reference_board.get_bit(pos))
+
+        scheduler = Event_Scheduler()
+        reference_events = []
+
+        for _ in range(0, rng.randint(1, 10)):
+            event_class = rng.choice((Event_Attack, Event_Scout))
+            event = event_class((rng.randrange(rows), rng.randrange(columns)), rng.randint(1, 3), rng.choice(tuple(EVENT_STEPS)))
+            scheduler.add_event(event)
+            reference_events.append([scheduler.get_start_position(event, board_size), event.move_count, event.orientation, event.mode])
+
+        while len(scheduler) > 0:
+            calls = []
+            scheduler.advance(board_size, bit_board, lambda pos: calls.append(('A', pos)) or bit_board.attack(bit_board.get_bit(pos)),
+                lambda pos: calls.append(('S', pos)) or bit_board.scout(bit_board.get_bit(pos)))
+
+            reference_calls = []
+            reference_events = advance_events(reference_events, board_size, reference_board, reference_calls)
+
+            assert calls == reference_calls
+            assert [event.last_position for event in scheduler] == [event[0] for event in reference_events]
+            assert bit_board.get_hit_masks() == reference_board.get_hit_masks()
+
+def test_clear_during_advance_drops_events():
+    bit_board = Bit_Board((7, 7))
+    scheduler = Event_Scheduler()
+
+    for orientation in EVENT_STEPS:
+        scheduler.add_event(Event_Scout((3, 3), 1, orientation))
+
+    scheduler.advance((7, 7), bit_board, None, lambda pos: scheduler.clear())
+    assert len(scheduler) == 0
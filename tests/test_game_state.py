@@ -0,0 +1,159 @@
+# Battle Ship // Game State Tests
+# Developed using Python3
+
+__author__ = "Hkaar"
+
+__copyright__ = "Copyright (c) 2021 Hkaar"
+__license__ = "GNU General Public License (GPL) V3"
+
+"""This file is part of Battle Ship.
+
+Battle Ship is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+any later version.
+
+Battle Ship is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Battle Ship.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+__version__ = 0.1
+
+import random
+
+from battleship.main_game import Attack_Manager, AI_Player
+from battleship.game_state import get_game_state, apply, END_TURN, POINT_INCOME
+from battleship.abilities import get_ability, get_move_cost
+from battleship.events import Event_Attack, Event_Scout
+
+def check_boards(attack_manager, state):
+    assert attack_manager.player_targets == state.targets
+
+    for player_id in attack_manager.player_objects:
+        player_object = attack_manager.player_objects[player_id]
+        board = state.boards[player_id]
+        bit_board = player_object.bit_board
+
+        events = tuple([(event.mode, event.position, event.move_count, event.orientation, event.last_position)
+            for event in player_object.stored_events])
+
+        assert (bit_board.hits, bit_board.misses, bit_board.spotted) == (board.hits, board.misses, board.spotted)
+        assert (player_object.attack_points, player_object.scout_points) == (board.attack_points, board.scout_points)
+        assert events == board.events
+
+def gen_move(state, board_size, enable_abilities, rng):
+    ship_key = None
+    mode = 'A'
+
+    if enable_abilities:
+        ship_key = rng.choice(state.boards[state.current_turn].get_available_ships()+(None,))
+        mode = rng.choice('AS')
+
+    positions = ((rng.randrange(board_size[0]), rng.randrange(board_size[1])),)
+
+    if ship_key != None and get_ability(ship_key, mode).kind == 'select':
+        selected = set([])
+
+        while len(selected) < get_ability(ship_key, mode).count+1:
+            selected.add((rng.randrange(board_size[0]), rng.randrange(board_size[1])))
+        positions = tuple(selected)
+    return (ship_key, mode, positions, rng.choice('NWSE'))
+
+def exec_move(attack_manager, move, board_size, footprint_seed):
+    ship_key, mode, positions, orientation = move
+    player_id = attack_manager.current_active_turn
+    player_object = attack_manager.player_objects[player_id]
+
+    if attack_manager.enable_abilities:
+        if mode == 'A':
+            player_object.attack_points -= get_move_cost(ship_key, mode)
+        else:
+            player_object.scout_points -= get_move_cost(ship_key, mode)
+
+    exec_many = attack_manager.exec_attack_many if mode == 'A' else attack_manager.exec_scout_many
+
+    if ship_key == None:
+        exec_many(positions[:1], player_id)
+        return None
+
+    ability = get_ability(ship_key, mode)
+
+    if ability.kind == 'select':
+        exec_many(positions, player_id)
+    elif ability.kind == 'event':
+        event_type = Event_Attack if mode == 'A' else Event_Scout
+        player_object.add_event(event_type(positions[0], ability.move_count, orientation))
+    else:
+        exec_many(ability.get_footprint(positions[0], board_size, random.Random(footprint_seed)), player_id)
+
+def play_game(seed):
+    rng = random.Random(seed)
+    player_amount = rng.choice((2, 3, 4))
+    board_size = rng.choice(((7, 7), (9, 8), (10, 10)))
+    enable_abilities = seed % 4 != 0
+
+    player_objects = [AI_Player(1, 1, board_size, rng=random.Random(seed*10+index)) for index in range(0, player_amount)]
+    attack_manager = Attack_Manager(player_amount, player_objects, enable_abilities=enable_abilities)
+    attack_manager.load_boards()
+
+    state = get_game_state(attack_manager)
+    check_boards(attack_manager, state)
+
+    for _ in range(0, 300):
+        for _ in range(0, rng.randrange(1, 3)):
+            if state.is_over():
+                break
+
+            move = gen_move(state, board_size, enable_abilities, rng)
+            footprint_seed = rng.random()
+
+            try:
+                new_state, _ = apply(state, move, random.Random(footprint_seed))
+            except ValueError:
+                continue
+
+            exec_move(attack_manager, move, board_size, footprint_seed)
+            state = new_state
+            check_boards(attack_manager, state)
+
+        if state.is_over():
+            break
+
+        state, _ = apply(state, END_TURN)
+        attack_manager.current_active_turn = attack_manager.get_next_player()
+
+        if enable_abilities:
+            player_object = attack_manager.player_objects[attack_manager.current_active_turn]
+            player_object.attack_points += POINT_INCOME
+            player_object.scout_points += POINT_INCOME
+
+            attack_manager.exec_events(attack_manager.current_active_turn)
+
+        assert state.current_turn == attack_manager.current_active_turn
+        check_boards(attack_manager, state)
+    return state
+
+def test_apply_matches_attack_manager():
+    for seed in range(0, 40):
+        play_game(seed)
+
+def test_apply_keeps_state():
+    player_objects = [AI_Player(1, 1, (7, 7), rng=random.Random(index)) for index in range(0, 2)]
+    attack_manager = Attack_Manager(2, player_objects, enable_abilities=True)
+    attack_manager.load_boards()
+
+    state = get_game_state(attack_manager)
+    state_hash = state.get_hash()
+    target_board = state.boards[state.get_target(state.current_turn)]
+
+    for y in range(0, 7):
+        new_state, _ = apply(state, (None, 'A', ((y, y),)))
+
+        assert new_state.get_hash() != state_hash
+        assert state.get_hash() == state_hash and state.boards[state.get_target(state.current_turn)] is target_board
+        assert target_board.hits == 0 and target_board.misses == 0
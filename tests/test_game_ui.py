@@ -0,0 +1,138 @@
+# Battle Ship // Turn Runner Tests
+# Developed using Python3
+
+__author__ = "Hkaar"
+
+__copyright__ = "Copyright (c) 2021 Hkaar"
+__license__ = "GNU General Public License (GPL) V3"
+
+"""This file is part of Battle Ship.
+
+Battle Ship is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+any later version.
+
+Battle Ship is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Battle Ship.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+__version__ = 0.1
+
+import logging
+import os
+
+import pytest
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+pytest.importorskip('PySide2')
+
+from PySide2.QtWidgets import QApplication
+
+from battleship.main_game import Attack_Manager, AI_Player
+from ui.game_ui import AI_Turn_Runner, AI_Turn_Job, AI_Ponder_Job, Game_Manager
+
+app = QApplication.instance() or QApplication([])
+
+class Failing_AI_Player(AI_Player):
+    def __init__(self, fail_amount, *args, **kwargs):
+        super(Failing_AI_Player, self).__init__(*args, **kwargs)
+        self.fail_amount = fail_amount
+        self.plan_amount = 0
+
+    def plan_turn(self, target_piece_positions, attack_manager, time_budget=None):
+        self.plan_amount += 1
+
+        if self.fail_amount > 0:
+            self.fail_amount -= 1
+            raise ValueError('Broken plan!')
+        return super(Failing_AI_Player, self).plan_turn(target_piece_positions, attack_manager, time_budget)
+
+class Stepped_Turn_Runner(AI_Turn_Runner):
+    def __init__(self, *args, **kwargs):
+        super(Stepped_Turn_Runner, self).__init__(*args, **kwargs)
+        self.next_jobs = []
+
+    def next_player(self, job_id):
+        self.next_jobs.append(job_id)
+
+def gen_runner_game(fail_amount):
+    turn_runner = Stepped_Turn_Runner(0.01)
+    player_objects = [Failing_AI_Player(fail_amount, 1, 1, (7, 7)), AI_Player(1, 1, (7, 7))]
+
+    attack_manager = Attack_Manager(2, player_objects, turn_runner=turn_runner)
+    attack_manager.load_boards()
+
+    turn_runner.attack_manager = attack_manager
+    turn_runner.current_player = 1
+    turn_runner.current_job = 1
+    return turn_runner, attack_manager
+
+def gen_turn_job(turn_runner, attack_manager):
+    target_object = attack_manager.player_objects[2]
+    return AI_Turn_Job(turn_runner, 1, attack_manager.player_objects[1], target_object.attack_piece_positions, attack_manager)
+
+def test_failed_turn_is_logged_and_replayed(caplog):
+    turn_runner, attack_manager = gen_runner_game(1)
+    failures = []
+    turn_runner.plan_failed.connect(lambda job_id, error: failures.append((job_id, str(error))))
+
+    with caplog.at_level(logging.ERROR, logger='ui.game_ui'):
+        gen_turn_job(turn_runner, attack_manager).run()
+
+    assert failures == [(1, 'Broken plan!')]
+    assert 'Planning the AI turn failed' in caplog.text
+
+    # The turn was planned again on the GUI thread and played.
+    assert attack_manager.player_objects[1].plan_amount == 2
+    assert any(attack_manager.player_objects[2].bit_board.get_hit_masks())
+    assert turn_runner.next_jobs == [1]
+
+def test_cancelled_jobs_stop_quietly(caplog):
+    turn_runner, attack_manager = gen_runner_game(1)
+    player_object = attack_manager.player_objects[1]
+
+    turn_job = gen_turn_job(turn_runner, attack_manager)
+    ponder_job = AI_Ponder_Job(turn_runner, player_object, player_object.get_ponder_game(attack_manager))
+
+    results = []
+    turn_runner.planned.connect(lambda *args: results.append(args))
+    turn_runner.plan_failed.connect(lambda *args: results.append(args))
+    turn_runner.ponder_failed.connect(lambda *args: results.append(args))
+
+    turn_runner.cancel()
+
+    with caplog.at_level(logging.ERROR, logger='ui.game_ui'):
+        turn_job.run()
+        ponder_job.run()
+
+    assert results == [] and caplog.text == ''
+    assert player_object.plan_amount == 0
+
+def test_failed_ponder_is_logged_and_dropped(caplog):
+    turn_runner, attack_manager = gen_runner_game(1)
+    player_object = attack_manager.player_objects[1]
+    player_object.pondered_turn = ('stale', None, None, None, None, None)
+
+    ponder_job = AI_Ponder_Job(turn_runner, player_object, player_object.get_ponder_game(attack_manager))
+
+    with caplog.at_level(logging.ERROR, logger='ui.game_ui'):
+        ponder_job.run()
+
+    assert 'Pondering the AI turn failed' in caplog.text
+    assert player_object.pondered_turn == None
+
+def test_game_manager_rejects_bad_player_amounts():
+    game_manager = Game_Manager()
+
+    for player_amount, ai_player_amount, message in ((0, 2, 'human player'), (1, -1, '0 to 256 AI players'),
+            (1, 257, '0 to 256 AI players'), (1, 0, 'at least 2 players')):
+        with pytest.raises(ValueError, match=message):
+            game_manager.create(player_amount, ai_player_amount)
+
+    assert game_manager.player_objects == {}
@@ -0,0 +1,233 @@
+# Battle Ship // Main Game Tests
+# Developed using Python3
+
+__author__ = "Hkaar"
+
+__copyright__ = "Copyright (c) 2021 Hkaar"
+__license__ = "GNU General Public License (GPL) V3"
+
+"""This file is part of Battle Ship.
+
+Battle Ship is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+any later version.
+
+Battle Ship is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Battle Ship.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+__version__ = 0.1
+
+import random
+
+from battleship.main_game import Attack_Manager, AI_Player, Player
+from battleship.bitboard import count_bits
+from battleship.benchmark import Bench_Piece, gen_game
+from battleship.strategies import Density_Strategy
+
+def test_updates_are_pushed_only_on_changes():
+    attack_manager = gen_game((7, 7), True, True)
+    player_object = attack_manager.player_objects[1]
+
+    turn_updates = []
+    point_updates = []
+    attack_manager.add_update_method(lambda: turn_updates.append(attack_manager.current_active_turn))
+    player_object.add_update_method(lambda: point_updates.append((player_object.attack_points, player_object.scout_points)))
+
+    attack_manager.current_active_turn = 1
+    player_object.attack_points = 1
+    player_object.scout_points = 1
+    assert turn_updates == [] and point_updates == []
+
+    player_object.attack_points += 3
+    player_object.scout_points += 2
+    assert point_updates == [(4, 1), (4, 3)]
+
+    # The AI turn and the income of the human player are pushed, without
+    # anybody asking for them.
+    del point_updates[:]
+    attack_manager.next_turn(1)
+
+    assert turn_updates == [2, 1]
+    assert point_updates == [(7, 3), (7, 6)]
+
+class Count_Piece(Bench_Piece):
+    def __init__(self, changes):
+        super(Count_Piece, self).__init__()
+        self.changes = changes
+
+    def setText(self, piece_text):
+        if piece_text != self.piece_text:
+            self.changes.append(piece_text)
+        super(Count_Piece, self).setText(piece_text)
+
+def get_shown_board(bit_board):
+    hit_positions = bit_board.get_hit_positions()
+    piece_texts = {0: '0', 1: 'X', 2: '#'}
+    return {pos: (piece_texts[hit_positions[pos]], hit_positions[pos] != 1) for pos in hit_positions}
+
+def test_next_target_repaints_changed_cells_only():
+    for seed in range(0, 5):
+        rng = random.Random(seed)
+        player_objects = [AI_Player(1, 1, (8, 8), rng=random.Random(seed*10+index)) for index in range(0, 3)]
+
+        changes = []
+        human = Player(1, 1, {**player_objects[0].ship_positions})
+        human.board_size = (8, 8)
+        human.attack_piece_positions = {pos: Count_Piece(changes) for pos in player_objects[0].attack_piece_positions}
+
+        attack_manager = Attack_Manager(3, [human]+player_objects[1:], enable_abilities=True)
+        attack_manager.load_boards()
+
+        cells = list(human.attack_piece_positions)
+        for pos in rng.sample(cells, 30):
+            attack_manager.exec_attack(pos, 2)
+            attack_manager.exec_scout(rng.choice(cells), 2)
+
+        # The human sinks player 2 and gets its target, player 3.
+        old_target = attack_manager.player_objects[2]
+        shots = rng.sample(cells, 10)+list(old_target.ship_positions)
+
+        for pos in shots[:-1]:
+            attack_manager.exec_attack(pos, 1)
+
+        old_board = get_shown_board(old_target.bit_board)
+        del changes[:]
+
+        attack_manager.exec_attack(shots[-1], 1)
+        assert 2 not in attack_manager.player_objects and attack_manager.player_targets[1] == 3
+
+        new_board = get_shown_board(attack_manager.player_objects[3].bit_board)
+        shown_board = {pos: (human.attack_piece_positions[pos].text(), human.attack_piece_positions[pos].enabled) for pos in cells}
+
+        # The last shot and the cells the two boards show differently are all
+        # that is drawn again.
+        assert shown_board == {pos: new_board.get(pos, (' ', True)) for pos in cells}
+        assert len(changes) <= 1+len([pos for pos in cells if old_board.get(pos) != new_board.get(pos)])
+
+def test_every_sunk_ship_is_reported_once():
+    for seed in range(0, 5):
+        random.seed(seed)
+        attack_manager = gen_game((8, 8), True, True)
+        target = attack_manager.player_objects[2]
+
+        sunk_reports = []
+        attack_manager.add_sunk_method(lambda player_id, ship_object: sunk_reports.append((player_id, ship_object)))
+
+        cells = list(attack_manager.player_objects[1].attack_piece_positions)
+        random.shuffle(cells)
+        last_hits = {}
+
+        for pos in cells:
+            if 2 not in attack_manager.player_objects:
+                break
+
+            ship_object = target.bit_board.get_ship_at(target.bit_board.get_bit(pos))
+            if ship_object != None:
+                last_hits[ship_object] = pos
+
+            if len(sunk_reports) % 2:
+                attack_manager.exec_attack_many([pos, pos], 1)
+            else:
+                attack_manager.exec_attack(pos, 1)
+
+        get_key = lambda sunk_report: id(sunk_report[1])
+        assert sorted(sunk_reports, key=get_key) == sorted([(2, ship_object) for ship_object in target.bit_board.ship_masks], key=get_key)
+        assert target.bit_board.sunk_hits == {target.bit_board.get_bit(last_hits[ship_object]).bit_length()-1:
+            (ship_object, count_bits(target.bit_board.ship_masks[ship_object])) for ship_object in last_hits}
+
+def gen_ring_game(seed, board_size, player_amount):
+    random.seed(seed)
+    player_objects = [AI_Player(1, 1, board_size) for _ in range(0, player_amount)]
+
+    human = Player(1, 1, {**player_objects[0].ship_positions})
+    human.board_size = board_size
+    human.attack_piece_positions = {pos: Bench_Piece() for pos in player_objects[0].attack_piece_positions}
+    player_objects[0] = human
+
+    attack_manager = Attack_Manager(player_amount, player_objects, enable_abilities=True)
+    attack_manager.load_boards()
+    return attack_manager
+
+def get_game_boards(attack_manager):
+    return {player_id: attack_manager.player_objects[player_id].bit_board.get_hit_masks() for player_id in attack_manager.player_objects}
+
+def test_batched_shots_match_single_shots():
+    spilled_seeds = []
+
+    for seed in range(0, 6):
+        games = [gen_ring_game(seed, (7, 7), 3) for _ in range(0, 2)]
+
+        rng = random.Random(seed)
+        cells = list(games[0].player_objects[1].attack_piece_positions)
+        spilled = False
+
+        while len(games[0].player_objects) > 1:
+            mode = rng.choice(('A', 'A', 'S'))
+            positions = [rng.choice(cells) for _ in range(0, rng.randint(1, 12))]+[(-1, 0)]
+            target_id = games[0].player_targets[1]
+            sunk_amount = len(games[0].sunk_ships)
+            before_boards = get_game_boards(games[0])
+
+            summary = games[0].exec_attack_many(positions, 1) if mode == 'A' else games[0].exec_scout_many(positions, 1)
+
+            for pos in positions:
+                games[1].exec_attack(pos, 1) if mode == 'A' else games[1].exec_scout(pos, 1)
+
+            assert get_game_boards(games[0]) == get_game_boards(games[1])
+            assert games[0].player_targets == games[1].player_targets
+
+            if len(games[0].player_objects) > 1:
+                assert len(summary['hits'])+len(summary['misses'])+len(summary['spotted']) == len(positions)-1
+
+            # The rest of the footprint landed on the next target.
+            next_id = games[0].player_targets.get(1)
+            if target_id not in games[0].player_objects and next_id in games[0].player_objects:
+                spilled = spilled or get_game_boards(games[0])[next_id] != before_boards[next_id]
+
+            assert summary['sunk'] == [ship_object for _, ship_object in games[0].sunk_ships[sunk_amount:]]
+            assert len(games[0].sunk_ships) == len(games[1].sunk_ships)
+
+        spilled_seeds.append(spilled)
+        pieces = [games[index].player_objects[1].attack_piece_positions for index in range(0, 2)]
+        assert [(pieces[0][pos].text(), pieces[0][pos].enabled) for pos in cells] == [(pieces[1][pos].text(), pieces[1][pos].enabled) for pos in cells]
+
+    assert any(spilled_seeds)
+
+def gen_ponder_game(seed):
+    attack_manager = gen_ring_game(seed, (8, 8), 3)
+    player_object = attack_manager.player_objects[2]
+
+    player_object.rng = random.Random(seed)
+    player_object.strategy = Density_Strategy(random.Random(seed+1))
+    return attack_manager, player_object
+
+def test_ponder_plans_from_its_snapshot():
+    for seed in range(0, 4):
+        attack_manager, player_object = gen_ponder_game(seed)
+        ponder_game = player_object.get_ponder_game(attack_manager)
+        target_board = ponder_game.player_objects[3].bit_board
+
+        assert target_board is not attack_manager.player_objects[3].bit_board
+        assert ponder_game.player_object is not player_object
+
+        # The game goes on while the ponder thinks, none of it reaches the
+        # snapshot.
+        for pos in attack_manager.player_objects[3].attack_piece_positions[::3]:
+            attack_manager.player_objects[3].bit_board.attack(attack_manager.player_objects[3].bit_board.get_bit(pos))
+        attack_manager.player_targets[2] = 1
+        player_object.attack_points += 5
+
+        player_object.ponder_turn(ponder_game)
+        assert target_board.get_hit_masks() == (0, 0, 0)
+
+        fresh_manager, fresh_player = gen_ponder_game(seed)
+        fresh_player.ponder_turn(fresh_player.get_ponder_game(fresh_manager))
+        assert player_object.pondered_turn[0][2:] == fresh_player.pondered_turn[0][2:]
+        assert player_object.pondered_turn[1:3] == fresh_player.pondered_turn[1:3]
@@ -0,0 +1,96 @@
+# Battle Ship // Placement Tests
+# Developed using Python3
+
+__author__ = "Hkaar"
+
+__copyright__ = "Copyright (c) 2021 Hkaar"
+__license__ = "GNU General Public License (GPL) V3"
+
+"""This file is part of Battle Ship.
+
+Battle Ship is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+any later version.
+
+Battle Ship is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Battle Ship.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+__version__ = 0.1
+
+import random
+
+from battleship.bitboard import count_bits, iter_bits
+from battleship.placement import Fleet_Placement, select_bit
+
+def get_all_placements(board_size, ship_size, blocked_mask=0):
+    rows, columns = board_size
+    placements = set()
+
+    for y in range(0, rows):
+        for x in range(0, columns):
+            for step_y, step_x in ((0, 1), (1, 0)):
+                cells = [(y+step_y*size_num, x+step_x*size_num) for size_num in range(0, ship_size)]
+
+                if all([cell_y < rows and cell_x < columns for cell_y, cell_x in cells]):
+                    ship_mask = sum([1 << (cell_y*columns+cell_x) for cell_y, cell_x in cells])
+
+                    if not ship_mask & blocked_mask:
+                        placements.add(ship_mask)
+    return placements
+
+def test_select_bit_finds_every_rank():
+    rng = random.Random(4)
+
+    for _ in range(0, 200):
+        mask = rng.getrandbits(rng.randint(1, 300))
+
+        for bit_rank, index in enumerate(iter_bits(mask)):
+            assert select_bit(mask, bit_rank) == index
+
+def test_sample_placement_is_uniform():
+    rng = random.Random(5)
+    board_size = (4, 5)
+    placements = get_all_placements(board_size, 3)
+
+    fleet_placement = Fleet_Placement(board_size, (3,), rng)
+    sample_amount = 300*len(placements)
+    counts = {}
+
+    for _ in range(0, sample_amount):
+        ship_mask = fleet_placement.sample_placement(3, fleet_placement.start_masks)
+        counts[ship_mask] = counts.get(ship_mask, 0)+1
+
+    assert set(counts) == placements
+    assert all([abs(counts[ship_mask]-300) < 75 for ship_mask in counts])
+
+def test_fleets_are_valid_and_avoid_blocked_cells():
+    rng = random.Random(6)
+
+    for _ in range(0, 100):
+        board_size = (rng.randint(5, 12), rng.randint(5, 12))
+        fleet_placement = Fleet_Placement(board_size, rng=rng)
+        blocked_mask = rng.getrandbits(board_size[0]*board_size[1]) & rng.getrandbits(board_size[0]*board_size[1]) & rng.getrandbits(board_size[0]*board_size[1])
+
+        fleet_masks = fleet_placement.gen_fleet_masks(blocked_mask, max_restarts=1000)
+        assert fleet_masks != None
+
+        taken_mask = blocked_mask
+
+        for ship_size, ship_mask in zip(fleet_placement.ship_sizes, fleet_masks):
+            assert count_bits(ship_mask) == ship_size
+            assert ship_mask in get_all_placements(board_size, ship_size)
+            assert not ship_mask & taken_mask
+            taken_mask |= ship_mask
+
+def test_full_board_gives_up():
+    fleet_placement = Fleet_Placement((7, 7), rng=random.Random(7))
+
+    assert fleet_placement.gen_fleet_masks((1 << 49)-1, max_restarts=3) == None
+    assert fleet_placement.sample_placement(5, {5: (0, 0)}) == None
@@ -0,0 +1,87 @@
+# Battle Ship // Replay Tests
+# Developed using Python3
+
+__author__ = "Hkaar"
+
+__copyright__ = "Copyright (c) 2021 Hkaar"
+__license__ = "GNU General Public License (GPL) V3"
+
+"""This file is part of Battle Ship.
+
+Battle Ship is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+any later version.
+
+Battle Ship is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Battle Ship.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+__version__ = 0.1
+
+import io
+import random
+
+from battleship.main_game import Attack_Manager, AI_Player
+from battleship.replay import Replay_Recorder, Replay_Reader
+
+def get_boards(player_objects):
+    boards = {}
+
+    for player_id in player_objects:
+        player_object = player_objects[player_id]
+        bit_board = player_object.bit_board
+
+        ship_masks = {ship_object.__class__.__name__: bit_board.ship_masks[ship_object] for ship_object in bit_board.ship_masks}
+        boards[player_id] = (ship_masks, bit_board.hits, bit_board.misses, bit_board.spotted,
+            (player_object.attack_points, player_object.scout_points))
+    return boards
+
+def record_game(seed, player_amount, enable_abilities, replay_file):
+    player_objects = [AI_Player(1, 1, (8, 8), rng=random.Random(seed*10+index)) for index in range(0, player_amount)]
+    replay_recorder = Replay_Recorder(replay_file, seed, keyframe_interval=5, enable_abilities=enable_abilities)
+
+    attack_manager = Attack_Manager(player_amount, player_objects, enable_abilities=enable_abilities, replay_recorder=replay_recorder)
+    attack_manager.load_boards()
+
+    all_players = {**attack_manager.player_objects}
+    recorded_boards = [get_boards(all_players)]
+
+    player_id = attack_manager.current_active_turn
+
+    while player_id != None:
+        attack_manager.exec_ai_turn(player_id)
+        recorded_boards.append(get_boards(all_players))
+
+        player_id = attack_manager.next_ai_player()
+
+    replay_recorder.close()
+    return recorded_boards
+
+def test_seek_reproduces_recorded_boards():
+    for seed, player_amount, enable_abilities in ((1, 2, False), (2, 3, True), (3, 4, True)):
+        replay_file = io.BytesIO()
+        recorded_boards = record_game(seed, player_amount, enable_abilities, replay_file)
+
+        replay_reader = Replay_Reader(replay_file.getvalue())
+        assert replay_reader.last_turn == len(recorded_boards)-1
+
+        rng = random.Random(seed)
+        turns = [0, replay_reader.last_turn]+[rng.randrange(0, replay_reader.last_turn+1) for _ in range(0, 20)]
+
+        for turn in turns:
+            state = replay_reader.seek(turn)
+            assert state.turn == turn
+
+            for player_id in state.bit_boards:
+                bit_board = state.bit_boards[player_id]
+                ship_masks, hits, misses, spotted, points = recorded_boards[turn][player_id]
+
+                assert bit_board.ship_masks == ship_masks
+                assert (bit_board.hits, bit_board.misses, bit_board.spotted) == (hits, misses, spotted)
+                assert state.points[player_id] == points
@@ -0,0 +1,66 @@
+# Battle Ship // Search Tests
+# Developed using Python3
+
+__author__ = "Hkaar"
+
+__copyright__ = "Copyright (c) 2021 Hkaar"
+__license__ = "GNU General Public License (GPL) V3"
+
+"""This file is part of Battle Ship.
+
+Battle Ship is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+any later version.
+
+Battle Ship is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Battle Ship.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+__version__ = 0.1
+
+import random
+
+from battleship.main_game import Attack_Manager, AI_Player
+from battleship.strategies import MCTS_Strategy
+from battleship.game_state import POINT_INCOME
+from battleship.bitboard import count_bits
+from battleship.search import get_root_state, get_search_state, play_turn
+
+def test_next_root_matches_searched_state():
+    for enable_abilities in (False, True):
+        # Player 1 attacks player 2 and is attacked by player 3.
+        player_objects = [AI_Player(1, 1, (10, 10), rng=random.Random(index)) for index in range(0, 3)]
+        attack_manager = Attack_Manager(3, player_objects, enable_abilities=enable_abilities)
+        attack_manager.load_boards()
+
+        strategy = MCTS_Strategy(random.Random(0), worker_amount=1)
+        player_object = attack_manager.player_objects[1]
+        target_object = attack_manager.player_objects[2]
+
+        for y in range(0, 5):
+            snapshot = strategy.get_snapshot(player_object, target_object, enable_abilities)
+
+            # The search is given the real fleet of the target, sorted by size
+            # like the fleets it draws.
+            target_masks = target_object.bit_board.ship_masks.values()
+            fleet_masks = sorted([ship_mask for ship_mask in target_masks if ship_mask & ~target_object.bit_board.hits], key=count_bits)
+            search_state = get_search_state(get_root_state(snapshot), snapshot, tuple(fleet_masks))
+            searched_state, _ = play_turn(search_state, (None, 'A', ((y, y),)), random.Random(0))
+
+            # The real turn, the other players shoot at the player meanwhile.
+            attack_manager.exec_attack((y, y), 1)
+            attack_manager.exec_attack((y, 9-y), 2)
+            attack_manager.exec_attack((9-y, y), 3)
+
+            if enable_abilities:
+                player_object.attack_points += POINT_INCOME-1
+                player_object.scout_points += POINT_INCOME
+
+            next_state = get_root_state(strategy.get_snapshot(player_object, target_object, enable_abilities))
+            assert searched_state.get_hash() == next_state.get_hash()
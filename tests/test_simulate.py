@@ -0,0 +1,68 @@
+# Battle Ship // Simulation Tests
+# Developed using Python3
+
+__author__ = "Hkaar"
+
+__copyright__ = "Copyright (c) 2021 Hkaar"
+__license__ = "GNU General Public License (GPL) V3"
+
+"""This file is part of Battle Ship.
+
+Battle Ship is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+any later version.
+
+Battle Ship is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Battle Ship.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+__version__ = 0.1
+
+import io
+import random
+
+from battleship.main_game import Attack_Manager, AI_Player
+from battleship.strategies import get_strategy
+from battleship.replay import Replay_Recorder
+from battleship.simulate import Simulation
+
+def play_engine_game(game_seed, player_amount, board_size, enable_abilities, replay_file):
+    # Sets up the players the same way the simulation does, the first turn
+    # is played like a human turn and the game plays all the others.
+    game_rng = random.Random(game_seed)
+    player_objects = []
+
+    for _ in range(0, player_amount):
+        player_rng = random.Random(game_rng.getrandbits(64))
+        player_objects.append(AI_Player(1, 1, board_size, strategy=get_strategy('random', player_rng), rng=player_rng))
+
+    replay_recorder = Replay_Recorder(replay_file, game_seed, enable_abilities=enable_abilities)
+    attack_manager = Attack_Manager(player_amount, tuple(player_objects), enable_abilities=enable_abilities, replay_recorder=replay_recorder)
+    attack_manager.load_boards()
+
+    player_id = attack_manager.current_active_turn
+    target = attack_manager.player_objects[attack_manager.player_targets[player_id]]
+
+    attack_manager.player_objects[player_id].exec_player(target.attack_piece_positions, attack_manager)
+    attack_manager.next_turn(player_id)
+    replay_recorder.close()
+
+def test_simulation_matches_engine_turns():
+    for player_amount, enable_abilities in ((2, False), (3, True), (4, True)):
+        simulation = Simulation(player_amount, (8, 8), enable_abilities)
+        game_seed = player_amount*1000+enable_abilities
+
+        simulated_file = io.BytesIO()
+        ranking, turn_count = simulation.play_ranked_game(game_seed, simulated_file)
+
+        engine_file = io.BytesIO()
+        play_engine_game(game_seed, player_amount, (8, 8), enable_abilities, engine_file)
+
+        assert len(ranking[0]) == 1 and turn_count > 0
+        assert simulated_file.getvalue() == engine_file.getvalue()
@@ -0,0 +1,176 @@
+# Battle Ship // Strategy Tests
+# Developed using Python3
+
+__author__ = "Hkaar"
+
+__copyright__ = "Copyright (c) 2021 Hkaar"
+__license__ = "GNU General Public License (GPL) V3"
+
+"""This file is part of Battle Ship.
+
+Battle Ship is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+any later version.
+
+Battle Ship is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Battle Ship.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+__version__ = 0.1
+
+import random
+import threading
+
+from battleship.main_game import Attack_Manager, AI_Player
+from battleship.bitboard import Bit_Board, count_bits
+from battleship.endgame import get_knowledge, get_sunk_ships
+from battleship.strategies import Density_Map, Density_Strategy, MCTS_Strategy
+from battleship import search
+
+class Board_Owner:
+    def __init__(self, bit_board):
+        self.bit_board = bit_board
+
+def get_density(board_size, ship_counts, blocked):
+    rows, columns = board_size
+    density = [0]*(rows*columns)
+
+    for ship_size in ship_counts:
+        for y in range(0, rows):
+            for x in range(0, columns):
+                for step_y, step_x in ((0, 1), (1, 0)):
+                    cells = [(y+step_y*size_num)*columns+x+step_x*size_num for size_num in range(0, ship_size)]
+
+                    if y+step_y*(ship_size-1) < rows and x+step_x*(ship_size-1) < columns and not any([blocked >> cell & 1 for cell in cells]):
+                        for cell in cells:
+                            density[cell] += ship_counts[ship_size]
+    return density
+
+def gen_shot_game(seed, board_size=(8, 8)):
+    player_objects = [AI_Player(1, 1, board_size, rng=random.Random(seed*10+index)) for index in range(0, 2)]
+    attack_manager = Attack_Manager(2, player_objects, enable_abilities=True)
+    attack_manager.load_boards()
+    return attack_manager
+
+def get_decoy(bit_board):
+    # Same shots and sunk reports, but every ship lies somewhere else.
+    decoy_board = Bit_Board(bit_board.board_size)
+    decoy_board.hits, decoy_board.misses, decoy_board.spotted = bit_board.hits, bit_board.misses, bit_board.spotted
+    decoy_board.sunk_hits = {**bit_board.sunk_hits}
+
+    for ship_object in bit_board.ship_masks:
+        decoy_board.ship_masks[ship_object] = (1 << count_bits(bit_board.ship_masks[ship_object]))-1
+        decoy_board.ships |= decoy_board.ship_masks[ship_object]
+    return decoy_board
+
+def test_density_map_matches_recount():
+    rng = random.Random(8)
+
+    for _ in range(0, 20):
+        board_size = (rng.randint(5, 10), rng.randint(5, 10))
+        ship_sizes = [2, 3, 3, 4, 5]
+        density_map = Density_Map(board_size, ship_sizes)
+
+        ship_counts = {2: 1, 3: 2, 4: 1, 5: 1}
+        blocked = 0
+
+        for _ in range(0, 3):
+            for cell in rng.sample(range(0, board_size[0]*board_size[1]), 6):
+                density_map.block_cell(cell)
+                blocked |= 1 << cell
+
+            ship_size = rng.choice(ship_sizes)
+            if ship_counts[ship_size] > 0:
+                ship_counts[ship_size] -= 1
+            density_map.sink_ship(ship_size)
+
+            assert density_map.density == get_density(board_size, ship_counts, blocked)
+            assert density_map.copy().density == density_map.density
+
+def test_sunk_ships_follow_observed_hits():
+    for seed in range(0, 10):
+        attack_manager = gen_shot_game(seed)
+        bit_board = attack_manager.player_objects[2].bit_board
+        cells = list(attack_manager.player_objects[1].attack_piece_positions)
+        random.Random(seed).shuffle(cells)
+
+        for pos in cells:
+            attack_manager.exec_attack(pos, 1)
+
+            if 2 not in attack_manager.player_objects:
+                break
+
+            sunk_ships = get_sunk_ships(bit_board)
+            assert set(sunk_ships) == set([ship_object for ship_object in bit_board.ship_masks if bit_board.is_ship_sunk(ship_object)])
+
+            for ship_object in sunk_ships:
+                ship_size, sure_mask, placement = sunk_ships[ship_object]
+
+                assert ship_size == count_bits(bit_board.ship_masks[ship_object]) == count_bits(placement)
+                assert not sure_mask & ~bit_board.ship_masks[ship_object]
+                assert not placement & ~bit_board.hits and not sure_mask & ~placement
+
+def test_sunk_ships_stay_open_when_hits_allow_two_ways():
+    # Four hits in a row and a ship of 3 sunk on the third one, the fourth
+    # hit may be its last cell as well as the one of a ship still afloat.
+    bit_board = Bit_Board((7, 7))
+    bit_board.add_ship('Destroyer', ((0, 0), (0, 1), (0, 2)))
+    bit_board.add_ship('Battle_Ship', ((0, 3), (1, 3), (2, 3), (3, 3)))
+    bit_board.hits = bit_board.get_mask(((0, 0), (0, 1), (0, 2), (0, 3)))
+    bit_board.add_sunk_ship('Destroyer', bit_board.get_bit((0, 2)))
+
+    sunk_ships = get_sunk_ships(bit_board)
+    assert sunk_ships == {'Destroyer': (3, bit_board.get_mask(((0, 1), (0, 2))), bit_board.get_mask(((0, 0), (0, 1), (0, 2))))}
+
+    knowledge = get_knowledge(bit_board)
+    assert knowledge[0] == bit_board.get_mask(((0, 0), (0, 3)))
+    assert knowledge[4] == (4,)
+
+def test_strategies_ignore_hidden_ships():
+    for seed in range(0, 6):
+        attack_manager = gen_shot_game(seed)
+        player_object = attack_manager.player_objects[1]
+        target_object = attack_manager.player_objects[2]
+
+        rng = random.Random(seed)
+        cells = list(player_object.attack_piece_positions)
+        rng.shuffle(cells)
+
+        for pos in cells[:40]:
+            attack_manager.exec_attack(pos, 1)
+            attack_manager.exec_scout(rng.choice(cells), 1)
+
+            if 2 not in attack_manager.player_objects:
+                break
+
+            decoy_object = Board_Owner(get_decoy(target_object.bit_board))
+
+            assert get_knowledge(decoy_object.bit_board) == get_knowledge(target_object.bit_board)
+            assert Density_Strategy(random.Random(0)).get_scores(decoy_object) == Density_Strategy(random.Random(0)).get_scores(target_object)
+
+            snapshots = [MCTS_Strategy(random.Random(0), worker_amount=1).get_snapshot(player_object, board_object, True)
+                for board_object in (target_object, decoy_object)]
+            assert snapshots[0]['target_ships'] == snapshots[1]['target_ships']
+            assert snapshots[0]['sunk_mask'] == snapshots[1]['sunk_mask']
+
+def test_search_off_the_main_thread_starts_no_process_pool():
+    attack_manager = gen_shot_game(0)
+    player_object = attack_manager.player_objects[1]
+    target_object = attack_manager.player_objects[2]
+
+    strategy = MCTS_Strategy(random.Random(0), time_budget=0.01, worker_amount=2)
+    stored_pools = dict(search.stored_pools)
+    moves = []
+
+    search_thread = threading.Thread(target=lambda: moves.append(strategy.get_move(player_object, target_object, attack_manager)))
+    search_thread.start()
+    search_thread.join()
+
+    assert len(moves) == 1 and moves[0] != None
+    assert search.stored_pools == stored_pools
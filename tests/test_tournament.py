@@ -0,0 +1,83 @@
+# Battle Ship // Tournament Tests
+# Developed using Python3
+
+__author__ = "Hkaar"
+
+__copyright__ = "Copyright (c) 2021 Hkaar"
+__license__ = "GNU General Public License (GPL) V3"
+
+"""This file is part of Battle Ship.
+
+Battle Ship is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+any later version.
+
+Battle Ship is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Battle Ship.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+__version__ = 0.1
+
+import math
+
+import pytest
+
+from battleship.tournament import Tournament, get_bradley_terry_ratings
+
+def test_ratings_follow_win_share():
+    game_results = [[['density'], ['random']]]*300+[[['random'], ['density']]]*100
+    ratings = get_bradley_terry_ratings(('density', 'random'), game_results)
+
+    # The virtual draw adds half a win to both sides.
+    assert ratings['density']-ratings['random'] == pytest.approx(400*math.log10(300.5/100.5), abs=0.01)
+    assert (ratings['density']+ratings['random'])/2 == pytest.approx(1500)
+
+    even_ratings = get_bradley_terry_ratings(('density', 'random'), [[['density', 'random']]]*10)
+    assert even_ratings['density'] == pytest.approx(even_ratings['random'])
+
+def test_ratings_rank_a_chain():
+    # Every entrant beats the ones after it most of the time.
+    entrants = ('mcts', 'density', 'random')
+    game_results = []
+
+    for index in range(0, len(entrants)):
+        for opponent in entrants[index+1:]:
+            game_results += [[[entrants[index]], [opponent]]]*8+[[[opponent], [entrants[index]]]]*2
+
+    ratings = get_bradley_terry_ratings(entrants, game_results)
+    assert ratings['mcts'] > ratings['density'] > ratings['random']
+
+def test_seatings_rotate_and_swiss_avoids_rematches():
+    tournament = Tournament(('random', 'density', 'mcts', 'random'), games_per_pairing=3, seed=1)
+
+    assert tournament.gen_seatings(('random', 'density')) == [('random', 'density'), ('density', 'random'), ('random', 'density')]
+    assert len(tournament.gen_round_robin()) == 6*3
+
+    tournament = Tournament(('random', 'density', 'mcts'), games_per_pairing=1, pairing_format='swiss', seed=1)
+    tournament.game_results = [[['random'], ['density']]]
+
+    seatings = tournament.gen_swiss_round()
+    assert len(seatings) == 1 and set(seatings[0]) != set(['random', 'density'])
+
+def test_tournament_checks_entrants():
+    with pytest.raises(ValueError):
+        Tournament(('random', 'unknown'))
+
+    with pytest.raises(ValueError):
+        Tournament(('random', 'density'), player_amount=3)
+
+def test_tournament_plays_every_seating():
+    tournament = Tournament(('random', 'density'), games_per_pairing=4, worker_amount=2, seed=3)
+    results = tournament.run()
+
+    assert results['games'] == 4
+    assert sum(results['scores'].values()) == pytest.approx(4)
+
+    for entrant in ('random', 'density'):
+        assert results['intervals'][entrant][0] <= results['intervals'][entrant][1]
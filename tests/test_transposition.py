@@ -0,0 +1,84 @@
+# Battle Ship // Transposition Tests
+# Developed using Python3
+
+__author__ = "Hkaar"
+
+__copyright__ = "Copyright (c) 2021 Hkaar"
+__license__ = "GNU General Public License (GPL) V3"
+
+"""This file is part of Battle Ship.
+
+Battle Ship is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+any later version.
+
+Battle Ship is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Battle Ship.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+__version__ = 0.1
+
+import random
+
+from battleship.main_game import Attack_Manager, AI_Player
+from battleship.game_state import get_game_state, apply, END_TURN
+from battleship.transposition import Transposition_Table
+
+from tests.test_game_state import gen_move
+
+def test_incremental_hash_matches_full_hash():
+    for seed in range(0, 30):
+        rng = random.Random(seed)
+        player_amount = rng.choice((2, 3, 4))
+        board_size = rng.choice(((7, 7), (10, 10)))
+        enable_abilities = seed % 3 != 0
+
+        player_objects = [AI_Player(1, 1, board_size, rng=random.Random(seed*10+index)) for index in range(0, player_amount)]
+        attack_manager = Attack_Manager(player_amount, player_objects, enable_abilities=enable_abilities)
+        attack_manager.load_boards()
+
+        state = get_game_state(attack_manager)
+        assert state.get_hash() == state.gen_hash()
+
+        for _ in range(0, 400):
+            if state.is_over():
+                break
+
+            move = gen_move(state, board_size, enable_abilities, rng) if rng.random() < 0.7 else END_TURN
+
+            try:
+                state, _ = apply(state, move, rng)
+            except ValueError:
+                continue
+
+            assert state.get_hash() == state.gen_hash()
+
+def test_hash_ignores_history():
+    player_objects = [AI_Player(1, 1, (7, 7), rng=random.Random(index)) for index in range(0, 2)]
+    attack_manager = Attack_Manager(2, player_objects)
+    attack_manager.load_boards()
+
+    state = get_game_state(attack_manager)
+    first_state, _ = apply(apply(state, (None, 'A', ((0, 0),)))[0], (None, 'A', ((1, 1),)))
+    second_state, _ = apply(apply(state, (None, 'A', ((1, 1),)))[0], (None, 'A', ((0, 0),)))
+
+    assert first_state.get_hash() == second_state.get_hash()
+
+def test_table_replacement():
+    table = Transposition_Table(4)
+    table.store(1, 3, 'deep')
+
+    assert not table.store(5, 1, 'shallow')
+    assert table.get(1) == ('deep', None)
+    assert table.get(1, 4) == None
+
+    table.new_search()
+
+    assert table.store(5, 1, 'shallow')
+    assert table.get(1) == None and table.get(5) == ('shallow', None)
@@ -0,0 +1,114 @@
+# Battle Ship // Turn Ring Tests
+# Developed using Python3
+
+__author__ = "Hkaar"
+
+__copyright__ = "Copyright (c) 2021 Hkaar"
+__license__ = "GNU General Public License (GPL) V3"
+
+"""This file is part of Battle Ship.
+
+Battle Ship is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+any later version.
+
+Battle Ship is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Battle Ship.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+__version__ = 0.1
+
+import random
+
+import pytest
+
+from battleship.turn_ring import Turn_Ring, Target_Graph
+
+def get_naive_next(player_ids, alive_players, player_id):
+    player_index = player_ids.index(player_id)
+
+    for step in range(1, len(player_ids)+1):
+        next_player = player_ids[(player_index+step) % len(player_ids)]
+
+        if next_player in alive_players:
+            return next_player
+    return None
+
+def test_turn_ring_matches_naive_order():
+    for seed in range(0, 20):
+        rng = random.Random(seed)
+        player_ids = rng.sample(range(1, 100), rng.randint(2, 12))
+
+        turn_ring = Turn_Ring(player_ids)
+        alive_players = list(player_ids)
+
+        with pytest.raises(ValueError):
+            turn_ring.add(player_ids[0])
+
+        while len(alive_players) > 1:
+            player_id = rng.choice(alive_players)
+            turn_ring.remove(player_id)
+            alive_players.remove(player_id)
+
+            assert list(turn_ring) == alive_players and len(turn_ring) == len(alive_players)
+
+            for other_id in player_ids:
+                assert turn_ring.get_next(other_id) == get_naive_next(player_ids, alive_players, other_id)
+
+def check_target_graph(target_graph, naive_targets):
+    assert dict(target_graph) == naive_targets
+
+    for player_id in naive_targets:
+        attackers = [attacker_id for attacker_id in naive_targets if naive_targets[attacker_id] == player_id]
+        assert target_graph.get_attacker(player_id) == (attackers[0] if len(attackers) > 0 else None)
+
+    untargeted = [player_id for player_id in naive_targets if player_id not in naive_targets.values()]
+    assert sorted(target_graph.untargeted) == sorted(untargeted)
+    assert target_graph.get_untargeted() in untargeted+([None] if len(untargeted) == 0 else [])
+
+def test_target_graph_matches_naive_targets():
+    for seed in range(0, 20):
+        rng = random.Random(seed)
+        player_amount = rng.randint(2, 10)
+
+        naive_targets = {player_id: player_id % player_amount+1 for player_id in range(1, player_amount+1)}
+        target_graph = Target_Graph(naive_targets)
+        check_target_graph(target_graph, naive_targets)
+
+        for _ in range(0, 30):
+            if len(naive_targets) == 0:
+                break
+
+            player_id = rng.choice(list(naive_targets))
+            free_targets = [target_id for target_id in naive_targets if target_id != player_id and target_id not in naive_targets.values()]
+
+            if rng.random() < 0.5 and len(free_targets) > 0:
+                target_id = rng.choice(free_targets)
+                target_graph[player_id] = target_id
+                naive_targets[player_id] = target_id
+            elif rng.random() < 0.5:
+                assert target_graph.pop(player_id) == naive_targets.pop(player_id)
+            else:
+                assert target_graph.discard(player_id) == naive_targets.pop(player_id)
+
+            check_target_graph(target_graph, naive_targets)
+
+def test_target_graph_keeps_dict_errors():
+    target_graph = Target_Graph({1: 2, 2: 1})
+
+    with pytest.raises(KeyError):
+        target_graph.pop(3)
+    with pytest.raises(KeyError):
+        del target_graph[3]
+
+    assert target_graph.pop(3, None) == None
+    assert target_graph.discard(3) == None
+
+    del target_graph[1]
+    assert dict(target_graph) == {2: 1} and target_graph.get_attacker(2) == None
@@ -24,34 +24,198 @@ along with Battle Ship.  If not, see <https://www.gnu.org/licenses/>.
 
 __version__ = 0.1
 
+import logging
+
 import battleship.main_game as main_game
-import battleship.ships as ships
+import battleship.placement as placement
 
 import ui.main_widgets as ui_widgets
 
 from PySide2.QtWidgets import QDialog, QHBoxLayout, QVBoxLayout, QSizePolicy, QPushButton, QLCDNumber
-from PySide2.QtCore import QTimer, Qt
+from PySide2.QtCore import QObject, QRunnable, QThreadPool, QTimer, Signal, Slot, Qt
+
+# Sent by a turn job instead of a plan when the pondered turn can be played.
+PONDERED_TURN = 'pondered'
+
+logger = logging.getLogger(__name__)
+
+# Raised in a job of a game whose turn runner was cancelled meanwhile.
+class Job_Cancelled(Exception):
+    pass
+
+class Update_Signals(QObject):
+    changed = Signal()
+
+class AI_Turn_Job(QRunnable):
+    def __init__(self, turn_runner, job_id, player_object, target_piece_positions, attack_manager):
+        super(AI_Turn_Job, self).__init__()
+        self.turn_runner = turn_runner
+        self.job_id = job_id
+        self.cancel_id = turn_runner.cancel_id
+
+        self.player_object = player_object
+        self.target_piece_positions = target_piece_positions
+        self.attack_manager = attack_manager
+
+    def run(self):
+        try:
+            self.turn_runner.check_job(self.cancel_id)
+
+            # A ponder that finished meanwhile is taken over on the GUI thread.
+            if self.player_object.is_turn_pondered(self.attack_manager):
+                turn_plan = PONDERED_TURN
+            else:
+                turn_plan = self.player_object.plan_turn(self.target_piece_positions, self.attack_manager, self.turn_runner.time_budget)
+        except Job_Cancelled:
+            return None
+        except Exception as error:
+            logger.exception('Planning the AI turn failed')
+            self.turn_runner.plan_failed.emit(self.job_id, error)
+            return None
+
+        self.turn_runner.planned.emit(self.job_id, turn_plan)
+
+class AI_Ponder_Job(QRunnable):
+    def __init__(self, turn_runner, player_object, ponder_game):
+        super(AI_Ponder_Job, self).__init__()
+        self.turn_runner = turn_runner
+        self.cancel_id = turn_runner.cancel_id
+
+        self.player_object = player_object
+        self.ponder_game = ponder_game
+
+    def run(self):
+        try:
+            self.turn_runner.check_job(self.cancel_id)
+            self.player_object.ponder_turn(self.ponder_game, self.turn_runner.time_budget)
+        except Job_Cancelled:
+            return None
+        except Exception as error:
+            logger.exception('Pondering the AI turn failed')
+            self.turn_runner.ponder_failed.emit(self.player_object, error)
+
+class AI_Turn_Runner(QObject):
+    planned = Signal(int, object)
+    plan_failed = Signal(int, object)
+    ponder_failed = Signal(object, object)
+
+    def __init__(self, time_budget=1.0, move_pace=0):
+        super(AI_Turn_Runner, self).__init__()
+        self.time_budget = time_budget
+        self.move_pace = move_pace
+
+        # One worker keeps the AI moves in turn order.
+        self.thread_pool = QThreadPool()
+        self.thread_pool.setMaxThreadCount(1)
+
+        self.attack_manager = None
+        self.current_player = None
+        self.current_job = 0
+        self.cancel_id = 0
+
+        self.planned.connect(self.exec_planned_turn)
+        self.plan_failed.connect(self.exec_failed_turn)
+        self.ponder_failed.connect(self.drop_failed_ponder)
+
+    def start(self, attack_manager):
+        self.attack_manager = attack_manager
+
+        # Ponders that did not start yet would take as long as the turns
+        # themselves, so only the running one is kept.
+        self.thread_pool.clear()
+        self.next_player(self.current_job)
+
+    def ponder(self, attack_manager):
+        self.attack_manager = attack_manager
+
+        player_id = attack_manager.current_active_turn
+
+        # The AI players think ahead in the order they are going to play.
+        for _ in range(0, len(attack_manager.turn_ring)):
+            player_id = attack_manager.turn_ring.get_next(player_id)
+            player_object = attack_manager.player_objects[player_id]
+
+            if isinstance(player_object, main_game.AI_Player) and player_id in attack_manager.player_targets:
+                player_object.pondered_turn = None
+
+                # The ponder plans from a snapshot taken here on the GUI thread.
+                ponder_game = player_object.get_ponder_game(attack_manager)
+                self.thread_pool.start(AI_Ponder_Job(self, player_object, ponder_game))
+
+    def next_player(self, job_id):
+        if job_id != self.current_job:
+            return None
+
+        self.current_player = self.attack_manager.next_ai_player()
 
-class Ships:
-    aircraft_carrier = ships.Aircraft_Carrier()
-    battle_ship = ships.Battle_Ship()
-    submarine = ships.Submarine()
-    destroyer = ships.Destroyer()
-    patrol_boat = ships.Patrol_Boat()
+        if self.current_player == None:
+            self.attack_manager.finish_ai_turns()
+
+            if len(self.attack_manager.player_objects) > 1:
+                self.ponder(self.attack_manager)
+            return None
+
+        player_object = self.attack_manager.player_objects[self.current_player]
+        target_object = self.attack_manager.player_objects[self.attack_manager.player_targets[self.current_player]]
+
+        self.current_job += 1
+        turn_plan = player_object.get_pondered_turn(self.attack_manager)
+
+        if turn_plan != None:
+            return self.exec_planned_turn(self.current_job, turn_plan)
+
+        self.thread_pool.start(AI_Turn_Job(self, self.current_job, player_object, target_object.attack_piece_positions, self.attack_manager), 1)
+
+    @Slot(int, object)
+    def exec_planned_turn(self, job_id, turn_plan):
+        if job_id != self.current_job:
+            return None
+
+        if turn_plan == PONDERED_TURN:
+            turn_plan = self.attack_manager.player_objects[self.current_player].get_pondered_turn(self.attack_manager)
+
+        self.attack_manager.exec_ai_turn(self.current_player, turn_plan)
+
+        if self.move_pace > 0:
+            QTimer.singleShot(self.move_pace, lambda: self.next_player(job_id))
+        else:
+            self.next_player(job_id)
+
+    @Slot(int, object)
+    def exec_failed_turn(self, job_id, error):
+        # The turn is planned again on the GUI thread, where an error that
+        # keeps coming back stops the game instead of leaving it waiting.
+        self.exec_planned_turn(job_id, None)
+
+    @Slot(object, object)
+    def drop_failed_ponder(self, player_object, error):
+        # A failed ponder is planned again when the turn comes.
+        player_object.pondered_turn = None
+
+    def check_job(self, cancel_id):
+        if cancel_id != self.cancel_id:
+            raise Job_Cancelled()
+
+    def cancel(self):
+        self.current_job += 1
+        self.cancel_id += 1
+        self.current_player = None
+
+        self.thread_pool.clear()
 
 class Game_Manager:
-    def __init__(self, closing_method=None, theme_manager=None):
+    def __init__(self, closing_method=None, theme_manager=None, ai_time_budget=1.0, ai_move_pace=0):
         self.closing_method = closing_method
         self.theme_manager = theme_manager
 
+        self.ai_time_budget = ai_time_budget
+        self.ai_move_pace = ai_move_pace
+
         self.player_objects = {}
 
     def create(self, player_amount, ai_player_amount, board_size=(7, 7), enable_abilities=False):
         def gen_player_id():
-            for gen_id in range(1, 999):
-                if gen_id not in self.player_objects:
-                    return gen_id
-            return None
+            return len(self.player_objects)+1
 
         def gen_player_windows():
             deploy_windows = []
@@ -78,14 +242,24 @@ class Game_Manager:
                 self.player_objects[gen_player_id()] = player
 
             for _ in range(0, ai_player_amount):
-                ai_player = main_game.AI_Player(1, 1)
+                ai_player = main_game.AI_Player(1, 1, board_size, placement.fleet_pool)
                 self.player_objects[gen_player_id()] = ai_player
 
+        if player_amount < 1:
+            raise ValueError('A game needs at least 1 human player!')
+
+        if not 0 <= ai_player_amount <= 256:
+            raise ValueError('A game can have 0 to 256 AI players!')
+
+        if player_amount+ai_player_amount < 2:
+            raise ValueError('A game needs at least 2 players!')
+
         if board_size >= (7, 7):
             gen_players()
 
             self.attack_manager = main_game.Attack_Manager(len(self.player_objects), tuple(self.player_objects.values()), 
-                close_method=self.closing_method, enable_abilities=enable_abilities)
+                close_method=self.closing_method, enable_abilities=enable_abilities,
+                turn_runner=AI_Turn_Runner(self.ai_time_budget, self.ai_move_pace))
             self.deploy_manager = main_game.Deploy_Manager(len(self.player_objects), tuple(self.player_objects.values()),
                 self.attack_manager)
 
@@ -95,6 +269,13 @@ class Game_Manager:
             raise ValueError('Entered board size must be 7 x 7 or bigger!')
 
     def reset(self):
+        self.attack_manager.turn_runner.cancel()
+        self.attack_manager.update_methods.clear()
+
+        for player_id in self.player_objects:
+            if isinstance(self.player_objects[player_id], main_game.Player):
+                self.player_objects[player_id].update_methods.clear()
+
         del self.attack_manager
         del self.deploy_manager
         
@@ -137,11 +318,11 @@ class Deploy_Window(QDialog):
         self.orientation_S_btn = ui_widgets.Orientation_Button('S', self.player_object)
         self.orientation_E_btn = ui_widgets.Orientation_Button('E', self.player_object)
 
-        self.aircraft_carrier_widget = ui_widgets.Deploy_Widget(Ships.aircraft_carrier, self.player_object)
-        self.battle_ship_widget = ui_widgets.Deploy_Widget(Ships.battle_ship, self.player_object)
-        self.submarine_widget = ui_widgets.Deploy_Widget(Ships.submarine, self.player_object)
-        self.destroyer_widget = ui_widgets.Deploy_Widget(Ships.destroyer, self.player_object)
-        self.patrol_boat_widget = ui_widgets.Deploy_Widget(Ships.patrol_boat, self.player_object)
+        self.aircraft_carrier_widget = ui_widgets.Deploy_Widget(self.player_object.fleet.aircraft_carrier, self.player_object)
+        self.battle_ship_widget = ui_widgets.Deploy_Widget(self.player_object.fleet.battle_ship, self.player_object)
+        self.submarine_widget = ui_widgets.Deploy_Widget(self.player_object.fleet.submarine, self.player_object)
+        self.destroyer_widget = ui_widgets.Deploy_Widget(self.player_object.fleet.destroyer, self.player_object)
+        self.patrol_boat_widget = ui_widgets.Deploy_Widget(self.player_object.fleet.patrol_boat, self.player_object)
 
         self.finish_btn = QPushButton('Finish')
         self.finish_btn.setSizePolicy(QSizePolicy.Minimum, QSizePolicy.Fixed)
@@ -221,7 +402,7 @@ class Attack_Window(QDialog):
         self.set_window_components()
         self.set_window_layout()
 
-        self.set_update_timer()
+        self.set_update_signals()
 
     def set_window_components(self):
         self.board = ui_widgets.Attack_Board(self.board_size[0], self.board_size[1], 
@@ -250,21 +431,23 @@ class Attack_Window(QDialog):
         else:
             self.player_object.selected_ship = None
 
-        self.current_turn_display = QLCDNumber(2)
+        # Player ids go up to the player amount, the display needs a digit for
+        # every place of the highest one.
+        self.current_turn_display = QLCDNumber(max(2, len(str(max(self.attack_manager.player_objects)))))
         self.current_turn_display.setSizePolicy(QSizePolicy.Minimum, QSizePolicy.Fixed)
 
         if self.attack_manager.enable_abilities:
-            self.aircraft_carrier_widget = ui_widgets.Attack_Widget(Ships.aircraft_carrier, self.player_object, False)
-            self.battle_ship_widget = ui_widgets.Attack_Widget(Ships.battle_ship, self.player_object, False)
-            self.submarine_widget = ui_widgets.Attack_Widget(Ships.submarine, self.player_object, False)
-            self.destroyer_widget = ui_widgets.Attack_Widget(Ships.destroyer, self.player_object, False)
-            self.patrol_boat_widget = ui_widgets.Attack_Widget(Ships.patrol_boat, self.player_object, False)
+            self.aircraft_carrier_widget = ui_widgets.Attack_Widget(self.player_object.fleet.aircraft_carrier, self.player_object, False)
+            self.battle_ship_widget = ui_widgets.Attack_Widget(self.player_object.fleet.battle_ship, self.player_object, False)
+            self.submarine_widget = ui_widgets.Attack_Widget(self.player_object.fleet.submarine, self.player_object, False)
+            self.destroyer_widget = ui_widgets.Attack_Widget(self.player_object.fleet.destroyer, self.player_object, False)
+            self.patrol_boat_widget = ui_widgets.Attack_Widget(self.player_object.fleet.patrol_boat, self.player_object, False)
         else:
-            self.aircraft_carrier_widget = ui_widgets.Attack_Widget(Ships.aircraft_carrier, self.player_object)
-            self.battle_ship_widget = ui_widgets.Attack_Widget(Ships.battle_ship, self.player_object)
-            self.submarine_widget = ui_widgets.Attack_Widget(Ships.submarine, self.player_object)
-            self.destroyer_widget = ui_widgets.Attack_Widget(Ships.destroyer, self.player_object)
-            self.patrol_boat_widget = ui_widgets.Attack_Widget(Ships.patrol_boat, self.player_object)
+            self.aircraft_carrier_widget = ui_widgets.Attack_Widget(self.player_object.fleet.aircraft_carrier, self.player_object)
+            self.battle_ship_widget = ui_widgets.Attack_Widget(self.player_object.fleet.battle_ship, self.player_object)
+            self.submarine_widget = ui_widgets.Attack_Widget(self.player_object.fleet.submarine, self.player_object)
+            self.destroyer_widget = ui_widgets.Attack_Widget(self.player_object.fleet.destroyer, self.player_object)
+            self.patrol_boat_widget = ui_widgets.Attack_Widget(self.player_object.fleet.patrol_boat, self.player_object)
 
     def set_window_layout(self):
         self.window_layout = QVBoxLayout()
@@ -335,15 +518,30 @@ class Attack_Window(QDialog):
             ),
         'button')
 
-    def set_update_timer(self):
-        def update_method():
-            if self.attack_manager.enable_abilities:
-                self.points_display.display(self.player_object.attack_points, self.player_object.scout_points)
-            self.current_turn_display.display(self.attack_manager.current_active_turn)
+    def set_update_signals(self):
+        self.update_pending = False
+
+        # Changes can come from the AI turn thread, the queued signal brings
+        # them back to the GUI thread before any widget is touched.
+        self.update_signals = Update_Signals(self)
+        self.update_signals.changed.connect(self.request_update)
+
+        self.player_object.add_update_method(self.update_signals.changed.emit)
+        self.attack_manager.add_update_method(self.update_signals.changed.emit)
+
+        self.update_displays()
 
-        self.update_timer = QTimer(self)
-        self.update_timer.timeout.connect(update_method)
-        self.update_timer.start(125)
+    def request_update(self):
+        if not self.update_pending:
+            self.update_pending = True
+            QTimer.singleShot(0, self.update_displays)
+
+    def update_displays(self):
+        self.update_pending = False
+
+        if self.attack_manager.enable_abilities:
+            self.points_display.display(self.player_object.attack_points, self.player_object.scout_points)
+        self.current_turn_display.display(self.attack_manager.current_active_turn)
 
     def default_button_method(self, mode):
         self.player_object.selected_ship = None
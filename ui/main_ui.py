@@ -24,6 +24,7 @@ along with Battle Ship.  If not, see <https://www.gnu.org/licenses/>.
 
 __version__ = 0.1
 
+import battleship.placement as placement
 import ui.game_ui as game_ui
 import ui_manager
 
@@ -39,6 +40,7 @@ parser.read("config.ini")
 try:
     game_info = parser["GAME_INFO"]
     appearence = parser["APPEARENCE"]
+    ai_settings = parser["AI"] if parser.has_section("AI") else {}
 except KeyError:
     raise ImportError('An Error has occoured!, while importing the config file!')
 
@@ -200,6 +202,10 @@ class Start_Menu(QDialog):
         self.start_game_4AI.setSizePolicy(QSizePolicy.Minimum, QSizePolicy.Minimum)
         self.start_game_4AI.clicked.connect(lambda: self.create_game(1, 3))
 
+        self.start_game_custom = QPushButton("Custom game")
+        self.start_game_custom.setSizePolicy(QSizePolicy.Minimum, QSizePolicy.Minimum)
+        self.start_game_custom.clicked.connect(self.create_custom_game)
+
     def set_menu_layout(self):
         self.menu_layout = QVBoxLayout()
 
@@ -214,17 +220,29 @@ class Start_Menu(QDialog):
         self.menu_layout.addWidget(self.start_game_4P)
         self.menu_layout.addWidget(self.start_game_2AI)
         self.menu_layout.addWidget(self.start_game_4AI)
+        self.menu_layout.addWidget(self.start_game_custom)
 
         self.setLayout(self.menu_layout)
 
     def create_game(self, player_amount, AI_player_amount):
         if not hasattr(self, 'game_manager'):
-            self.game_manager = game_ui.Game_Manager(self.closing_method, self.parent_menu.theme_manager)
+            self.game_manager = game_ui.Game_Manager(self.closing_method, self.parent_menu.theme_manager,
+                float(ai_settings.get('time_budget', 1.0)), int(ai_settings.get('move_pace', 0)))
         self.game_manager.create(player_amount, AI_player_amount, self.current_board_size, self.special_mode_status)
 
         for win in self.parent_menu.stored_windows:
             win.close()
 
+    def create_custom_game(self):
+        player_amount, player_validity = QInputDialog.getInt(self, 'Custom Game', 'Enter player amount:', 1, 1, 64)
+        if not player_validity:
+            return None
+
+        AI_player_amount, AI_validity = QInputDialog.getInt(self, 'Custom Game', 'Enter AI player amount:', 1, 0, 256)
+
+        if AI_validity and player_amount+AI_player_amount >= 2:
+            self.create_game(player_amount, AI_player_amount)
+
     def change_special_mode_status(self):
         if self.special_mode_status:
             self.special_mode_switch.setText('Special mode: Disabled')
@@ -240,6 +258,7 @@ class Start_Menu(QDialog):
 
         if (y_validity and x_validity) and board_size >= (7, 7):
             self.current_board_size = board_size
+            placement.fleet_pool.prepare(board_size)
         self.board_size_selector.setText(f'Current board size: {self.current_board_size[0]}x{self.current_board_size[1]}')
 
     def closing_method(self):
@@ -382,6 +401,12 @@ class Help_Window(QScrollArea):
             '   - If the area has a 0 = Miss, X = Hit, # = Spotted.\n'
             '   - To finish your turn press the finish button, on the top right.\n'
             '\n'
+            'Large Boards:\n'
+            '   - Scroll the mouse wheel over the board to zoom in or out.\n'
+            '   - Drag with the right or middle mouse button to move around the board.\n'
+            '   - While zoomed in, click or drag on the minimap in the bottom right\n'
+            '     corner to jump to that part of the board.\n'
+            '\n'
             'Theres nothing down here ;)'
             )
 
@@ -24,74 +24,470 @@ along with Battle Ship.  If not, see <https://www.gnu.org/licenses/>.
 
 __version__ = 0.1
 
-from PySide2.QtWidgets import QWidget, QHBoxLayout, QVBoxLayout, QGridLayout, QSizePolicy, QLCDNumber, QPushButton, QLabel
-from PySide2.QtCore import Qt
+from PySide2.QtWidgets import QWidget, QHBoxLayout, QVBoxLayout, QSizePolicy, QLCDNumber, QPushButton, QLabel
+from PySide2.QtGui import QPainter, QPalette, QImage, QColor
+from PySide2.QtCore import Qt, QRect, QRectF, QSize
 
-class Deploy_Board(QWidget):
+# The whole board is one painted widget. Pieces are only kept for cells whose
+# text or enabled state differs from a blank cell, every other cell is made
+# on demand when the game managers ask for it.
+class Board_Pieces:
+    __slots__ = ('board_view', 'stored_pieces')
+
+    def __init__(self, board_view):
+        self.board_view = board_view
+        self.stored_pieces = {}
+
+    def __getitem__(self, pos):
+        if pos in self.stored_pieces:
+            return self.stored_pieces[pos]
+
+        if pos not in self:
+            raise KeyError(pos)
+        return self.board_view.create_piece(pos)
+
+    def __contains__(self, pos):
+        return 0 <= pos[0] < self.board_view.row_amount and 0 <= pos[1] < self.board_view.column_amount
+
+    def __iter__(self):
+        for y in range(0, self.board_view.row_amount):
+            for x in range(0, self.board_view.column_amount):
+                yield (y, x)
+
+    def __len__(self):
+        return self.board_view.row_amount*self.board_view.column_amount
+
+    def keys(self):
+        return iter(self)
+
+    def get(self, pos, default=None):
+        return self[pos] if pos in self else default
+
+    def isEnabled(self):
+        return self.board_view.board_enabled
+
+    def setEnabled(self, enabled):
+        self.board_view.set_board_enabled(enabled)
+
+    def suspend_updates(self):
+        self.board_view.suspend_updates()
+
+    def resume_updates(self):
+        self.board_view.resume_updates()
+
+    def store_piece(self, board_piece):
+        if board_piece.enabled and board_piece.piece_text == ' ':
+            self.stored_pieces.pop(board_piece.position, None)
+        else:
+            self.stored_pieces[board_piece.position] = board_piece
+
+class Board_View(QWidget):
+    # Overview pixel of every cell state, the overview is a one pixel per cell
+    # image used for the minimap and for zoom levels too small for text.
+    cell_values = {' ': 0, '0': 1, 'X': 2, '#': 3, '[]': 4}
+    disabled_value = 5
+
+    def __init__(self, row_amount, column_amount):
+        super(Board_View, self).__init__()
+        self.row_amount = row_amount
+        self.column_amount = column_amount
+
+        self.board_pieces = Board_Pieces(self)
+        self.pressed_position = None
+
+        # A disabled board ignores clicks and draws every cell disabled, the
+        # pieces keep their own state for when it is enabled again.
+        self.board_enabled = True
+
+        self.suspended_updates = 0
+        self.dirty_rect = QRect()
+
+        self.zoom_level = 1.0
+        self.view_x = 0.0
+        self.view_y = 0.0
+        self.pan_position = None
+
+        self.overview_cells = None
+        self.overview_image = QImage()
+        self.overview_colors = ()
+
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+
+    def create_piece(self, pos):
+        board_piece = Board_Piece(pos)
+        board_piece.board_view = self
+        return board_piece
+
+    def get_marked_positions(self):
+        return {}
+
+    def set_board_enabled(self, enabled):
+        if enabled != self.board_enabled:
+            self.board_enabled = enabled
+            self.pressed_position = None
+
+            self.overview_cells = None
+            self.overview_image = QImage()
+            self.update()
+
+    def is_piece_enabled(self, board_piece):
+        return self.board_enabled and board_piece.enabled
+
+    def sizeHint(self):
+        return QSize(min(self.column_amount*48, 640), min(self.row_amount*48, 640))
+
+    def minimumSizeHint(self):
+        return QSize(min(self.column_amount*16, 320), min(self.row_amount*16, 320))
+
+    def get_cell_size(self):
+        return max(self.width(), 1)*self.zoom_level/self.column_amount, max(self.height(), 1)*self.zoom_level/self.row_amount
+
+    def get_cell_rect(self, pos):
+        cell_width, cell_height = self.get_cell_size()
+
+        left = int(pos[1]*cell_width-self.view_x)
+        top = int(pos[0]*cell_height-self.view_y)
+        right = int((pos[1]+1)*cell_width-self.view_x)
+        bottom = int((pos[0]+1)*cell_height-self.view_y)
+
+        return QRect(left, top, right-left, bottom-top)
+
+    def get_visible_cells(self, rect):
+        cell_width, cell_height = self.get_cell_size()
+
+        first_y = max(0, int((rect.top()+self.view_y)//cell_height))
+        last_y = min(self.row_amount-1, int((rect.bottom()+self.view_y)//cell_height))
+        first_x = max(0, int((rect.left()+self.view_x)//cell_width))
+        last_x = min(self.column_amount-1, int((rect.right()+self.view_x)//cell_width))
+
+        return first_y, last_y, first_x, last_x
+
+    def get_position(self, point):
+        if 0 <= point.x() < self.width() and 0 <= point.y() < self.height():
+            cell_width, cell_height = self.get_cell_size()
+            pos = (int((point.y()+self.view_y)//cell_height), int((point.x()+self.view_x)//cell_width))
+
+            if pos in self.board_pieces:
+                return pos
+        return None
+
+    def get_minimap_rect(self):
+        if self.zoom_level <= 1.0:
+            return None
+
+        scale = min(160/self.column_amount, 160/self.row_amount, self.width()/(3*self.column_amount), self.height()/(3*self.row_amount))
+        width = max(int(self.column_amount*scale), 1)
+        height = max(int(self.row_amount*scale), 1)
+
+        return QRect(self.width()-width-8, self.height()-height-8, width, height)
+
+    def set_view(self, view_x, view_y):
+        cell_width, cell_height = self.get_cell_size()
+
+        self.view_x = min(max(view_x, 0.0), max(cell_width*self.column_amount-self.width(), 0.0))
+        self.view_y = min(max(view_y, 0.0), max(cell_height*self.row_amount-self.height(), 0.0))
+        self.update()
+
+    def set_zoom(self, zoom_level, anchor=None):
+        cell_width, cell_height = self.get_cell_size()
+        max_zoom = max(64*self.column_amount/max(self.width(), 1), 64*self.row_amount/max(self.height(), 1), 1.0)
+
+        if anchor == None:
+            anchor = self.rect().center()
+
+        board_x = (anchor.x()+self.view_x)/cell_width
+        board_y = (anchor.y()+self.view_y)/cell_height
+
+        self.zoom_level = min(max(zoom_level, 1.0), max_zoom)
+        cell_width, cell_height = self.get_cell_size()
+
+        self.set_view(board_x*cell_width-anchor.x(), board_y*cell_height-anchor.y())
+
+    def center_view(self, point, minimap_rect):
+        cell_width, cell_height = self.get_cell_size()
+
+        board_x = (point.x()-minimap_rect.left())*self.column_amount/minimap_rect.width()
+        board_y = (point.y()-minimap_rect.top())*self.row_amount/minimap_rect.height()
+
+        self.set_view(board_x*cell_width-self.width()/2, board_y*cell_height-self.height()/2)
+
+    def get_piece_value(self, board_piece):
+        if board_piece.piece_text in self.cell_values and board_piece.piece_text != ' ':
+            return self.cell_values[board_piece.piece_text]
+        return self.cell_values[' '] if self.is_piece_enabled(board_piece) else self.disabled_value
+
+    def gen_overview(self):
+        # Rows are padded to 32 bits, as QImage expects for 8 bit images.
+        line_length = (self.column_amount+3)//4*4
+        empty_value = self.cell_values[' '] if self.board_enabled else self.disabled_value
+        self.overview_cells = bytearray([empty_value])*(line_length*self.row_amount)
+
+        marked_positions = self.get_marked_positions()
+        for pos in marked_positions:
+            self.overview_cells[pos[0]*line_length+pos[1]] = marked_positions[pos]
+
+        for board_piece in self.board_pieces.stored_pieces.values():
+            self.overview_cells[board_piece.position[0]*line_length+board_piece.position[1]] = self.get_piece_value(board_piece)
+
+        self.overview_image = QImage()
+
+    def get_overview(self):
+        if self.overview_cells == None:
+            self.gen_overview()
+
+        if self.overview_image.isNull():
+            palette = self.palette()
+            colors = (
+                palette.color(QPalette.Button), palette.color(QPalette.Midlight), palette.color(QPalette.Highlight),
+                palette.color(QPalette.Link), palette.color(QPalette.Dark), palette.color(QPalette.Disabled, QPalette.Button)
+                )
+
+            self.overview_colors = tuple([color.rgb() for color in colors])
+
+            overview_data = bytes(self.overview_cells)
+            overview_image = QImage(overview_data, self.column_amount, self.row_amount, (self.column_amount+3)//4*4, QImage.Format_Indexed8)
+            overview_image.setColorTable(list(self.overview_colors)+[QColor(Qt.black).rgb()]*(256-len(colors)))
+
+            # The converted copy owns its pixels and scales much faster than an indexed image.
+            self.overview_image = overview_image.convertToFormat(QImage.Format_RGB32)
+        return self.overview_image
+
+    def update_piece(self, board_piece):
+        self.board_pieces.store_piece(board_piece)
+
+        if self.overview_cells != None:
+            pos = board_piece.position
+            piece_value = self.get_piece_value(board_piece)
+            self.overview_cells[pos[0]*((self.column_amount+3)//4*4)+pos[1]] = piece_value
+
+            # Only the changed pixel of an already converted image is set.
+            if not self.overview_image.isNull():
+                self.overview_image.setPixel(pos[1], pos[0], self.overview_colors[piece_value])
+
+        self.update_position(board_piece.position)
+
+    def suspend_updates(self):
+        self.suspended_updates += 1
+
+    def resume_updates(self):
+        self.suspended_updates -= 1
+
+        if self.suspended_updates > 0:
+            return None
+
+        if not self.dirty_rect.isNull():
+            self.update(self.dirty_rect)
+            self.dirty_rect = QRect()
+
+        minimap_rect = self.get_minimap_rect()
+        if minimap_rect != None:
+            self.update(minimap_rect)
+
+    def update_position(self, pos):
+        cell_rect = self.get_cell_rect(pos)
+
+        # While suspended the changed cells are only collected, resuming
+        # repaints all of them at once.
+        if self.suspended_updates > 0:
+            if cell_rect.intersects(self.rect()):
+                self.dirty_rect = self.dirty_rect.united(cell_rect)
+            return None
+
+        if cell_rect.intersects(self.rect()):
+            self.update(cell_rect)
+
+        minimap_rect = self.get_minimap_rect()
+        if minimap_rect != None:
+            self.update(minimap_rect)
+
+    def paintEvent(self, event):
+        dirty_rect = event.rect()
+        palette = self.palette()
+
+        cell_width, cell_height = self.get_cell_size()
+        first_y, last_y, first_x, last_x = self.get_visible_cells(dirty_rect)
+
+        painter = QPainter(self)
+        painter.fillRect(dirty_rect, palette.color(QPalette.Window))
+
+        if first_y <= last_y and first_x <= last_x:
+            cells_rect = QRectF(first_x*cell_width-self.view_x, first_y*cell_height-self.view_y,
+                (last_x-first_x+1)*cell_width, (last_y-first_y+1)*cell_height)
+
+            painter.drawImage(cells_rect, self.get_overview(), QRectF(first_x, first_y, last_x-first_x+1, last_y-first_y+1))
+
+            if self.pressed_position != None and self.is_piece_enabled(self.board_pieces[self.pressed_position]):
+                painter.fillRect(self.get_cell_rect(self.pressed_position), palette.color(QPalette.Mid))
+
+            # Grid lines and text only once the cells are big enough to see them.
+            if cell_width >= 6 and cell_height >= 6:
+                painter.setPen(palette.color(QPalette.Mid))
+
+                for x in range(first_x, last_x+2):
+                    line_x = int(x*cell_width-self.view_x)-1
+                    painter.drawLine(line_x, int(cells_rect.top()), line_x, int(cells_rect.bottom()))
+                for y in range(first_y, last_y+2):
+                    line_y = int(y*cell_height-self.view_y)-1
+                    painter.drawLine(int(cells_rect.left()), line_y, int(cells_rect.right()), line_y)
+
+            if cell_width >= 16 and cell_height >= 12:
+                stored_pieces = self.board_pieces.stored_pieces
+
+                for y in range(first_y, last_y+1):
+                    for x in range(first_x, last_x+1):
+                        if (y, x) in stored_pieces and stored_pieces[(y, x)].piece_text.strip():
+                            board_piece = stored_pieces[(y, x)]
+                            color_group = QPalette.Active if self.is_piece_enabled(board_piece) else QPalette.Disabled
+
+                            painter.setPen(palette.color(color_group, QPalette.ButtonText))
+                            painter.drawText(self.get_cell_rect((y, x)), Qt.AlignCenter, board_piece.piece_text)
+
+        minimap_rect = self.get_minimap_rect()
+        if minimap_rect != None and minimap_rect.intersects(dirty_rect):
+            painter.fillRect(minimap_rect.adjusted(-2, -2, 2, 2), palette.color(QPalette.Shadow))
+            painter.drawImage(minimap_rect, self.get_overview())
+
+            board_width = cell_width*self.column_amount
+            board_height = cell_height*self.row_amount
+
+            painter.setPen(palette.color(QPalette.Text))
+            painter.drawRect(QRectF(minimap_rect.left()+self.view_x*minimap_rect.width()/board_width,
+                minimap_rect.top()+self.view_y*minimap_rect.height()/board_height,
+                self.width()*minimap_rect.width()/board_width, self.height()*minimap_rect.height()/board_height))
+        painter.end()
+
+    def resizeEvent(self, event):
+        self.set_view(self.view_x*self.width()/max(event.oldSize().width(), 1) if event.oldSize().width() > 0 else self.view_x,
+            self.view_y*self.height()/max(event.oldSize().height(), 1) if event.oldSize().height() > 0 else self.view_y)
+
+    def wheelEvent(self, event):
+        self.set_zoom(self.zoom_level*1.25**(event.angleDelta().y()/120), event.pos())
+
+    def mousePressEvent(self, event):
+        minimap_rect = self.get_minimap_rect()
+
+        if event.button() == Qt.LeftButton and minimap_rect != None and minimap_rect.contains(event.pos()):
+            self.center_view(event.pos(), minimap_rect)
+
+        elif event.button() == Qt.LeftButton and self.board_enabled:
+            self.pressed_position = self.get_position(event.pos())
+
+            if self.pressed_position != None:
+                self.update_position(self.pressed_position)
+
+        elif event.button() in (Qt.RightButton, Qt.MiddleButton):
+            self.pan_position = event.pos()
+
+    def mouseMoveEvent(self, event):
+        if self.pan_position != None:
+            self.set_view(self.view_x+self.pan_position.x()-event.pos().x(), self.view_y+self.pan_position.y()-event.pos().y())
+            self.pan_position = event.pos()
+
+        elif event.buttons() & Qt.LeftButton and self.pressed_position == None:
+            minimap_rect = self.get_minimap_rect()
+
+            if minimap_rect != None and minimap_rect.contains(event.pos()):
+                self.center_view(event.pos(), minimap_rect)
+
+    def mouseReleaseEvent(self, event):
+        if event.button() in (Qt.RightButton, Qt.MiddleButton):
+            self.pan_position = None
+
+        elif event.button() == Qt.LeftButton and self.pressed_position != None:
+            pressed_position = self.pressed_position
+            self.pressed_position = None
+            self.update_position(pressed_position)
+
+            if self.get_position(event.pos()) == pressed_position and self.is_piece_enabled(self.board_pieces[pressed_position]):
+                self.board_pieces[pressed_position].board_piece_method()
+
+class Board_Piece:
+    __slots__ = ('board_view', 'position', 'piece_text', 'enabled')
+
+    def __init__(self, position):
+        self.board_view = None
+        self.position = position
+
+        self.piece_text = ' '
+        self.enabled = True
+
+    def text(self):
+        return self.piece_text
+
+    def setText(self, piece_text):
+        if piece_text != self.piece_text:
+            self.piece_text = piece_text
+            self.update_piece()
+
+    def isEnabled(self):
+        return self.enabled
+
+    def setEnabled(self, enabled):
+        if enabled != self.enabled:
+            self.enabled = enabled
+            self.update_piece()
+
+    def update_piece(self):
+        if self.board_view != None:
+            self.board_view.update_piece(self)
+
+class Deploy_Board(Board_View):
     def __init__(self, row_amount, column_amount, selected_player, player_object, deploy_manager):
-        super(Deploy_Board, self).__init__()
+        super(Deploy_Board, self).__init__(row_amount, column_amount)
         self.deploy_manager = deploy_manager
         self.player_object = player_object
 
         self.selected_player = selected_player
-        self._init_board(row_amount, column_amount)
+        self._init_board()
 
-    def _init_board(self, row_amount, column_amount):
-        self.main_board_layout = QGridLayout()
-        self.main_board_layout.setSpacing(1)
+    def _init_board(self):
+        self.player_object.deploy_piece_positions = self.board_pieces
 
-        self.board_positions = [(y, x) for y in range(0, row_amount) for x in range(0, column_amount)]
-        piece_positions = {}
+    def create_piece(self, pos):
+        board_piece = Deploy_Board_Piece(pos, self.selected_player, self.player_object, self.deploy_manager)
+        board_piece.board_view = self
+        return board_piece
 
-        for pos in self.board_positions:
-            board_piece = Deploy_Board_Piece(pos, self.selected_player, self.player_object, self.deploy_manager)
-            self.main_board_layout.addWidget(board_piece, *pos)
-            piece_positions[pos] = board_piece
+    def get_marked_positions(self):
+        return {pos: self.cell_values['[]'] for pos in self.player_object.ship_positions}
 
-        self.player_object.deploy_piece_positions = piece_positions
-        self.setLayout(self.main_board_layout)
-
-class Attack_Board(QWidget):
+class Attack_Board(Board_View):
     def __init__(self, row_amount, column_amount, selected_player, player_object, attack_manager):
-        super(Attack_Board, self).__init__()
+        super(Attack_Board, self).__init__(row_amount, column_amount)
         self.attack_manager = attack_manager
         self.player_object = player_object
 
         self.player_object.board_size = (row_amount, column_amount)
         self.selected_player = selected_player
 
-        self._init_board(row_amount, column_amount)
+        self._init_board()
+
+    def _init_board(self):
+        self.player_object.attack_piece_positions = self.board_pieces
 
-    def _init_board(self, row_amount, column_amount):
-        self.main_board_layout = QGridLayout()
-        self.main_board_layout.setSpacing(1)
+    def create_piece(self, pos):
+        board_piece = Attack_Board_Piece(pos, self.selected_player, self.player_object, self.attack_manager)
+        board_piece.board_view = self
+        return board_piece
 
-        self.board_positions = [(y, x) for y in range(0, row_amount) for x in range(0, column_amount)]
-        piece_positions = {}
+    def get_marked_positions(self):
+        target_id = self.attack_manager.player_targets.get(self.selected_player)
+        piece_values = {0: self.cell_values['0'], 1: self.cell_values['X'], 2: self.cell_values['#']}
 
-        for pos in self.board_positions:
-            board_piece = Attack_Board_Piece(pos, self.selected_player, self.player_object, self.attack_manager)
-            self.main_board_layout.addWidget(board_piece, *pos)
-            piece_positions[pos] = board_piece
+        if target_id in self.attack_manager.player_objects:
+            target_hit_positions = self.attack_manager.player_objects[target_id].stored_hit_positions
+            return {pos: piece_values[target_hit_positions[pos]] for pos in target_hit_positions}
+        return {}
 
-        self.player_object.attack_piece_positions = piece_positions
-        self.setLayout(self.main_board_layout)
+class Deploy_Board_Piece(Board_Piece):
+    __slots__ = ('deploy_manager', 'player_object', 'selected_player')
 
-class Deploy_Board_Piece(QPushButton):
     def __init__(self, position, selected_player, player_object, deploy_manager):
-        super(Deploy_Board_Piece, self).__init__()
+        super(Deploy_Board_Piece, self).__init__(position)
         self.deploy_manager = deploy_manager
         self.player_object = player_object
 
         self.selected_player = selected_player
-        self.position = position
-
-        self._init_board_piece()
-
-    def _init_board_piece(self):
-        self.setText(' ')
-        self.setSizePolicy(QSizePolicy.Minimum, QSizePolicy.Minimum)
-        self.clicked.connect(self.board_piece_method)
 
     def board_piece_method(self):
         def generate_positions():
@@ -155,21 +551,15 @@ class Deploy_Board_Piece(QPushButton):
             if not generate_positions():
                 print('The spot is already taken or is invalid!')
 
-class Attack_Board_Piece(QPushButton):
+class Attack_Board_Piece(Board_Piece):
+    __slots__ = ('attack_manager', 'player_object', 'selected_player')
+
     def __init__(self, position, selected_player, player_object, attack_manager):
-        super(Attack_Board_Piece, self).__init__()
+        super(Attack_Board_Piece, self).__init__(position)
         self.attack_manager = attack_manager
         self.player_object = player_object
 
         self.selected_player = selected_player
-        self.position = position
-
-        self._init_board_piece()
-
-    def _init_board_piece(self):
-        self.setText(' ')
-        self.setSizePolicy(QSizePolicy.Minimum, QSizePolicy.Minimum)
-        self.clicked.connect(self.board_piece_method)
 
     def board_piece_method(self):
         def exec_board_piece():
@@ -186,39 +576,35 @@ class Attack_Board_Piece(QPushButton):
                         if selected_ship.attack_cost > self.player_object.attack_points:
                             return False
                         else:
-                            if get_name(selected_ship) != 'Aircraft_Carrier':
+                            if not selected_ship.is_multi_select('A'):
                                 self.player_object.attack_points -= selected_ship.attack_cost
                             stored_positions = selected_ship.get_attack(self.position, self.player_object)
 
                         if stored_positions == True:
                             self.player_object.attack_points -= selected_ship.attack_cost
 
-                            for pos in self.player_object.stored_positions:
-                                self.attack_manager.exec_attack(pos, self.selected_player)
+                            self.attack_manager.exec_attack_many(self.player_object.stored_positions, self.selected_player)
                             self.player_object.reset_positions()
 
                         elif stored_positions != None and get_name(stored_positions):
-                            for pos in stored_positions:
-                                self.attack_manager.exec_attack(pos, self.selected_player)
+                            self.attack_manager.exec_attack_many(stored_positions, self.selected_player)
                             self.player_object.reset_positions()
                     else:
                         if selected_ship.scout_cost > self.player_object.scout_points:
                             return False
                         else:
-                            if get_name(selected_ship) != 'Patrol_Boat':
+                            if not selected_ship.is_multi_select('S'):
                                 self.player_object.scout_points -= selected_ship.scout_cost
                             stored_positions = selected_ship.get_scout(self.position, self.player_object)
 
                         if stored_positions == True:
                             self.player_object.scout_points -= selected_ship.scout_cost
 
-                            for pos in self.player_object.stored_positions:
-                                self.attack_manager.exec_scout(pos, self.selected_player)
+                            self.attack_manager.exec_scout_many(self.player_object.stored_positions, self.selected_player)
                             self.player_object.reset_positions()
 
                         elif stored_positions != None and get_name(stored_positions):
-                            for pos in stored_positions:
-                                self.attack_manager.exec_scout(pos, self.selected_player)
+                            self.attack_manager.exec_scout_many(stored_positions, self.selected_player)
                             self.player_object.reset_positions()
                 else:
                     if len(self.player_object.ship_positions) > 0: